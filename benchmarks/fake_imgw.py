@@ -0,0 +1,186 @@
+"""Local stand-in for the IMGW-PIB API, the hydro-back service and the proxy.
+
+The server answers the synop, hydro, warnings, hydro-back station status and
+proxy forecast endpoints with the test fixtures. Requests are routed by path
+only, so a client pointed at the server by rewriting the scheme, host and port
+of its requests keeps working unchanged. Every response is delayed by the
+configured latency and jitter and a share of them fails with status 500. The
+station lists can be scaled up, copies of the fixture stations get new IDs.
+
+Run it directly to serve a long-running instance, ``load_test.py`` starts one
+in a separate process.
+"""
+
+import argparse
+import asyncio
+import gzip
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import orjson
+from aiohttp import hdrs, web
+from aiohttp.typedefs import Handler
+from hot_paths import move_to_present
+
+from imgw_pib.model import ApiNames
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+@dataclass(kw_only=True, slots=True)
+class Behaviour:
+    """Latency, in seconds, error rate and payload scale of the fake server."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    scale: float = 1.0
+    seed: int | None = None
+
+
+class Payload:
+    """JSON response body, encoded and compressed once."""
+
+    __slots__ = ("compressed", "plain")
+
+    def __init__(self, data: Any) -> None:  # noqa: ANN401
+        """Initialize."""
+        self.plain = orjson.dumps(data)
+        self.compressed = gzip.compress(self.plain)
+
+    def response(self, request: web.Request) -> web.Response:
+        """Return the payload, gzip compressed if the client accepts it."""
+        if "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
+            return web.Response(
+                body=self.compressed,
+                content_type="application/json",
+                headers={hdrs.CONTENT_ENCODING: "gzip"},
+            )
+
+        return web.Response(body=self.plain, content_type="application/json")
+
+
+def load_fixture(name: str) -> Any:  # noqa: ANN401
+    """Return a decoded test fixture."""
+    return orjson.loads((FIXTURES / f"{name}.json").read_bytes())
+
+
+def scale_stations(
+    stations: list[dict[str, Any]], scale: float
+) -> list[dict[str, Any]]:
+    """Return the station list scaled, copies get the copy number appended to IDs."""
+    scaled = []
+    for index in range(max(1, round(len(stations) * scale))):
+        copy, position = divmod(index, len(stations))
+        station = stations[position]
+        if copy:
+            station = station | {
+                ApiNames.STATION_ID: f"{station[ApiNames.STATION_ID]}{copy}"
+            }
+        scaled.append(station)
+
+    return scaled
+
+
+def create_app(behaviour: Behaviour) -> web.Application:
+    """Return the fake server application."""
+    rng = random.Random(behaviour.seed)  # noqa: S311
+
+    hydrological_stations = load_fixture("hydrological_stations")
+    move_to_present(hydrological_stations)
+    weather_stations = scale_stations(load_fixture("weather_stations"), behaviour.scale)
+
+    synop = Payload(weather_stations)
+    synop_stations = {
+        station[ApiNames.STATION_ID]: Payload(station) for station in weather_stations
+    }
+    hydro = Payload(scale_stations(hydrological_stations, behaviour.scale))
+    hydrological_alerts = Payload(load_fixture("hydrological_alerts"))
+    weather_alerts = Payload(load_fixture("weather_alerts"))
+    hydrological_details = Payload(load_fixture("hydrological_details"))
+    forecast = Payload(load_fixture("weather_station_proxy"))
+
+    @web.middleware
+    async def upstream_conditions(
+        request: web.Request, handler: Handler
+    ) -> web.StreamResponse:
+        delay = behaviour.latency + rng.uniform(-behaviour.jitter, behaviour.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if rng.random() < behaviour.error_rate:
+            return web.Response(status=500, text="Internal Server Error")
+
+        return await handler(request)
+
+    async def synop_station(request: web.Request) -> web.Response:
+        if (payload := synop_stations.get(request.match_info["id"])) is None:
+            raise web.HTTPNotFound
+
+        return payload.response(request)
+
+    def serve(payload: Payload) -> Handler:
+        async def handler(request: web.Request) -> web.Response:
+            return payload.response(request)
+
+        return handler
+
+    app = web.Application(middlewares=[upstream_conditions])
+    app.router.add_get("/api/data/synop", serve(synop))
+    app.router.add_get("/api/data/synop/id/{id}", synop_station)
+    app.router.add_get("/api/data/hydro", serve(hydro))
+    app.router.add_get("/api/data/warningshydro", serve(hydrological_alerts))
+    app.router.add_get("/api/data/warningsmeteo", serve(weather_alerts))
+    app.router.add_get("/station/hydro/status", serve(hydrological_details))
+    app.router.add_get("/forecast", serve(forecast))
+
+    return app
+
+
+def run_server(port: int, behaviour: Behaviour) -> None:
+    """Run the fake server until it is stopped."""
+    web.run_app(create_app(behaviour), host="localhost", port=port, print=None)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the fake server behaviour arguments to a parser."""
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="response delay in milliseconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random delay spread in milliseconds"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of 500 responses"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="station list size multiplier"
+    )
+    parser.add_argument("--seed", type=int, help="random seed")
+
+
+def behaviour_from_arguments(args: argparse.Namespace) -> Behaviour:
+    """Return the fake server behaviour from parsed arguments."""
+    return Behaviour(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        scale=args.scale,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the fake server."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    run_server(args.port, behaviour_from_arguments(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Benchmark parsing and alert matching hot paths against the recorded baseline.
+
+Every case runs over the test fixtures: the ``/hydro`` payload with all its
+stations, the hydrological and weather alerts and the proxy weather payload.
+The best of several timing rounds is reported as operations per second, where
+an operation is one pass over the whole input, together with the peak memory
+allocated by a single pass as traced by ``tracemalloc``. Results are compared
+with ``hot_paths_baseline.json``, a slowdown or memory growth larger than the
+tolerance fails the run.
+
+Measurement dates of the stations are moved so the latest water level reading
+is current, stations without a current reading are skipped by the parser as
+they are by the client. The weather alerts of
+the fixture have expired, so weather alert matching scans every alert for every
+station, which is the worst case.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from contextlib import suppress
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import orjson
+from aiohttp import ClientSession
+
+from imgw_pib import ApiError, ImgwPib
+from imgw_pib.const import DATE_FORMAT, WEATHER_STATIONS_INFO_FILE
+from imgw_pib.model import ApiNames
+from imgw_pib.utils import gen_station_name, get_datetime, parse_weather_icon
+
+BASELINE_FILE = Path(__file__).parent / "hot_paths_baseline.json"
+WARSAW_TZ = ZoneInfo("Europe/Warsaw")
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+DATE_KEYS = (
+    ApiNames.WATER_LEVEL_MEASUREMENT_DATE,
+    ApiNames.WATER_TEMPERATURE_MEASUREMENT_DATE,
+    ApiNames.WATER_FLOW_MEASUREMENT_DATE,
+    ApiNames.ICE_PHENOMENA_MEASUREMENT_DATE,
+    ApiNames.VEGETATION_PHENOMENA_MEASUREMENT_DATE,
+)
+
+
+def move_to_present(stations: list[dict[str, Any]]) -> None:
+    """Move measurement dates so the latest water level reading is current."""
+    latest = max(
+        datetime.strptime(date, DATE_FORMAT).replace(tzinfo=WARSAW_TZ)
+        for station in stations
+        if (date := station[ApiNames.WATER_LEVEL_MEASUREMENT_DATE]) is not None
+    )
+    offset = datetime.now(tz=WARSAW_TZ).replace(second=0, microsecond=0) - latest
+
+    for station in stations:
+        for key in DATE_KEYS:
+            if (date := station[key]) is not None:
+                moved = datetime.strptime(date, DATE_FORMAT).replace(tzinfo=WARSAW_TZ)
+                moved += offset
+                station[key] = moved.strftime(DATE_FORMAT)
+
+
+async def create_client() -> ImgwPib:
+    """Return an API client, no requests are made by the benchmarked code."""
+    async with ClientSession() as session:
+        return ImgwPib(session)
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    """Return benchmark cases, each making one pass over its input."""
+    hydro_payload = (FIXTURES / "hydrological_stations.json").read_bytes()
+    proxy_payload = (FIXTURES / "weather_station_proxy.json").read_bytes()
+    stations: list[dict[str, Any]] = orjson.loads(hydro_payload)
+    hydrological_alerts = orjson.loads(
+        (FIXTURES / "hydrological_alerts.json").read_bytes()
+    )
+    weather_alerts = orjson.loads((FIXTURES / "weather_alerts.json").read_bytes())
+    teryts = [
+        info["teryt"]
+        for info in orjson.loads(WEATHER_STATIONS_INFO_FILE.read_bytes()).values()
+    ]
+    move_to_present(stations)
+    dates = [station[key] for station in stations for key in DATE_KEYS]
+    icons = [
+        f"n{cloud}z{precip:02}{time_of_day}"
+        for cloud, precip, time_of_day in product(
+            range(9), (0, 51, 61, 68, 71, 81), "dn"
+        )
+    ]
+    client = asyncio.run(create_client())
+
+    def parse_hydrological_data() -> None:
+        client._parsed_hydrological_data.clear()  # noqa: SLF001
+        for station in stations:
+            with suppress(ApiError):
+                client._parse_hydrological_data(station, hydrological_alerts)  # noqa: SLF001
+
+    def parse_hydrological_data_unchanged() -> None:
+        for station in stations:
+            with suppress(ApiError):
+                client._parse_hydrological_data(station, hydrological_alerts)  # noqa: SLF001
+
+    def extract_hydrological_alert() -> None:
+        for station in stations:
+            client._extract_hydrological_alert(  # noqa: SLF001
+                hydrological_alerts,
+                station[ApiNames.RIVER],
+                station[ApiNames.PROVINCE],
+            )
+
+    def extract_weather_alert() -> None:
+        for teryt in teryts:
+            client._extract_weather_alert(weather_alerts, teryt)  # noqa: SLF001
+
+    return {
+        "decode hydro payload": lambda: orjson.loads(hydro_payload),
+        "decode proxy payload": lambda: orjson.loads(proxy_payload),
+        "parse hydrological data": parse_hydrological_data,
+        "parse hydrological data, unchanged": parse_hydrological_data_unchanged,
+        "extract hydrological alert": extract_hydrological_alert,
+        "extract weather alert": extract_weather_alert,
+        "get_datetime": lambda: [get_datetime(date, DATE_FORMAT) for date in dates],
+        "parse_weather_icon": lambda: [parse_weather_icon(icon) for icon in icons],
+        "gen_station_name": lambda: [
+            gen_station_name(station[ApiNames.STATION], station[ApiNames.RIVER])
+            for station in stations
+        ],
+    }
+
+
+def measure(case: Callable[[], object], rounds: int) -> dict[str, float]:
+    """Return operations per second and the peak memory of one operation."""
+    timer = timeit.Timer(case)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=rounds, number=number))
+
+    tracemalloc.start()
+    case()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops": number / best, "peak": peak}
+
+
+def main() -> None:
+    """Run the benchmark cases and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5, help="timing rounds")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown or memory growth",
+    )
+    parser.add_argument(
+        "--update", action="store_true", help="record the results as the baseline"
+    )
+    args = parser.parse_args()
+
+    baseline: dict[str, dict[str, float]] = {}
+    if BASELINE_FILE.exists():
+        baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+
+    results = {}
+    failed = False
+
+    for name, case in cases().items():
+        result = results[name] = measure(case, args.rounds)
+        line = (
+            f"{name:>35}: {result['ops']:10.1f} ops/s, {result['peak'] / 1024:8.1f} KiB"
+        )
+
+        if (reference := baseline.get(name)) is not None:
+            speed = result["ops"] / reference["ops"] - 1
+            memory = result["peak"] / reference["peak"] - 1
+            status = "OK"
+            if speed < -args.tolerance or memory > args.tolerance:
+                status = "FAIL"
+                failed = True
+            line += f", speed {speed:+.0%}, memory {memory:+.0%}, {status}"
+
+        print(line)
+
+    if args.update:
+        BASELINE_FILE.write_text(
+            json.dumps(
+                {
+                    name: {"ops": round(result["ops"], 1), "peak": result["peak"]}
+                    for name, result in results.items()
+                },
+                indent=4,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+    elif failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Check import time of imgw_pib modules against the recorded budget.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+several times and the fastest cumulative import time is compared with the
+budget. ``import_time_budget.json`` stores the measured import time of every
+module together with the tolerance allowed on top of it for slower machines and
+noise, the budget is the measured time multiplied by the tolerance. Heavy
+dependencies which should only be loaded on first use must not be imported at
+all.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+BUDGET_FILE = Path(__file__).parent / "import_time_budget.json"
+LAZY_MODULES = ("aiofiles", "aiohttp", "orjson", "yarl", "zoneinfo")
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def measure(module: str) -> tuple[int, set[str]]:
+    """Return cumulative import time in microseconds and all imported modules."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    cumulative = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if match := IMPORTTIME_PATTERN.match(line):
+            imported.add(match.group(3))
+            if match.group(3) == module:
+                cumulative = int(match.group(1))
+
+    return cumulative, imported
+
+
+def main() -> None:
+    """Measure import time and compare it with the budget."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="number of runs")
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="record the measured times as the new budget",
+    )
+    args = parser.parse_args()
+
+    budget: dict[str, Any] = json.loads(BUDGET_FILE.read_text(encoding="utf-8"))
+    tolerance: float = budget["tolerance"]
+    measured: dict[str, int] = budget["measured"]
+    failed = False
+
+    for module, recorded in measured.items():
+        limit = recorded * tolerance
+        runs = [measure(module) for _ in range(args.runs)]
+        best = min(cumulative for cumulative, _ in runs)
+        heavy = sorted(
+            name for name in runs[0][1] if name.split(".")[0] in LAZY_MODULES
+        )
+
+        status = "OK"
+        if best > limit or heavy:
+            status = "FAIL"
+            failed = True
+
+        print(
+            f"{module}: {best / 1000:.1f} ms, budget {limit / 1000:.1f} ms "
+            f"(recorded {recorded / 1000:.1f} ms x {tolerance}), {status}"
+        )
+        if heavy:
+            print(f"  imports heavy modules: {', '.join(heavy)}")
+
+        if args.update:
+            measured[module] = best
+
+    if args.update:
+        BUDGET_FILE.write_text(json.dumps(budget, indent=4) + "\n", encoding="utf-8")
+    elif failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
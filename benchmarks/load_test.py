@@ -0,0 +1,238 @@
+"""Drive fleets of API clients against the local fake IMGW-PIB server.
+
+The fake server from ``fake_imgw.py`` runs in a separate process with the
+requested latency, jitter, error rate and station list scale. All requests of
+a tuned session are redirected to it by a client middleware, so the clients run
+unchanged, rate limiter included, against their usual URLs. A fleet of
+hydrological and weather clients is created on one session and refreshed in
+rounds, every client fetching its data once per round.
+
+Reported are the time to create the fleet, data calls per second, latency
+percentiles of data calls and of single requests, errors and the resident
+memory of the client process.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import resource
+import statistics
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiohttp import ClientHandlerType, ClientRequest, ClientResponse, ClientSession
+from fake_imgw import add_arguments, behaviour_from_arguments, run_server
+from session import free_port, wait_for_server
+from yarl import URL
+
+from imgw_pib import ApiError, ImgwPib, create_session
+from imgw_pib.const import RATE_LIMITS
+from imgw_pib.model import ApiNames, RequestInfo
+
+FLEET_ERRORS = (ApiError, OSError, TimeoutError)
+
+
+def redirect_to(server: URL) -> Callable[..., Awaitable[ClientResponse]]:
+    """Return a client middleware sending all requests to the server."""
+
+    async def middleware(
+        request: ClientRequest, handler: ClientHandlerType
+    ) -> ClientResponse:
+        request.url = (
+            request.url.with_scheme(server.scheme)
+            .with_host(server.host or "localhost")
+            .with_port(server.port)
+        )
+        return await handler(request)
+
+    return middleware
+
+
+def resident_memory() -> float:
+    """Return the peak resident memory of the process in MiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentiles(values: list[float]) -> str:
+    """Return the 50th, 95th and 99th percentiles in milliseconds."""
+    if len(values) < 2:  # noqa: PLR2004
+        return "n/a"
+
+    quantiles = statistics.quantiles(values, n=100)
+    return (
+        f"p50 {quantiles[49] * 1000:.1f} ms, p95 {quantiles[94] * 1000:.1f} ms, "
+        f"p99 {quantiles[98] * 1000:.1f} ms"
+    )
+
+
+async def create_fleet(
+    session: ClientSession,
+    station_ids: list[tuple[str, str]],
+    args: argparse.Namespace,
+    requests: list[RequestInfo],
+) -> tuple[list[ImgwPib], Counter[str]]:
+    """Create API clients, return them and the errors of failed ones."""
+    errors: Counter[str] = Counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def create(kind: str, station_id: str) -> ImgwPib | None:
+        async with semaphore:
+            try:
+                client = await ImgwPib.create(
+                    session,
+                    weather_station_id=station_id if kind == "weather" else None,
+                    hydrological_station_id=(
+                        station_id if kind == "hydrological" else None
+                    ),
+                    hydrological_details=not args.no_details,
+                    lazy_validation=args.lazy,
+                )
+            except FLEET_ERRORS as exc:
+                errors[type(exc).__name__] += 1
+                return None
+
+        client.add_request_hook(requests.append)
+        return client
+
+    clients = await asyncio.gather(
+        *(create(kind, station_id) for kind, station_id in station_ids)
+    )
+
+    return [client for client in clients if client is not None], errors
+
+
+async def refresh(
+    clients: list[ImgwPib], concurrency: int
+) -> tuple[list[float], Counter[str]]:
+    """Fetch the data of every client once, return latencies and errors."""
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(client: ImgwPib) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if client.hydrological_station_id is not None:
+                    await client.get_hydrological_data()
+                else:
+                    await client.get_weather_data()
+            except FLEET_ERRORS as exc:
+                errors[type(exc).__name__] += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(fetch(client) for client in clients))
+
+    return latencies, errors
+
+
+async def station_ids(url: URL, args: argparse.Namespace) -> list[tuple[str, str]]:
+    """Return the station IDs of the fleet, read from the fake server."""
+    async with ClientSession() as session:
+        async with session.get(url / "api/data/hydro") as response:
+            hydrological: list[dict[str, Any]] = await response.json()
+        async with session.get(url / "api/data/synop") as response:
+            weather: list[dict[str, Any]] = await response.json()
+
+    if args.stations > len(hydrological):
+        msg = f"Only {len(hydrological)} hydrological stations, raise --scale"
+        raise SystemExit(msg)
+
+    return [
+        ("hydrological", station[ApiNames.STATION_ID])
+        for station in hydrological[: args.stations]
+    ] + [
+        ("weather", weather[index % len(weather)][ApiNames.STATION_ID])
+        for index in range(args.weather)
+    ]
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the load test against the fake server."""
+    port = free_port()
+    server = multiprocessing.Process(
+        target=run_server, args=(port, behaviour_from_arguments(args)), daemon=True
+    )
+    server.start()
+
+    url = URL.build(scheme="http", host="localhost", port=port)
+    try:
+        await wait_for_server(str(url / "api/data/synop"))
+        fleet = await station_ids(url, args)
+
+        requests: list[RequestInfo] = []
+        memory = resident_memory()
+
+        async with create_session(middlewares=(redirect_to(url),)) as session:
+            if args.rate:
+                limiter = ImgwPib(session).rate_limiter
+                for host in RATE_LIMITS:
+                    limiter.configure(host, args.rate, round(args.rate))
+
+            start = time.perf_counter()
+            clients, errors = await create_fleet(session, fleet, args, requests)
+            print(
+                f"fleet: {len(clients)} clients in {time.perf_counter() - start:.2f} s"
+                f", errors {dict(errors)}, memory +{resident_memory() - memory:.1f} MiB"
+            )
+
+            for number in range(1, args.rounds + 1):
+                requests.clear()
+                start = time.perf_counter()
+                latencies, errors = await refresh(clients, args.concurrency)
+                wall = time.perf_counter() - start
+                statuses = Counter(
+                    info.status or type(info.error).__name__ for info in requests
+                )
+
+                print(
+                    f"round {number}: {len(latencies) / wall:.1f} calls/s, "
+                    f"{percentiles(latencies)}, errors {dict(errors)}"
+                )
+                print(
+                    f"  requests: {len(requests)}, "
+                    f"{percentiles([info.total for info in requests])}, "
+                    f"statuses {dict(statuses)}"
+                )
+
+        print(f"peak memory: {resident_memory():.1f} MiB")
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main() -> None:
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--stations", type=int, default=1000, help="hydrological clients"
+    )
+    parser.add_argument("--weather", type=int, default=100, help="weather clients")
+    parser.add_argument("--rounds", type=int, default=3, help="refresh rounds")
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="parallel data calls"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1000.0,
+        help="requests per second allowed per host, 0 keeps the shipped limits",
+    )
+    parser.add_argument(
+        "--lazy", action="store_true", help="validate station IDs on first fetch"
+    )
+    parser.add_argument(
+        "--no-details", action="store_true", help="skip hydrological details"
+    )
+    add_arguments(parser)
+    parser.set_defaults(scale=2.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Measure memory retained per API client and per result with ``tracemalloc``.
+
+Fleets of hydrological and weather clients are created on one session, their
+requests are answered from the test fixtures by a replay transport, so no
+network access is needed. The memory still allocated after the fleet is
+created, divided by its size, is reported as bytes per instance. The memory
+retained by one result of every client, and by the parsed data of every
+station of the ``/hydro`` fixture, gives the bytes per result.
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from collections.abc import Awaitable
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+import orjson
+from aiohttp import ClientSession
+from hot_paths import move_to_present
+
+from imgw_pib import ApiError, ImgwPib, ReplayTransport
+from imgw_pib.const import (
+    API_HYDROLOGICAL_DETAILS_ENDPOINT,
+    API_HYDROLOGICAL_ENDPOINT,
+    API_HYDROLOGICAL_WARNINGS_ENDPOINT,
+    API_WEATHER_ENDPOINT,
+    API_WEATHER_PROXY_ENDPOINT,
+    API_WEATHER_WARNINGS_ENDPOINT,
+    PROXY_WEATHER_STATIONS_FILE,
+    WEATHER_STATIONS_INFO_FILE,
+)
+from imgw_pib.model import ApiNames
+from imgw_pib.transport import RecordedResponse
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+
+
+def load_fixture(name: str) -> Any:  # noqa: ANN401
+    """Return a decoded test fixture."""
+    return orjson.loads((FIXTURES / f"{name}.json").read_bytes())
+
+
+def response(url: object, payload: Any) -> RecordedResponse:  # noqa: ANN401
+    """Return a recorded response with a JSON payload."""
+    return RecordedResponse(
+        url=str(url),
+        status=200,
+        content_type="application/json",
+        headers=[],
+        body=orjson.dumps(payload),
+        ttfb=0.0,
+        transfer=0.0,
+    )
+
+
+def fixture_transport(
+    hydrological_stations: list[dict[str, Any]],
+    weather_stations: list[dict[str, Any]],
+) -> ReplayTransport:
+    """Return a transport answering all client requests from the fixtures."""
+    stations_info = orjson.loads(WEATHER_STATIONS_INFO_FILE.read_bytes()) | (
+        orjson.loads(PROXY_WEATHER_STATIONS_FILE.read_bytes())
+    )
+    forecast = load_fixture("weather_station_proxy")
+
+    return ReplayTransport(
+        [
+            response(API_HYDROLOGICAL_ENDPOINT, hydrological_stations),
+            response(
+                API_HYDROLOGICAL_WARNINGS_ENDPOINT, load_fixture("hydrological_alerts")
+            ),
+            response(API_WEATHER_ENDPOINT, weather_stations),
+            response(API_WEATHER_WARNINGS_ENDPOINT, load_fixture("weather_alerts")),
+        ]
+        + [
+            response(
+                API_HYDROLOGICAL_DETAILS_ENDPOINT.with_query(
+                    id=station[ApiNames.STATION_ID]
+                ),
+                load_fixture("hydrological_details"),
+            )
+            for station in hydrological_stations
+        ]
+        + [
+            response(
+                API_WEATHER_ENDPOINT / "id" / station[ApiNames.STATION_ID], station
+            )
+            for station in weather_stations
+        ]
+        + [
+            response(
+                API_WEATHER_PROXY_ENDPOINT.with_query(
+                    lat=info[ApiNames.LATITUDE], lon=info[ApiNames.LONGITUDE]
+                ),
+                forecast,
+            )
+            for info in stations_info.values()
+            if ApiNames.LATITUDE in info
+        ]
+    )
+
+
+async def retained(objects: Awaitable[list[Any]]) -> tuple[int, list[Any]]:
+    """Return the memory retained by the created objects and the objects."""
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    created = await objects
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+
+    return after - before, created
+
+
+async def create_clients(
+    session: ClientSession, transport: ReplayTransport, kind: str, ids: list[str]
+) -> list[ImgwPib]:
+    """Create a client for every station."""
+    return [
+        await ImgwPib.create(
+            session,
+            weather_station_id=station_id if kind == "weather" else None,
+            hydrological_station_id=station_id if kind == "hydrological" else None,
+            transport=transport,
+        )
+        for station_id in ids
+    ]
+
+
+async def fetch_results(clients: list[ImgwPib], kind: str) -> list[Any]:
+    """Return the data of every client, skipping stations without current data."""
+    results = []
+    for client in clients:
+        with suppress(ApiError):
+            results.append(await getattr(client, f"get_{kind}_data")())
+
+    return results
+
+
+async def parse_stations(
+    client: ImgwPib,
+    stations: list[dict[str, Any]],
+    alerts: list[dict[str, Any]],
+) -> list[Any]:
+    """Return the parsed data of every station with current data."""
+    results = []
+    for station in stations:
+        with suppress(ApiError):
+            results.append(client._parse_hydrological_data(station, alerts))  # noqa: SLF001
+
+    return results
+
+
+async def measure(instances: int) -> None:
+    """Create the fleets and report memory per instance and per result."""
+    hydrological_stations = load_fixture("hydrological_stations")
+    move_to_present(hydrological_stations)
+    weather_stations = load_fixture("weather_stations")
+    transport = fixture_transport(hydrological_stations, weather_stations)
+    station_ids = {
+        "hydrological": [
+            station[ApiNames.STATION_ID] for station in hydrological_stations
+        ][:instances],
+        "weather": [station[ApiNames.STATION_ID] for station in weather_stations][
+            :instances
+        ],
+    }
+
+    async with ClientSession() as session:
+        # Load bundled metadata and shared station lists outside the measurement
+        await ImgwPib.create(
+            session,
+            weather_station_id=station_ids["weather"][0],
+            hydrological_station_id=station_ids["hydrological"][0],
+            transport=transport,
+        )
+        tracemalloc.start()
+
+        for kind, ids in station_ids.items():
+            size, clients = await retained(
+                create_clients(session, transport, kind, ids)
+            )
+            print(f"{kind} instance: {size / len(clients):,.0f} B per instance")
+
+            size, results = await retained(fetch_results(clients, kind))
+            print(f"{kind} result: {size / len(results):,.0f} B per result")
+
+        size, results = await retained(
+            parse_stations(
+                ImgwPib(session),
+                hydrological_stations,
+                load_fixture("hydrological_alerts"),
+            )
+        )
+        print(f"parsed hydrological data: {size / len(results):,.0f} B per station")
+
+        tracemalloc.stop()
+
+
+def main() -> None:
+    """Parse arguments and run the measurement."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--instances", type=int, default=50, help="clients of each kind"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(measure(args.instances))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Record upstream responses to an archive or replay one to measure throughput.
+
+``record`` fetches the data of the given stations from the real API once,
+through a recording transport, and writes all responses to the archive.
+``replay`` creates the same clients with a replay transport and fetches their
+data repeatedly with no network access, at full speed or at the recorded pace,
+reporting data calls per second and the latency of data calls.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from aiohttp import ClientSession
+
+from imgw_pib import ImgwPib, RecordingTransport, ReplayTransport, create_session
+from imgw_pib.transport import Transport
+
+
+async def create_clients(
+    session: ClientSession,
+    args: argparse.Namespace,
+    transport: Transport,
+) -> list[ImgwPib]:
+    """Create a client for every station."""
+    return [
+        await ImgwPib.create(
+            session, hydrological_station_id=station_id, transport=transport
+        )
+        for station_id in args.hydrological
+    ] + [
+        await ImgwPib.create(
+            session, weather_station_id=station_id, transport=transport
+        )
+        for station_id in args.weather
+    ]
+
+
+async def fetch(client: ImgwPib) -> None:
+    """Fetch the data of a client."""
+    if client.hydrological_station_id is not None:
+        await client.get_hydrological_data()
+    else:
+        await client.get_weather_data()
+
+
+async def record(args: argparse.Namespace) -> None:
+    """Record the responses of one fetch of every client."""
+    transport = RecordingTransport()
+    async with create_session() as session:
+        for client in await create_clients(session, args, transport):
+            await fetch(client)
+
+    await transport.save(args.archive)
+    print(f"recorded {len(transport.responses)} responses to {args.archive}")
+
+
+async def replay(args: argparse.Namespace) -> None:
+    """Replay the archive and report throughput."""
+    transport = await ReplayTransport.load(args.archive, args.pace)
+    latencies: list[float] = []
+
+    async def timed_fetch(client: ImgwPib) -> None:
+        start = time.perf_counter()
+        await fetch(client)
+        latencies.append(time.perf_counter() - start)
+
+    async with ClientSession() as session:
+        clients = await create_clients(session, args, transport)
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(timed_fetch(client) for client in clients))
+        wall = time.perf_counter() - start
+
+    print(
+        f"{len(latencies) / wall:.1f} calls/s, "
+        f"mean {statistics.mean(latencies) * 1000:.2f} ms, "
+        f"max {max(latencies) * 1000:.2f} ms"
+    )
+
+
+def main() -> None:
+    """Parse arguments and record or replay."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("archive", help="archive file")
+    parser.add_argument(
+        "--hydrological",
+        nargs="*",
+        default=["154190050"],
+        help="hydrological station IDs",
+    )
+    parser.add_argument(
+        "--weather", nargs="*", default=["12295"], help="weather station IDs"
+    )
+    parser.add_argument("--rounds", type=int, default=100, help="replay rounds")
+    parser.add_argument(
+        "--pace",
+        type=float,
+        default=0.0,
+        help="replay delay as a multiple of the recorded timing, 0 for full speed",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(record(args) if args.mode == "record" else replay(args))
+
+
+if __name__ == "__main__":
+    main()
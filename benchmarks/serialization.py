@@ -0,0 +1,116 @@
+"""Compare serialization of results with ``dataclasses.asdict`` and stdlib json.
+
+The results of hydrological and weather clients are created from the test
+fixtures by a replay transport. Every result is serialized one at a time with
+``asdict`` and ``json.dumps``, with ``to_dict``, ``to_json_bytes`` and back with
+``from_dict``. All results together are encoded as one compact snapshot and
+decoded again. Reported are microseconds per result and the encoded size.
+"""
+
+import argparse
+import asyncio
+import json
+import timeit
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
+import orjson
+from aiohttp import ClientSession
+from hot_paths import move_to_present
+from memory import create_clients, fetch_results, fixture_transport, load_fixture
+
+from imgw_pib.model import ApiNames, ImgwPibData
+from imgw_pib.serialization import (
+    decode_snapshot,
+    encode_snapshot,
+    from_dict,
+    to_dict,
+    to_json_bytes,
+)
+
+
+async def create_results(instances: int) -> list[ImgwPibData]:
+    """Return the data of hydrological and weather clients."""
+    hydrological_stations = load_fixture("hydrological_stations")
+    move_to_present(hydrological_stations)
+    weather_stations = load_fixture("weather_stations")
+    transport = fixture_transport(hydrological_stations, weather_stations)
+    results: list[ImgwPibData] = []
+
+    async with ClientSession() as session:
+        for kind, stations in (
+            ("hydrological", hydrological_stations),
+            ("weather", weather_stations),
+        ):
+            ids = [station[ApiNames.STATION_ID] for station in stations][:instances]
+            clients = await create_clients(session, transport, kind, ids)
+            results.extend(await fetch_results(clients, kind))
+
+    return results
+
+
+def json_default(value: object) -> Any:  # noqa: ANN401
+    """Return a form of a value the stdlib json can serialize."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    msg = f"Type is not JSON serializable: {type(value).__name__}"
+    raise TypeError(msg)
+
+
+def stdlib_json(data: ImgwPibData) -> bytes:
+    """Return JSON of a result made by ``asdict`` and ``json.dumps``."""
+    return json.dumps(asdict(data), default=json_default).encode()
+
+
+def per_result(function: Callable[[], object], count: int, rounds: int) -> float:
+    """Return the best time of a call in microseconds per result."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(rounds, number)) / number / count * 1e6
+
+
+def main() -> None:
+    """Parse arguments and run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--instances", type=int, default=50, help="clients of each kind"
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="timing rounds")
+    args = parser.parse_args()
+
+    results = asyncio.run(create_results(args.instances))
+    encoded = [(type(data), to_json_bytes(data)) for data in results]
+    snapshot = encode_snapshot(results)
+    cases: dict[str, tuple[Callable[[], object], int | None]] = {
+        "asdict + json.dumps": (
+            lambda: [stdlib_json(data) for data in results],
+            sum(len(stdlib_json(data)) for data in results),
+        ),
+        "asdict": (lambda: [asdict(data) for data in results], None),
+        "to_dict": (lambda: [to_dict(data) for data in results], None),
+        "to_json_bytes": (
+            lambda: [to_json_bytes(data) for data in results],
+            sum(len(to_json_bytes(data)) for data in results),
+        ),
+        "orjson.loads + from_dict": (
+            lambda: [from_dict(cls, orjson.loads(content)) for cls, content in encoded],
+            None,
+        ),
+        "encode_snapshot": (lambda: encode_snapshot(results), len(snapshot)),
+        "decode_snapshot": (lambda: decode_snapshot(snapshot), None),
+    }
+
+    print(f"{len(results)} results")
+    for name, (function, size) in cases.items():
+        line = f"{name:>26}: {per_result(function, len(results), args.rounds):8.2f} us"
+        if size is not None:
+            line += f", {size / len(results):8,.0f} B per result"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Compare a default client session with the tuned one against a local server.
+
+A fake IMGW-PIB server, serving the ``/hydro`` test fixture gzip compressed
+when asked to, runs in a separate process. A session without connection reuse,
+a default session and the tuned one make the same number of requests with the
+same concurrency. Response bodies are read but not decoded, so the transport
+dominates. Request latency percentiles, wall time and the CPU time of the
+client process are reported.
+"""
+
+import argparse
+import asyncio
+import gzip
+import multiprocessing
+import socket
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from aiohttp import ClientSession, TCPConnector, hdrs, web
+
+from imgw_pib import create_session
+
+FIXTURE = (
+    Path(__file__).parents[1] / "tests" / "fixtures" / "hydrological_stations.json"
+)
+
+
+def run_server(port: int) -> None:
+    """Run the fake IMGW-PIB server."""
+    payload = FIXTURE.read_bytes()
+    compressed = gzip.compress(payload)
+
+    async def hydro(request: web.Request) -> web.Response:
+        if "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
+            return web.Response(
+                body=compressed,
+                content_type="application/json",
+                headers={hdrs.CONTENT_ENCODING: "gzip"},
+            )
+        return web.Response(body=payload, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/api/data/hydro", hydro)
+    web.run_app(app, host="localhost", port=port, print=None)
+
+
+def no_reuse_session() -> ClientSession:
+    """Return a session opening a new connection for every request."""
+    return ClientSession(connector=TCPConnector(force_close=True))
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(url: str) -> None:
+    """Wait until the server accepts requests."""
+    async with ClientSession() as session:
+        for _ in range(100):
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+            except OSError:
+                await asyncio.sleep(0.05)
+            else:
+                return
+
+    msg = "Server did not start"
+    raise RuntimeError(msg)
+
+
+async def measure(
+    session_factory: Callable[[], ClientSession],
+    url: str,
+    requests: int,
+    concurrency: int,
+) -> dict[str, float]:
+    """Make requests and return latency percentiles, wall and CPU time."""
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(session: ClientSession) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            async with session.get(url) as response:
+                await response.read()
+            latencies.append(time.perf_counter() - start)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    async with session_factory() as session:
+        await asyncio.gather(*(request(session) for _ in range(requests)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "wall": wall,
+        "cpu": cpu,
+    }
+
+
+async def benchmark(requests: int, concurrency: int, rounds: int) -> None:
+    """Run the benchmark against the fake server."""
+    port = free_port()
+    server = multiprocessing.Process(target=run_server, args=(port,), daemon=True)
+    server.start()
+
+    url = f"http://localhost:{port}/api/data/hydro"
+    try:
+        await wait_for_server(url)
+
+        for name, factory in (
+            ("no reuse", no_reuse_session),
+            ("default", ClientSession),
+            ("tuned", create_session),
+        ):
+            results = [
+                await measure(factory, url, requests, concurrency)
+                for _ in range(rounds)
+            ]
+            best = min(results, key=lambda result: result["wall"])
+            print(
+                f"{name:>8}: p50 {best['p50']:.2f} ms, p95 {best['p95']:.2f} ms, "
+                f"wall {best['wall']:.2f} s, cpu {best['cpu']:.2f} s"
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500, help="requests per run")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel requests")
+    parser.add_argument("--rounds", type=int, default=3, help="runs per session")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.requests, args.concurrency, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Persistent cache of the last good IMGW-PIB API responses."""
+
+import asyncio
+import hashlib
+import logging
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+from uuid import uuid4
+
+import aiofiles
+import aiofiles.os
+import orjson
+
+if TYPE_CHECKING:
+    from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SnapshotCache:
+    """Last good payload of every requested URL, kept as files in a directory."""
+
+    def __init__(self: Self, directory: Path | str) -> None:
+        """Initialize."""
+        self._directory = Path(directory)
+        self._writes: set[asyncio.Task[None]] = set()
+
+    def store(
+        self: Self,
+        url: "URL | str",
+        payload: Any,  # noqa: ANN401
+        fetched_at: datetime | None = None,
+    ) -> None:
+        """Write the payload of a URL in the background."""
+        task = asyncio.create_task(
+            self._write(str(url), payload, fetched_at or datetime.now(tz=UTC))
+        )
+        self._writes.add(task)
+        task.add_done_callback(self._write_done)
+
+    async def load(self: Self, url: "URL | str") -> tuple[datetime, Any] | None:
+        """Return the fetch time and the payload of a URL."""
+        path = self._path(str(url))
+
+        try:
+            async with aiofiles.open(path, "rb") as file:
+                content = await file.read()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            _LOGGER.debug("Reading snapshot %s failed: %s", path, exc)
+            return None
+
+        try:
+            entry = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            _LOGGER.debug("Ignoring corrupted snapshot %s", path)
+            return None
+
+        if entry.get("url") != str(url):
+            return None
+
+        return datetime.fromisoformat(entry["fetched_at"]), entry["payload"]
+
+    async def flush(self: Self) -> None:
+        """Wait for the pending writes."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _path(self: Self, url: str) -> Path:
+        """Return the snapshot file of a URL."""
+        return self._directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    async def _write(
+        self: Self,
+        url: str,
+        payload: Any,  # noqa: ANN401
+        fetched_at: datetime,
+    ) -> None:
+        """Write a snapshot, replacing the previous one at once."""
+        path = self._path(url)
+        temp_path = path.with_suffix(f".{uuid4().hex}.tmp")
+        content = orjson.dumps(
+            {"url": url, "fetched_at": fetched_at.isoformat(), "payload": payload}
+        )
+
+        await aiofiles.os.makedirs(self._directory, exist_ok=True)
+        async with aiofiles.open(temp_path, "wb") as file:
+            await file.write(content)
+        await aiofiles.os.replace(temp_path, path)
+
+    def _write_done(self: Self, task: asyncio.Task[None]) -> None:
+        """Forget a finished write, log it if it failed."""
+        self._writes.discard(task)
+
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            _LOGGER.debug("Writing snapshot failed: %s", exc)
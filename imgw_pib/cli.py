@@ -0,0 +1,147 @@
+"""Command line export of IMGW-PIB national snapshots."""
+
+import argparse
+import asyncio
+import csv
+import io
+import logging
+import sys
+from collections.abc import AsyncGenerator, Callable, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import orjson
+from aiohttp import ClientError, ClientSession
+
+from .client import ImgwPib
+from .exceptions import ApiError
+from .model import ImgwPibData, StationKind
+from .serialization import to_dict, to_json_bytes
+from .session import create_session
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv")
+
+
+def csv_row(data: ImgwPibData) -> dict[str, Any]:
+    """Return the data as a flat CSV row.
+
+    Sensor readings and alerts are split into a column with their value and
+    columns with their other fields, lists are stored as JSON.
+    """
+    row: dict[str, Any] = {}
+
+    for name, value in to_dict(data).items():
+        if isinstance(value, dict):
+            row[name] = value["value"]
+            for key, item in value.items():
+                if key not in {"name", "value"}:
+                    row[f"{name}_{key}"] = _csv_value(item)
+        else:
+            row[name] = _csv_value(value)
+
+    return row
+
+
+def _csv_value(value: Any) -> Any:  # noqa: ANN401
+    """Return a value as stored in a CSV cell."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return orjson.dumps(value).decode()
+
+    return value
+
+
+def ndjson_writer(stream: BinaryIO) -> Callable[[ImgwPibData], None]:
+    """Return a function writing every record as one JSON line."""
+
+    def write(data: ImgwPibData) -> None:
+        stream.write(to_json_bytes(data) + b"\n")
+
+    return write
+
+
+def csv_writer(stream: BinaryIO) -> Callable[[ImgwPibData], None]:
+    """Return a function writing every record as one CSV row, after a header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header: list[str] = []
+
+    def write(data: ImgwPibData) -> None:
+        row = csv_row(data)
+        if not header:
+            header.extend(row)
+            writer.writerow(header)
+        writer.writerow(row.get(column) for column in header)
+
+        stream.write(buffer.getvalue().encode())
+        buffer.seek(0)
+        buffer.truncate()
+
+    return write
+
+
+async def export(
+    session: ClientSession, source: StationKind, output_format: str, stream: BinaryIO
+) -> int:
+    """Write the data of all stations of a source, return the number of records.
+
+    Records are written one at a time, as they are parsed.
+    """
+    client = ImgwPib(session)
+    records: AsyncGenerator[ImgwPibData] = (
+        client.stream_hydrological_data()
+        if source is StationKind.HYDROLOGICAL
+        else client.stream_weather_data()
+    )
+    write = ndjson_writer(stream) if output_format == "ndjson" else csv_writer(stream)
+    count = 0
+
+    async for data in records:
+        write(data)
+        count += 1
+
+    stream.flush()
+
+    return count
+
+
+async def _run(args: argparse.Namespace, stream: BinaryIO) -> int:
+    """Export the snapshot with a tuned session."""
+    async with create_session() as session:
+        return await export(session, args.source, args.format, stream)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Export the data of all hydrological or weather stations."""
+    parser = argparse.ArgumentParser(
+        prog="imgw-pib",
+        description=(
+            "Fetch the current data of all hydrological or weather stations with "
+            "their alerts and write it as NDJSON or CSV, one record at a time."
+        ),
+    )
+    parser.add_argument("source", type=StationKind, choices=list(StationKind))
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument(
+        "-o", "--output", default="-", help="output file, standard output by default"
+    )
+    parser.add_argument("--debug", action="store_true", help="log debug messages")
+    args = parser.parse_args(argv)
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+
+    try:
+        if args.output == "-":
+            count = asyncio.run(_run(args, sys.stdout.buffer))
+        else:
+            with Path(args.output).open("wb") as stream:
+                count = asyncio.run(_run(args, stream))
+    except (ApiError, ClientError, TimeoutError) as exc:
+        parser.exit(1, f"imgw-pib: error: {exc!r}\n")
+
+    _LOGGER.debug("Exported %s records", count)
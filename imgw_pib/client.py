@@ -0,0 +1,1674 @@
+"""IMGW-PIB API client."""
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, ClassVar, Self, TypeVar, cast
+from weakref import WeakKeyDictionary
+
+import aiofiles
+import orjson
+from aiohttp import ClientError, ClientResponse, ClientSession
+from yarl import URL
+
+from .cache import SnapshotCache
+from .const import (
+    ALERT_LEVEL_MAP,
+    API_BASE_ENDPOINT,
+    API_HYDROLOGICAL_DETAILS_ENDPOINT,
+    API_HYDROLOGICAL_ENDPOINT,
+    API_HYDROLOGICAL_WARNINGS_ENDPOINT,
+    API_WEATHER_ENDPOINT,
+    API_WEATHER_PROXY_ENDPOINT,
+    API_WEATHER_WARNINGS_ENDPOINT,
+    DATA_VALIDITY_PERIOD,
+    DATE_FORMAT,
+    FORECAST_CACHE_TTL,
+    FORECAST_GRID_RESOLUTION,
+    HEADERS,
+    HYDROLOGICAL_ALERTS_MAP,
+    HYDROLOGICAL_PAYLOAD_REUSE_PERIOD,
+    ICE_PHENOMENA_DATA_VALIDITY_PERIOD,
+    NO_ALERT,
+    PROXY_WEATHER_STATIONS_FILE,
+    REVALIDATE_AFTER,
+    RIVERS_INFO_FILE,
+    TIMEOUT,
+    VEGETATION_PHENOMENA_DATA_VALIDITY_PERIOD,
+    WEATHER_ALERTS_MAP,
+    WEATHER_STATIONS_INFO_FILE,
+)
+from .exceptions import ApiError
+from .freshness import FreshnessTracker
+from .geo import StationIndex
+from .hydrology import HydrologicalIndex
+from .instrumentation import RequestHook, RequestTrace
+from .metrics import MetricsRegistry
+from .model import (
+    Alert,
+    ApiNames,
+    CacheStatus,
+    DataSource,
+    ForecastData,
+    HydrologicalData,
+    ImgwPibData,
+    NearbyStation,
+    StationMatch,
+    Units,
+    WeatherData,
+)
+from .ratelimit import RateLimiter
+from .scheduler import CadencePolicy, PollingScheduler
+from .search import StationSearchIndex
+from .transport import RecordedResponse, Transport
+from .utils import (
+    create_sensor_data,
+    decode_vegetation_phenomena,
+    gen_station_name,
+    get_datetime,
+    measurement_date_if_current,
+    parse_weather_icon,
+    row_fingerprint,
+    snap_to_grid,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_DataT = TypeVar("_DataT", bound=ImgwPibData)
+
+_HYDROLOGICAL_MEASUREMENT_DATES = {
+    "water_level": ApiNames.WATER_LEVEL_MEASUREMENT_DATE,
+    "water_temperature": ApiNames.WATER_TEMPERATURE_MEASUREMENT_DATE,
+    "water_flow": ApiNames.WATER_FLOW_MEASUREMENT_DATE,
+    "ice_phenomena": ApiNames.ICE_PHENOMENA_MEASUREMENT_DATE,
+    "vegetation_phenomena": ApiNames.VEGETATION_PHENOMENA_MEASUREMENT_DATE,
+}
+
+_ENDPOINT_SOURCES = {
+    "hydro": DataSource.HYDROLOGICAL,
+    "warningshydro": DataSource.HYDROLOGICAL_ALERTS,
+    "synop": DataSource.WEATHER,
+    "warningsmeteo": DataSource.WEATHER_ALERTS,
+}
+
+
+@dataclass(slots=True)
+class _SharedStationList:
+    """Station list, and its index, shared by the clients of a session.
+
+    The key is only compared with the key of a new station payload.
+    """
+
+    key: tuple[tuple[str | None, ...], ...]
+    stations: dict[str, str]
+    index: HydrologicalIndex | None = None
+
+
+@dataclass(slots=True)
+class _SharedForecasts:
+    """Forecasts, and forecast requests in flight, shared by the clients of a session.
+
+    Requests are futures of the event loop of the session, so they are never
+    awaited from another session.
+    """
+
+    forecasts: dict[tuple[float, float], tuple[float, ForecastData]] = field(
+        default_factory=dict
+    )
+    requests: dict[tuple[float, float], asyncio.Future[ForecastData]] = field(
+        default_factory=dict
+    )
+
+
+@dataclass(slots=True)
+class _Subscription:
+    """Rows, alerts and results of the stations of a subscription."""
+
+    fingerprints: dict[str, int] = field(default_factory=dict)
+    alerts_versions: dict[str, int] = field(default_factory=dict)
+    results: dict[str, HydrologicalData] = field(default_factory=dict)
+    alerts: list[dict[str, Any]] | None = None
+    alerts_version: int = 0
+
+    def update_alerts(self: Self, alerts: list[dict[str, Any]]) -> None:
+        """Record the alerts of a snapshot."""
+        if alerts != self.alerts:
+            self.alerts = alerts
+            self.alerts_version += 1
+
+    def changed(self: Self, station_id: str, row: dict[str, Any]) -> bool:
+        """Return whether the row or the alerts changed since the station was seen.
+
+        Stations are compared with the alerts they were last processed with, so
+        an alert change is not missed by stations skipped in the meantime.
+        """
+        fingerprint = row_fingerprint(row)
+
+        if (
+            self.fingerprints.get(station_id) == fingerprint
+            and self.alerts_versions.get(station_id) == self.alerts_version
+        ):
+            return False
+
+        self.fingerprints[station_id] = fingerprint
+        self.alerts_versions[station_id] = self.alerts_version
+
+        return True
+
+
+# Fetch times of cached payloads served instead of unreachable upstream data
+_snapshot_fetch_times: ContextVar[list[datetime] | None] = ContextVar(
+    "_snapshot_fetch_times", default=None
+)
+# Fetch times of recent payloads reused instead of a new request
+_reused_fetch_times: ContextVar[list[datetime] | None] = ContextVar(
+    "_reused_fetch_times", default=None
+)
+
+
+class ImgwPib:
+    """Main class of IMGW-PIB API wrapper."""
+
+    _rivers_info_cache: dict[str, dict[str, str]] | None = None
+    _weather_stations_info_cache: dict[str, dict[str, Any]] | None = None
+    _proxy_weather_stations_cache: dict[str, dict[str, Any]] | None = None
+    _all_weather_stations_info_cache: dict[str, dict[str, Any]] | None = None
+    _weather_stations_index_cache: StationIndex | None = None
+    _shared_forecasts: ClassVar[WeakKeyDictionary[ClientSession, _SharedForecasts]] = (
+        WeakKeyDictionary()
+    )
+    _shared_station_lists: ClassVar[
+        WeakKeyDictionary[ClientSession, dict[DataSource, _SharedStationList]]
+    ] = WeakKeyDictionary()
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        session: ClientSession,
+        weather_station_id: str | None = None,
+        hydrological_station_id: str | None = None,
+        hydrological_details: bool = True,
+        forecast_grid_resolution: float = FORECAST_GRID_RESOLUTION,
+        max_stale_age: timedelta | None = None,
+        snapshot_cache: SnapshotCache | None = None,
+        lazy_validation: bool = False,
+        metrics: MetricsRegistry | None = None,
+        freshness: FreshnessTracker | None = None,
+        transport: Transport | None = None,
+    ) -> None:
+        """Initialize IMGW-PIB API wrapper.
+
+        With ``max_stale_age`` set, ``get_weather_data`` and ``get_hydrological_data``
+        return the last result at once. A result younger than half the publication
+        interval is not refreshed, an older one is refreshed in the background. Only
+        a result older than ``max_stale_age`` makes the call wait for the refresh.
+
+        With ``snapshot_cache`` set, the last good response of every request is
+        stored and served, with the data flagged as stale, when upstream is
+        unreachable.
+
+        With ``lazy_validation`` set, ``initialize`` does not download the station
+        lists, station IDs are validated by the first data fetch instead.
+
+        With ``metrics`` set, requests, parsing, index rebuilds and data age are
+        recorded in the registry. With ``freshness`` set, the lag of every new
+        measurement is recorded per station and sensor, including measurements too
+        old to be returned.
+
+        With ``transport`` set, responses come from the transport instead of direct
+        session requests, to record them or to replay a recording offline.
+        """
+        self._session = session
+        self._rate_limiter = RateLimiter.for_session(session)
+        self._request_hooks: list[RequestHook] = []
+        self._metrics = metrics
+        self._freshness = freshness
+        self._transport = transport
+        if metrics is not None:
+            self._request_hooks.append(metrics.observe_request)
+        self._weather_station_list: dict[str, str] = {}
+        self._hydrological_station_list: dict[str, str] = {}
+        self._hydrological_payload: tuple[datetime, list[dict[str, Any]]] | None = None
+        self._search_index: StationSearchIndex | None = None
+        self._hydrological_index: HydrologicalIndex | None = None
+        self._flood_levels: dict[str, tuple[float | None, float | None]] = {}
+        self._parsed_hydrological_data: dict[
+            str, tuple[int, datetime, HydrologicalData]
+        ] = {}
+        self._hydrological_alerts_fingerprint: int | None = None
+        self._hydrological_alerts: dict[
+            tuple[str, str | None], tuple[Alert, datetime | None]
+        ] = {}
+
+        self.weather_station_id = weather_station_id
+        self.hydrological_station_id = hydrological_station_id
+
+        self._hydrological_details = hydrological_details
+        self._forecast_grid_resolution = forecast_grid_resolution
+        self._max_stale_age = max_stale_age
+        self._snapshot_cache = snapshot_cache
+        self._lazy_validation = lazy_validation
+        self._weather_station_validated = False
+        self._hydrological_station_validated = False
+        self._last_results: dict[tuple[DataSource, str | None], ImgwPibData] = {}
+        self._refresh_tasks: dict[tuple[DataSource, str | None], asyncio.Task[Any]] = {}
+
+        self._weather_stations_info: dict[str, dict[str, Any]] = {}
+        self._rivers_info: dict[str, dict[str, str]] = {}
+        self._last_icon: str | None = None
+
+    @classmethod
+    async def create(  # noqa: PLR0913
+        cls: type[Self],
+        session: ClientSession,
+        weather_station_id: str | None = None,
+        hydrological_station_id: str | None = None,
+        hydrological_details: bool = True,
+        forecast_grid_resolution: float = FORECAST_GRID_RESOLUTION,
+        max_stale_age: timedelta | None = None,
+        snapshot_cache: SnapshotCache | None = None,
+        lazy_validation: bool = False,
+        metrics: MetricsRegistry | None = None,
+        freshness: FreshnessTracker | None = None,
+        transport: Transport | None = None,
+    ) -> Self:
+        """Create a new instance."""
+        instance = cls(
+            session,
+            weather_station_id,
+            hydrological_station_id,
+            hydrological_details,
+            forecast_grid_resolution,
+            max_stale_age,
+            snapshot_cache,
+            lazy_validation,
+            metrics,
+            freshness,
+            transport,
+        )
+        await instance.initialize()
+
+        return instance
+
+    @property
+    def rate_limiter(self: Self) -> RateLimiter:
+        """Return the rate limiter shared by clients of the session."""
+        return self._rate_limiter
+
+    @property
+    def weather_stations(self: Self) -> Mapping[str, str]:
+        """Return read-only list of weather stations."""
+        return MappingProxyType(self._weather_station_list)
+
+    @property
+    def hydrological_stations(self: Self) -> Mapping[str, str]:
+        """Return read-only list of hydrological stations."""
+        return MappingProxyType(self._hydrological_station_list)
+
+    async def initialize(self: Self) -> None:
+        """Initialize."""
+        _LOGGER.debug("Initializing IMGW-PIB")
+
+        if self.weather_station_id is not None:
+            _LOGGER.debug("Using weather station ID: %s", self.weather_station_id)
+
+            if not self._lazy_validation:
+                await self._validate_weather_station()
+
+            self._weather_stations_info = await self._load_weather_stations_info()
+
+        if self.hydrological_station_id is not None:
+            _LOGGER.debug(
+                "Using hydrological station ID: %s", self.hydrological_station_id
+            )
+
+            if not self._lazy_validation:
+                await self.update_hydrological_stations()
+
+                if self.hydrological_station_id not in self.hydrological_stations:
+                    msg = (
+                        "Invalid hydrological station ID: "
+                        f"{self.hydrological_station_id}"
+                    )
+                    raise ApiError(msg)
+
+                self._hydrological_station_validated = True
+
+            self._rivers_info = await self._load_rivers_info()
+
+            if self._hydrological_station_validated and self._hydrological_details:
+                await self._update_hydrological_details()
+
+    async def _validate_weather_station(self: Self) -> None:
+        """Check the weather station ID against the list of weather stations."""
+        if self._weather_station_validated:
+            return
+
+        await self.update_weather_stations()
+
+        if self.weather_station_id not in self.weather_stations:
+            msg = f"Invalid weather station ID: {self.weather_station_id}"
+            raise ApiError(msg)
+
+        self._weather_station_validated = True
+
+    async def stream_hydrological_data(
+        self: Self,
+    ) -> AsyncGenerator[HydrologicalData]:
+        """Yield hydrological data of all stations of one ``/hydro`` snapshot.
+
+        Stations without a current water level are skipped. Flood levels are only
+        known for stations whose details the client has fetched. Parsed data of
+        stations other than the client's one is not kept, so memory does not grow
+        with the number of yielded stations.
+        """
+        stations_data, alerts, fetched_at, stale = await self._fetch_snapshot(
+            API_HYDROLOGICAL_ENDPOINT, API_HYDROLOGICAL_WARNINGS_ENDPOINT
+        )
+        self._update_hydrological_alerts(alerts)
+        self._rivers_info = await self._load_rivers_info()
+
+        for row in stations_data:
+            station_id = row.get(ApiNames.STATION_ID)
+
+            try:
+                data = self._parse_data(self._parse_hydrological_data, row, alerts)
+            except ApiError as exc:
+                _LOGGER.debug("Skipping station %s: %s", station_id, exc)
+                continue
+            finally:
+                if station_id != self.hydrological_station_id:
+                    self._parsed_hydrological_data.pop(station_id, None)
+
+            yield replace(data, fetched_at=fetched_at, stale=stale)
+
+    async def stream_weather_data(self: Self) -> AsyncGenerator[WeatherData]:
+        """Yield weather data of all stations of one synop snapshot."""
+        stations_data, alerts, fetched_at, stale = await self._fetch_snapshot(
+            API_WEATHER_ENDPOINT, API_WEATHER_WARNINGS_ENDPOINT
+        )
+        self._weather_stations_info = await self._load_weather_stations_info()
+
+        for row in stations_data:
+            teryt = self._weather_stations_info.get(row[ApiNames.STATION_ID], {}).get(
+                "teryt"
+            )
+            data = self._parse_data(
+                self._parse_weather_data,
+                row,
+                self._extract_weather_alert(alerts, teryt),
+            )
+
+            yield replace(data, fetched_at=fetched_at, stale=stale)
+
+    async def _fetch_snapshot(
+        self: Self, url: URL, alerts_url: URL
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], datetime, bool]:
+        """Fetch the data of all stations and the alerts.
+
+        Return them with the fetch time and whether they came from the snapshot
+        cache.
+        """
+        fetched_at = datetime.now(tz=UTC)
+        snapshot_fetch_times: list[datetime] = []
+        token = _snapshot_fetch_times.set(snapshot_fetch_times)
+
+        try:
+            stations_data = await self._http_request(url)
+            alerts = await self._http_request(alerts_url, False) or []
+        finally:
+            _snapshot_fetch_times.reset(token)
+
+        return (
+            stations_data,
+            alerts,
+            min(snapshot_fetch_times, default=fetched_at),
+            bool(snapshot_fetch_times),
+        )
+
+    async def update_weather_stations(self: Self) -> None:
+        """Update list of weather stations."""
+        url = API_WEATHER_ENDPOINT
+
+        stations_data = await self._http_request(url)
+
+        shared = self._shared_station_list(
+            DataSource.WEATHER,
+            tuple(
+                (station[ApiNames.STATION_ID], station[ApiNames.STATION])
+                for station in stations_data
+            ),
+        )
+
+        await self._load_weather_stations_info()
+
+        if not shared.stations:
+            if TYPE_CHECKING:
+                assert ImgwPib._proxy_weather_stations_cache is not None
+
+            shared.stations.update(
+                (station[ApiNames.STATION_ID], station[ApiNames.STATION])
+                for station in stations_data
+            )
+            shared.stations.update(
+                {
+                    key: val["name"]
+                    for key, val in ImgwPib._proxy_weather_stations_cache.items()
+                }
+            )
+
+        self._weather_station_list = shared.stations
+        self._search_index = None
+
+    def _shared_station_list(
+        self: Self, source: DataSource, key: tuple[tuple[str | None, ...], ...]
+    ) -> _SharedStationList:
+        """Return the station list shared by the clients of the session.
+
+        Clients get the same list, and index, for the same station payload. An
+        empty list is returned for a changed payload, to be filled by the caller.
+        """
+        station_lists = ImgwPib._shared_station_lists.setdefault(self._session, {})
+        shared = station_lists.get(source)
+
+        if shared is None or shared.key != key:
+            shared = station_lists[source] = _SharedStationList(key, {})
+
+        return shared
+
+    def search_stations(
+        self: Self, query: str, limit: int = 10, fuzzy: bool = True
+    ) -> list[StationMatch]:
+        """Search weather and hydrological stations by name."""
+        if self._search_index is None:
+            if self._metrics is not None:
+                self._metrics.index_rebuilds.inc("search")
+            self._search_index = StationSearchIndex(
+                self._weather_station_list, self._hydrological_station_list
+            )
+
+        return self._search_index.search(query, limit, fuzzy)
+
+    async def nearest_weather_station(
+        self: Self, latitude: float, longitude: float, k: int = 1
+    ) -> list[NearbyStation]:
+        """Return ``k`` weather stations nearest to the given point."""
+        index = await self._weather_stations_index()
+
+        return index.nearest(latitude, longitude, k)
+
+    async def stations_within(
+        self: Self,
+        bbox: tuple[float, float, float, float] | None = None,
+        *,
+        center: tuple[float, float] | None = None,
+        radius: float | None = None,
+    ) -> list[NearbyStation]:
+        """Return weather stations inside a bounding box or a radius.
+
+        ``bbox`` is given as (min latitude, min longitude, max latitude,
+        max longitude), ``radius`` in kilometers around ``center``.
+        """
+        index = await self._weather_stations_index()
+
+        if bbox is not None:
+            return index.within_bbox(*bbox)
+
+        if center is None or radius is None:
+            msg = "Either bbox or center and radius must be set"
+            raise ApiError(msg)
+
+        return index.within_radius(*center, radius)
+
+    async def _weather_stations_index(self: Self) -> StationIndex:
+        """Return the spatial index of weather stations, building it once."""
+        if ImgwPib._weather_stations_index_cache is None:
+            stations_info = await self._load_weather_stations_info()
+
+            if self._metrics is not None:
+                self._metrics.index_rebuilds.inc("spatial")
+            ImgwPib._weather_stations_index_cache = StationIndex(stations_info)
+
+        return ImgwPib._weather_stations_index_cache
+
+    async def _load_weather_stations_info(self: Self) -> dict[str, dict[str, Any]]:
+        """Load bundled weather stations metadata.
+
+        Return the metadata of synop and proxy stations merged once and shared by
+        all clients.
+        """
+        if ImgwPib._weather_stations_info_cache is None:
+            ImgwPib._weather_stations_info_cache = await self._read_json_file(
+                WEATHER_STATIONS_INFO_FILE
+            )
+
+        if ImgwPib._proxy_weather_stations_cache is None:
+            ImgwPib._proxy_weather_stations_cache = await self._read_json_file(
+                PROXY_WEATHER_STATIONS_FILE
+            )
+
+        if ImgwPib._all_weather_stations_info_cache is None:
+            if TYPE_CHECKING:
+                assert ImgwPib._weather_stations_info_cache is not None
+                assert ImgwPib._proxy_weather_stations_cache is not None
+
+            ImgwPib._all_weather_stations_info_cache = (
+                ImgwPib._weather_stations_info_cache
+                | ImgwPib._proxy_weather_stations_cache
+            )
+
+        return ImgwPib._all_weather_stations_info_cache
+
+    @staticmethod
+    async def _read_json_file(path: Path) -> Any:  # noqa: ANN401
+        """Read and decode a bundled JSON file."""
+        async with aiofiles.open(path, mode="rb") as file:
+            content = await file.read()
+
+        return orjson.loads(content)
+
+    async def get_weather_data(self: Self) -> WeatherData:
+        """Get weather data."""
+        return await self._get_data(
+            (DataSource.WEATHER, self.weather_station_id), self._fetch_weather_data
+        )
+
+    async def _fetch_weather_data(self: Self) -> WeatherData:
+        """Fetch weather data."""
+        if self.weather_station_id is None:
+            msg = "Weather station ID is not set"
+            raise ApiError(msg)
+
+        station_info = self._weather_stations_info.get(self.weather_station_id, {})
+        teryt = station_info.get("teryt")
+        lat = station_info.get(ApiNames.LATITUDE)
+        lon = station_info.get(ApiNames.LONGITUDE)
+
+        weather_alerts = []
+        if teryt and (
+            result := await self._http_request(API_WEATHER_WARNINGS_ENDPOINT, False)
+        ):
+            weather_alerts = result
+
+        weather_alert = self._extract_weather_alert(weather_alerts, teryt)
+
+        _LOGGER.debug("Weather alert: %s", weather_alert)
+
+        if lat is not None and lon is not None:
+            proxy_url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=lat, lon=lon)
+            proxy_data = None
+            try:
+                proxy_data = await self._http_request(proxy_url, required=False)
+            except Exception:  # noqa: BLE001
+                _LOGGER.debug(
+                    "Proxy weather endpoint unavailable for station %s",
+                    self.weather_station_id,
+                )
+
+            if isinstance(proxy_data, dict) and "current" in proxy_data:
+                # Stations with a location are listed in the bundled station info
+                self._weather_station_validated = True
+                _LOGGER.debug("Using proxy weather data: %s", proxy_data)
+                return self._parse_data(
+                    self._parse_proxy_weather_data, proxy_data, weather_alert
+                )
+
+        url = API_WEATHER_ENDPOINT / "id" / self.weather_station_id
+
+        try:
+            weather_data = await self._http_request(url)
+        except ApiError:
+            await self._validate_weather_station()
+            raise
+
+        self._weather_station_validated = True
+
+        _LOGGER.debug("Weather data: %s", weather_data)
+
+        return self._parse_data(self._parse_weather_data, weather_data, weather_alert)
+
+    async def get_forecast(
+        self: Self, latitude: float, longitude: float
+    ) -> ForecastData:
+        """Get forecast for a location.
+
+        Coordinates are snapped to the forecast grid, so nearby locations share one
+        upstream request and one cached forecast object.
+        """
+        cell = snap_to_grid(latitude, longitude, self._forecast_grid_resolution)
+        shared = ImgwPib._shared_forecasts.setdefault(self._session, _SharedForecasts())
+
+        cached = shared.forecasts.get(cell)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        if (request := shared.requests.get(cell)) is None:
+            request = asyncio.ensure_future(self._fetch_forecast(cell, shared))
+            shared.requests[cell] = request
+            request.add_done_callback(lambda _: shared.requests.pop(cell, None))
+
+        return await asyncio.shield(request)
+
+    async def _fetch_forecast(
+        self: Self, cell: tuple[float, float], shared: _SharedForecasts
+    ) -> ForecastData:
+        """Fetch forecast for a grid cell and store it in the cache."""
+        latitude, longitude = cell
+        url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=latitude, lon=longitude)
+
+        data = await self._http_request(url)
+
+        if not isinstance(data, dict) or "hourly" not in data or "daily" not in data:
+            msg = f"No forecast data for location: {latitude}, {longitude}"
+            raise ApiError(msg)
+
+        _LOGGER.debug("Forecast data: %s", data)
+
+        forecast = ForecastData(
+            latitude=latitude,
+            longitude=longitude,
+            forecast_hourly=data["hourly"],
+            forecast_twice_daily=data["daily"],
+        )
+
+        now = time.monotonic()
+        shared.forecasts = {
+            key: value for key, value in shared.forecasts.items() if value[0] > now
+        }
+        shared.forecasts[cell] = (
+            now + FORECAST_CACHE_TTL.total_seconds(),
+            forecast,
+        )
+
+        return forecast
+
+    def _extract_weather_alert(
+        self, weather_alerts: list[dict[str, Any]], teryt: str | None
+    ) -> Alert:
+        """Extract weather alert for a given TERYT."""
+        if teryt is None:
+            return Alert(value=NO_ALERT)
+
+        now = datetime.now(tz=UTC)
+
+        for alert in reversed(weather_alerts):
+            territories = alert[ApiNames.TERRITORY]
+
+            if teryt not in territories:
+                continue
+
+            from_date = get_datetime(alert[ApiNames.VALID_FROM], DATE_FORMAT)
+            to_date = get_datetime(alert[ApiNames.VALID_TO], DATE_FORMAT)
+
+            if from_date is None or to_date is None:
+                continue
+
+            if (from_date - DATA_VALIDITY_PERIOD) <= now <= to_date:
+                event = alert[ApiNames.EVENT_NAME].lower()
+                return Alert(
+                    value=WEATHER_ALERTS_MAP.get(event, event),
+                    valid_from=from_date,
+                    valid_to=to_date,
+                    probability=alert[ApiNames.PROBABILITY],
+                    level=ALERT_LEVEL_MAP[alert[ApiNames.ALERT_LEVEL]],
+                )
+
+        return Alert(value=NO_ALERT)
+
+    async def update_hydrological_stations(self: Self) -> None:
+        """Update list of hydrological stations."""
+        fetched_at = datetime.now(tz=UTC)
+        snapshot_fetch_times: list[datetime] = []
+        token = _snapshot_fetch_times.set(snapshot_fetch_times)
+
+        try:
+            stations_data = await self._http_request(API_HYDROLOGICAL_ENDPOINT)
+        finally:
+            _snapshot_fetch_times.reset(token)
+
+        # A payload served from the snapshot cache is not reused, so data calls
+        # try upstream again and flag their data as stale if it is still down.
+        # Only the rows of the client's station are kept.
+        if not snapshot_fetch_times and self.hydrological_station_id is not None:
+            self._hydrological_payload = (
+                fetched_at,
+                [
+                    station
+                    for station in stations_data
+                    if station[ApiNames.STATION_ID] == self.hydrological_station_id
+                ],
+            )
+
+        shared = self._shared_station_list(
+            DataSource.HYDROLOGICAL,
+            tuple(
+                (
+                    station[ApiNames.STATION_ID],
+                    station[ApiNames.STATION],
+                    station[ApiNames.RIVER],
+                    station.get(ApiNames.PROVINCE),
+                )
+                for station in stations_data
+            ),
+        )
+
+        rivers_info = await self._load_rivers_info()
+
+        if shared.index is None:
+            shared.stations.update(
+                {
+                    station[ApiNames.STATION_ID]: gen_station_name(
+                        station[ApiNames.STATION], station[ApiNames.RIVER]
+                    )
+                    for station in stations_data
+                }
+            )
+            if self._metrics is not None:
+                self._metrics.index_rebuilds.inc("hydrological")
+            shared.index = HydrologicalIndex(stations_data, rivers_info)
+
+        self._hydrological_station_list = shared.stations
+        self._hydrological_index = shared.index
+        self._search_index = None
+
+    def hydrological_stations_on_river(self: Self, river: str) -> tuple[str, ...]:
+        """Return IDs of hydrological stations on the given river."""
+        if self._hydrological_index is None:
+            return ()
+
+        return self._hydrological_index.stations_on_river(river)
+
+    def hydrological_stations_in_province(self: Self, province: str) -> tuple[str, ...]:
+        """Return IDs of hydrological stations in the given province."""
+        if self._hydrological_index is None:
+            return ()
+
+        return self._hydrological_index.stations_in_province(province)
+
+    async def _load_rivers_info(self: Self) -> dict[str, dict[str, str]]:
+        """Load bundled rivers metadata."""
+        if ImgwPib._rivers_info_cache is None:
+            ImgwPib._rivers_info_cache = await self._read_json_file(RIVERS_INFO_FILE)
+
+        if TYPE_CHECKING:
+            assert ImgwPib._rivers_info_cache is not None
+
+        return ImgwPib._rivers_info_cache
+
+    async def _update_hydrological_details(
+        self: Self, station_id: str | None = None
+    ) -> None:
+        """Update hydrological details."""
+        station_id = station_id or self.hydrological_station_id
+
+        if TYPE_CHECKING:
+            assert station_id
+
+        url = API_HYDROLOGICAL_DETAILS_ENDPOINT.with_query(id=station_id)
+
+        try:
+            hydrological_details = await self._http_request(url)
+        except ApiError as exc:
+            _LOGGER.info("Hydrological details not available: %s", repr(exc))
+            return
+
+        if hydrological_details is None:
+            _LOGGER.info("Invalid hydrological details format")
+            return
+
+        self._flood_levels[station_id] = (
+            hydrological_details["status"]["warningValue"],
+            hydrological_details["status"]["alarmValue"],
+        )
+
+    async def get_hydrological_data(self: Self) -> HydrologicalData:
+        """Get hydrological data."""
+        return await self._get_data(
+            (DataSource.HYDROLOGICAL, self.hydrological_station_id),
+            self._fetch_hydrological_data,
+        )
+
+    async def _fetch_hydrological_data(self: Self) -> HydrologicalData:
+        """Fetch hydrological data."""
+        if self.hydrological_station_id is None:
+            msg = "Hydrological station ID is not set"
+            raise ApiError(msg)
+
+        all_stations_data = self._reusable_hydrological_payload()
+        if all_stations_data is None:
+            all_stations_data = await self._http_request(API_HYDROLOGICAL_ENDPOINT)
+
+        hydrological_data = next(
+            (
+                item
+                for item in all_stations_data
+                if item.get(ApiNames.STATION_ID) == self.hydrological_station_id
+            ),
+            None,
+        )
+
+        if hydrological_data is None:
+            if not self._hydrological_station_validated:
+                msg = f"Invalid hydrological station ID: {self.hydrological_station_id}"
+                raise ApiError(msg)
+
+            msg = f"No hydrological data for station ID: {self.hydrological_station_id}"
+            raise ApiError(msg)
+
+        if not self._hydrological_station_validated:
+            self._hydrological_station_validated = True
+
+            if self._hydrological_details:
+                await self._update_hydrological_details()
+
+        _LOGGER.debug("Hydrological data: %s", hydrological_data)
+
+        hydrological_alerts = []
+
+        if result := await self._http_request(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, False
+        ):
+            hydrological_alerts = result
+        self._update_hydrological_alerts(hydrological_alerts)
+
+        return self._parse_data(
+            self._parse_hydrological_data, hydrological_data, hydrological_alerts
+        )
+
+    def _reusable_hydrological_payload(self: Self) -> list[dict[str, Any]] | None:
+        """Return the /hydro payload of the station list if it is recent enough."""
+        if self._hydrological_payload is None:
+            return None
+
+        fetched_at, stations_data = self._hydrological_payload
+
+        if datetime.now(tz=UTC) - fetched_at > HYDROLOGICAL_PAYLOAD_REUSE_PERIOD:
+            self._hydrological_payload = None
+            return None
+
+        _LOGGER.debug("Reusing hydrological data fetched at %s", fetched_at)
+        if (reused_fetch_times := _reused_fetch_times.get()) is not None:
+            reused_fetch_times.append(fetched_at)
+
+        return stations_data
+
+    async def subscribe(
+        self: Self,
+        station_ids: Iterable[str],
+        interval: timedelta | None = None,
+        scheduler: PollingScheduler | None = None,
+        cadence: CadencePolicy | None = None,
+    ) -> AsyncGenerator[HydrologicalData]:
+        """Yield hydrological data of stations whose measurements or alerts changed.
+
+        The ``/hydro`` snapshot is refreshed in a loop, every ``interval``, when the
+        ``cadence`` policy finds any of the stations due or, by default, when the
+        scheduler expects new data. With a ``cadence`` policy only the stations due
+        are refreshed from each snapshot. Raw rows are fingerprinted, so stations
+        whose row and alerts did not change since they were last processed are not
+        parsed again.
+        """
+        wanted = set(station_ids)
+        scheduler = scheduler or PollingScheduler()
+        subscription = _Subscription()
+
+        self._rivers_info = await self._load_rivers_info()
+
+        if self._hydrological_details:
+            await asyncio.gather(
+                *(
+                    self._update_hydrological_details(station_id)
+                    for station_id in wanted - self._flood_levels.keys()
+                )
+            )
+
+        while True:
+            try:
+                stations_data, alerts, fetched_at, stale = await self._fetch_snapshot(
+                    API_HYDROLOGICAL_ENDPOINT, API_HYDROLOGICAL_WARNINGS_ENDPOINT
+                )
+            except (ApiError, ClientError, TimeoutError) as exc:
+                # A failed refresh counts as a miss, the retry delay backs off
+                _LOGGER.warning("Refreshing hydrological data failed: %r", exc)
+                scheduler.record(DataSource.HYDROLOGICAL, None)
+                await scheduler.wait(DataSource.HYDROLOGICAL)
+                continue
+
+            subscription.update_alerts(alerts)
+            self._update_hydrological_alerts(alerts)
+            newest_measurement: str = ""
+            refreshed: list[HydrologicalData] = []
+            due = wanted
+            if cadence is not None:
+                cadence.record_fetch()
+                due = set(cadence.due(wanted))
+
+            for row in stations_data:
+                station_id = row.get(ApiNames.STATION_ID)
+                if station_id not in due:
+                    continue
+
+                newest_measurement = max(
+                    newest_measurement,
+                    row.get(ApiNames.WATER_LEVEL_MEASUREMENT_DATE) or "",
+                )
+
+                if not subscription.changed(station_id, row):
+                    if (previous := subscription.results.get(station_id)) is not None:
+                        refreshed.append(previous)
+                    continue
+
+                try:
+                    data = self._parse_data(self._parse_hydrological_data, row, alerts)
+                except ApiError as exc:
+                    _LOGGER.debug("Skipping station %s: %s", station_id, exc)
+                    continue
+                data = replace(data, fetched_at=fetched_at, stale=stale)
+                refreshed.append(data)
+
+                # Compared with the last data yielded, alerts included
+                if subscription.results.get(station_id) != data:
+                    subscription.results[station_id] = data
+                    yield data
+
+            scheduler.record(
+                DataSource.HYDROLOGICAL,
+                get_datetime(newest_measurement or None, DATE_FORMAT),
+            )
+
+            await self._wait_for_snapshot(
+                wanted, due, refreshed, interval, scheduler, cadence
+            )
+
+    @staticmethod
+    async def _wait_for_snapshot(  # noqa: PLR0913
+        station_ids: set[str],
+        due: set[str],
+        refreshed: list[HydrologicalData],
+        interval: timedelta | None,
+        scheduler: PollingScheduler,
+        cadence: CadencePolicy | None,
+    ) -> None:
+        """Sleep until the next ``/hydro`` snapshot of a subscription is due."""
+        if interval is not None:
+            await asyncio.sleep(interval.total_seconds())
+        elif cadence is not None:
+            for data in refreshed:
+                cadence.observe(data)
+            # Due stations without current data are retried at the quiet rate
+            for station_id in due - {data.station_id for data in refreshed}:
+                cadence.record_attempt(station_id)
+            await asyncio.sleep(cadence.delay(station_ids))
+        else:
+            await scheduler.wait(DataSource.HYDROLOGICAL)
+
+    async def _get_data(
+        self: Self,
+        key: tuple[DataSource, str | None],
+        fetch: Callable[[], Awaitable[_DataT]],
+    ) -> _DataT:
+        """Return fetched data or, in stale-while-revalidate mode, the last result."""
+        if self._max_stale_age is None:
+            return await self._refresh(key, fetch)
+
+        last = self._last_results.get(key)
+        age = last.age if last is not None else None
+        if age is not None and age < REVALIDATE_AFTER.get(key[0], timedelta()):
+            return cast("_DataT", last)
+
+        if (task := self._refresh_tasks.get(key)) is None:
+            task = asyncio.create_task(self._refresh(key, fetch))
+            task.add_done_callback(self._refresh_done)
+            self._refresh_tasks[key] = task
+
+        if age is None or age > self._max_stale_age:
+            return await asyncio.shield(task)
+
+        _LOGGER.debug("Returning %s data fetched %s ago", key[0], age)
+
+        return cast("_DataT", last)
+
+    async def _refresh(
+        self: Self,
+        key: tuple[DataSource, str | None],
+        fetch: Callable[[], Awaitable[_DataT]],
+    ) -> _DataT:
+        """Fetch data and keep it as the last result."""
+        fetched_at = datetime.now(tz=UTC)
+        snapshot_fetch_times: list[datetime] = []
+        reused_fetch_times: list[datetime] = []
+        token = _snapshot_fetch_times.set(snapshot_fetch_times)
+        reused_token = _reused_fetch_times.set(reused_fetch_times)
+
+        try:
+            data = await fetch()
+        finally:
+            _snapshot_fetch_times.reset(token)
+            _reused_fetch_times.reset(reused_token)
+            self._refresh_tasks.pop(key, None)
+
+        # Parsed data is cached and shared, the fetch details go on a copy. The
+        # data is as old as the oldest payload it was parsed from.
+        data = replace(
+            data,
+            fetched_at=min(
+                (*snapshot_fetch_times, *reused_fetch_times), default=fetched_at
+            ),
+            stale=bool(snapshot_fetch_times),
+        )
+        self._last_results[key] = data
+
+        if self._metrics is not None:
+            self._metrics.observe_data(data, fetched_at)
+
+        return data
+
+    def _parse_data(
+        self: Self,
+        parse: Callable[[dict[str, Any], Any], _DataT],
+        data: dict[str, Any],
+        alerts: Any,  # noqa: ANN401
+    ) -> _DataT:
+        """Parse data, recording the parse time and the weather measurement lag."""
+        if self._metrics is None:
+            result = parse(data, alerts)
+        else:
+            start = time.perf_counter()
+            result = parse(data, alerts)
+            self._metrics.parse_duration.observe(
+                time.perf_counter() - start,
+                "weather" if isinstance(result, WeatherData) else "hydrological",
+            )
+
+        if (
+            self._freshness is not None
+            and isinstance(result, WeatherData)
+            and result.measurement_date is not None
+        ):
+            self._freshness.record(
+                result.station_id,
+                "weather",
+                result.measurement_date,
+                datetime.now(tz=UTC),
+            )
+
+        return result
+
+    @staticmethod
+    def _refresh_done(task: asyncio.Task[Any]) -> None:
+        """Log a failed background refresh."""
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            _LOGGER.debug("Background refresh failed: %s", exc)
+
+    def add_request_hook(self: Self, hook: RequestHook) -> Callable[[], None]:
+        """Call the hook with the details of every API request.
+
+        Return a function removing the hook.
+        """
+        self._request_hooks.append(hook)
+
+        return lambda: self._request_hooks.remove(hook)
+
+    async def _http_request(
+        self: Self,
+        url: URL,
+        required: bool = True,
+    ) -> Any:  # noqa: ANN401
+        """Make an HTTP request."""
+        if not self._request_hooks:
+            return await self._request(url, required)
+
+        trace = RequestTrace(time.perf_counter())
+        error = None
+
+        try:
+            return await self._request(url, required, trace)
+        except BaseException as exc:
+            error = repr(exc)
+            raise
+        finally:
+            info = trace.request_info(self._data_source(url), str(url), error)
+            for hook in self._request_hooks:
+                try:
+                    hook(info)
+                except Exception:
+                    _LOGGER.exception("Request hook failed")
+
+    @staticmethod
+    def _data_source(url: URL) -> DataSource | None:
+        """Return the data source of an API URL."""
+        if url.host == API_WEATHER_PROXY_ENDPOINT.host:
+            return DataSource.WEATHER_PROXY
+
+        if url.host == API_HYDROLOGICAL_DETAILS_ENDPOINT.host:
+            return DataSource.HYDROLOGICAL_DETAILS
+
+        endpoint = url.path.removeprefix(API_BASE_ENDPOINT.path).split("/")[1:2]
+
+        return _ENDPOINT_SOURCES.get(endpoint[0]) if endpoint else None
+
+    async def _send(
+        self: Self, url: URL, trace: RequestTrace | None
+    ) -> ClientResponse | RecordedResponse:
+        """Send a GET request, directly or through the transport."""
+        if self._transport is None or not self._transport.offline:
+            await self._rate_limiter.acquire(url.host)
+
+        _LOGGER.debug("Requesting %s", url)
+
+        if trace is not None:
+            trace.start = time.perf_counter()
+
+        if self._transport is not None:
+            return await self._transport.request(self._session, url, trace)
+
+        return await self._session.request(
+            "get", url, headers=HEADERS, timeout=TIMEOUT, trace_request_ctx=trace
+        )
+
+    async def _request(
+        self: Self,
+        url: URL,
+        required: bool,
+        trace: RequestTrace | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Make an HTTP request, recording its progress in the trace.
+
+        With a snapshot cache, the last good response is served when the request
+        fails, the server responds with an error or the body cannot be read.
+        """
+        try:
+            response = await self._send(url, trace)
+        except (ClientError, TimeoutError):
+            if (snapshot_payload := await self._load_snapshot(url, trace)) is None:
+                raise
+            return snapshot_payload
+
+        _LOGGER.debug("Response status: %s", response.status)
+
+        if trace is not None:
+            trace.response_start = time.perf_counter()
+            trace.status = response.status
+
+        if response.status != HTTPStatus.OK.value:
+            if (
+                response.status >= HTTPStatus.INTERNAL_SERVER_ERROR.value
+                and (snapshot_payload := await self._load_snapshot(url, trace))
+                is not None
+            ):
+                return snapshot_payload
+
+            msg = f"Invalid response: {response.status}"
+            if required:
+                raise ApiError(msg)
+
+            return None
+
+        if "application/json" not in response.content_type:
+            msg = f"Invalid content type: {response.content_type}"
+            raise ApiError(msg)
+
+        try:
+            payload = await self._read_payload(response, trace)
+        except (ClientError, TimeoutError):
+            if (snapshot_payload := await self._load_snapshot(url, trace)) is None:
+                raise
+            return snapshot_payload
+
+        if self._snapshot_cache is not None:
+            self._snapshot_cache.store(url, payload)
+
+        return payload
+
+    @staticmethod
+    async def _read_payload(
+        response: ClientResponse | RecordedResponse, trace: RequestTrace | None
+    ) -> Any:  # noqa: ANN401
+        """Read and decode the JSON body of a response."""
+        if trace is None:
+            return await response.json()
+
+        body = await response.read()
+        trace.body_end = time.perf_counter()
+        trace.size = len(body)
+        payload = orjson.loads(body)
+        trace.decode = time.perf_counter() - trace.body_end
+
+        return payload
+
+    async def _load_snapshot(self: Self, url: URL, trace: RequestTrace | None) -> Any:  # noqa: ANN401
+        """Return the last good response of a URL, None if there is none."""
+        if (
+            self._snapshot_cache is None
+            or (snapshot := await self._snapshot_cache.load(url)) is None
+        ):
+            return None
+
+        fetched_at, payload = snapshot
+        _LOGGER.debug("%s is unavailable, using data from %s", url, fetched_at)
+        if (snapshot_fetch_times := _snapshot_fetch_times.get()) is not None:
+            snapshot_fetch_times.append(fetched_at)
+        if trace is not None:
+            trace.cache_status = CacheStatus.SNAPSHOT
+
+        return payload
+
+    def _parse_weather_data(self, data: dict[str, Any], alert: Alert) -> WeatherData:
+        """Parse weather data."""
+        temperature_sensor = create_sensor_data(
+            "Temperature", data[ApiNames.TEMPERATURE], Units.CELSIUS.value
+        )
+        humidity_sensor = create_sensor_data(
+            "Humidity", data[ApiNames.HUMIDITY], Units.PERCENT.value
+        )
+        wind_speed_sensor = create_sensor_data(
+            "Wind Speed", data[ApiNames.WIND_SPEED], Units.METERS_PER_SECOND.value
+        )
+        wind_direction_sensor = create_sensor_data(
+            "Wind Direction", data[ApiNames.WIND_DIRECTION], Units.DEGREE.value
+        )
+        precipitation_sensor = create_sensor_data(
+            "Precipitation",
+            data[ApiNames.PRECIPITATION],
+            Units.MILLIMETERS_PER_HOUR.value,
+        )
+        pressure_sensor = create_sensor_data(
+            "Pressure", data[ApiNames.PRESSURE], Units.HPA.value
+        )
+        apparent_temperature_sensor = create_sensor_data(
+            "Apparent Temperature", None, Units.CELSIUS.value
+        )
+        wind_gust_sensor = create_sensor_data(
+            "Wind Gust", None, Units.METERS_PER_SECOND.value
+        )
+        cloud_coverage_sensor = create_sensor_data(
+            "Cloud Coverage", None, Units.PERCENT.value
+        )
+        rain_sensor = create_sensor_data("Rain", None, Units.MILLIMETERS_PER_HOUR.value)
+        snow_sensor = create_sensor_data("Snow", None, Units.CENTIMETERS_PER_HOUR.value)
+        measurement_date = get_datetime(
+            f"{data[ApiNames.MEASUREMENT_DATE]} {data[ApiNames.MEASUREMENT_TIME]}",
+            "%Y-%m-%d %H",
+        )
+
+        station_id = data[ApiNames.STATION_ID]
+        station = self._weather_stations_info.get(station_id, {})
+
+        return WeatherData(
+            temperature=temperature_sensor,
+            humidity=humidity_sensor,
+            pressure=pressure_sensor,
+            wind_speed=wind_speed_sensor,
+            wind_direction=wind_direction_sensor,
+            precipitation=precipitation_sensor,
+            apparent_temperature=apparent_temperature_sensor,
+            wind_gust=wind_gust_sensor,
+            cloud_coverage=cloud_coverage_sensor,
+            rain=rain_sensor,
+            snow=snow_sensor,
+            station=data[ApiNames.STATION],
+            latitude=station.get(ApiNames.LATITUDE),
+            longitude=station.get(ApiNames.LONGITUDE),
+            station_id=station_id,
+            measurement_date=measurement_date,
+            weather_alert=alert,
+        )
+
+    def _parse_proxy_weather_data(
+        self, data: dict[str, Any], alert: Alert
+    ) -> WeatherData:
+        """Parse weather data from the proxy endpoint."""
+        current = data["current"]
+
+        temperature_sensor = create_sensor_data(
+            "Temperature", current.get("temp"), Units.CELSIUS.value
+        )
+        humidity_sensor = create_sensor_data(
+            "Humidity", current.get("humidity"), Units.PERCENT.value
+        )
+        wind_speed_sensor = create_sensor_data(
+            "Wind Speed", current.get("wind_speed"), Units.METERS_PER_SECOND.value
+        )
+        wind_direction_sensor = create_sensor_data(
+            "Wind Direction", current.get("wind_dir"), Units.DEGREE.value
+        )
+        precipitation_sensor = create_sensor_data(
+            "Precipitation", current.get("precip"), Units.MILLIMETERS_PER_HOUR.value
+        )
+        pressure_sensor = create_sensor_data(
+            "Pressure", current.get("pressure"), Units.HPA.value
+        )
+        apparent_temperature_sensor = create_sensor_data(
+            "Apparent Temperature", current.get("feels_like"), Units.CELSIUS.value
+        )
+        wind_gust_sensor = create_sensor_data(
+            "Wind Gust", current.get("wind_gust"), Units.METERS_PER_SECOND.value
+        )
+        cloud_coverage_sensor = create_sensor_data(
+            "Cloud Coverage", current.get("cloud"), Units.PERCENT.value
+        )
+        rain_sensor = create_sensor_data(
+            "Rain", current.get("rain"), Units.MILLIMETERS_PER_HOUR.value
+        )
+        snow_sensor = create_sensor_data(
+            "Snow", current.get("snow"), Units.CENTIMETERS_PER_HOUR.value
+        )
+
+        measurement_date: datetime | None = None
+        date_str = current.get("date")
+        if date_str:
+            try:
+                measurement_date = datetime.fromisoformat(date_str)
+            except (ValueError, TypeError):
+                _LOGGER.debug("Invalid proxy date string '%s'", date_str)
+
+        icon = current.get("icon")
+        if icon is not None:
+            self._last_icon = icon
+        else:
+            icon = self._last_icon
+        condition = parse_weather_icon(icon) if icon is not None else None
+
+        if TYPE_CHECKING:
+            assert self.weather_station_id
+
+        station_info = self._weather_stations_info.get(self.weather_station_id, {})
+
+        return WeatherData(
+            temperature=temperature_sensor,
+            humidity=humidity_sensor,
+            pressure=pressure_sensor,
+            wind_speed=wind_speed_sensor,
+            wind_direction=wind_direction_sensor,
+            precipitation=precipitation_sensor,
+            apparent_temperature=apparent_temperature_sensor,
+            wind_gust=wind_gust_sensor,
+            cloud_coverage=cloud_coverage_sensor,
+            rain=rain_sensor,
+            snow=snow_sensor,
+            # With lazy validation the station list is not downloaded
+            station=self._weather_station_list.get(self.weather_station_id)
+            or station_info.get("name", ""),
+            latitude=station_info.get(ApiNames.LATITUDE),
+            longitude=station_info.get(ApiNames.LONGITUDE),
+            station_id=self.weather_station_id,
+            proxy_used=True,
+            condition=condition,
+            measurement_date=measurement_date,
+            weather_alert=alert,
+            forecast_hourly=data["hourly"],
+            forecast_twice_daily=data["daily"],
+        )
+
+    def _parse_hydrological_data(
+        self: Self, data: dict[str, Any], alerts: list[dict[str, Any]]
+    ) -> HydrologicalData:
+        """Parse hydrological data.
+
+        The parsed object is cached per station together with a fingerprint of the
+        raw row and the time its measurements stop being current. An identical row
+        returns the cached object, only the alert is evaluated again.
+        """
+        now = datetime.now(tz=UTC)
+        station_id = data[ApiNames.STATION_ID]
+        warning_water_level, alarm_water_level = flood_levels = self._flood_levels.get(
+            station_id, (None, None)
+        )
+        fingerprint = hash((row_fingerprint(data), flood_levels))
+
+        cached = self._parsed_hydrological_data.get(station_id)
+        if cached is not None and cached[0] == fingerprint and now < cached[1]:
+            hydrological_alert = self._get_hydrological_alert(data, alerts)
+            if hydrological_alert == cached[2].hydrological_alert:
+                return cached[2]
+            return replace(cached[2], hydrological_alert=hydrological_alert)
+
+        if self._freshness is not None:
+            for sensor, date_key in _HYDROLOGICAL_MEASUREMENT_DATES.items():
+                if measured_at := get_datetime(data[date_key], DATE_FORMAT):
+                    self._freshness.record(station_id, sensor, measured_at, now)
+
+        water_level_measurement_date = measurement_date_if_current(
+            data[ApiNames.WATER_LEVEL_MEASUREMENT_DATE], now
+        )
+        water_level = (
+            data[ApiNames.WATER_LEVEL] if water_level_measurement_date else None
+        )
+
+        if water_level is None:
+            msg = "Invalid water level value"
+            raise ApiError(msg)
+
+        water_level_sensor = create_sensor_data(
+            "Water Level", water_level, Units.CENTIMETERS.value
+        )
+        flood_warning_level_sensor = create_sensor_data(
+            "Flood Warning Level", warning_water_level, Units.CENTIMETERS.value
+        )
+        flood_alarm_level_sensor = create_sensor_data(
+            "Flood Alarm Level", alarm_water_level, Units.CENTIMETERS.value
+        )
+
+        water_temperature_measurement_date = measurement_date_if_current(
+            data[ApiNames.WATER_TEMPERATURE_MEASUREMENT_DATE], now
+        )
+        water_temperature = (
+            data[ApiNames.WATER_TEMPERATURE]
+            if water_temperature_measurement_date
+            else None
+        )
+        water_temperature_sensor = create_sensor_data(
+            "Water Temperature", water_temperature, Units.CELSIUS.value
+        )
+
+        water_flow_measurement_date = measurement_date_if_current(
+            data[ApiNames.WATER_FLOW_MEASUREMENT_DATE], now
+        )
+        water_flow = data[ApiNames.WATER_FLOW] if water_flow_measurement_date else None
+        water_flow_sensor = create_sensor_data(
+            "Water Flow", water_flow, Units.CUBIC_METERS_PER_SECOND.value
+        )
+
+        ice_phenomena_measurement_date = measurement_date_if_current(
+            data[ApiNames.ICE_PHENOMENA_MEASUREMENT_DATE],
+            now,
+            ICE_PHENOMENA_DATA_VALIDITY_PERIOD,
+        )
+        ice_phenomena = (
+            int(data[ApiNames.ICE_PHENOMENA]) * 10
+            if ice_phenomena_measurement_date
+            else None
+        )
+        ice_phenomena_sensor = create_sensor_data(
+            "Ice Phenomena", ice_phenomena, Units.PERCENT.value
+        )
+
+        vegetation_phenomena_measurement_date = measurement_date_if_current(
+            data[ApiNames.VEGETATION_PHENOMENA_MEASUREMENT_DATE],
+            now,
+            VEGETATION_PHENOMENA_DATA_VALIDITY_PERIOD,
+        )
+        vegetation_phenomena_raw = (
+            data[ApiNames.VEGETATION_PHENOMENA]
+            if vegetation_phenomena_measurement_date
+            else None
+        )
+        submerged, floating, emergent = decode_vegetation_phenomena(
+            vegetation_phenomena_raw
+        )
+
+        submerged_vegetation_cover_sensor = create_sensor_data(
+            "Submerged Vegetation Cover", submerged, Units.PERCENT.value
+        )
+        floating_vegetation_cover_sensor = create_sensor_data(
+            "Floating Vegetation Cover", floating, Units.PERCENT.value
+        )
+        emergent_vegetation_cover_sensor = create_sensor_data(
+            "Emergent Vegetation Cover", emergent, Units.PERCENT.value
+        )
+
+        hydrological_alert = self._get_hydrological_alert(data, alerts)
+
+        lat = data[ApiNames.LATITUDE]
+        lon = data[ApiNames.LONGITUDE]
+
+        result = HydrologicalData(
+            flood_alarm_level=flood_alarm_level_sensor,
+            flood_warning_level=flood_warning_level_sensor,
+            latitude=float(lat) if lat is not None else None,
+            longitude=float(lon) if lon is not None else None,
+            river=data[ApiNames.RIVER],
+            station_id=station_id,
+            station=data[ApiNames.STATION].strip(),
+            water_flow=water_flow_sensor,
+            water_flow_measurement_date=water_flow_measurement_date,
+            water_level_measurement_date=water_level_measurement_date,
+            water_level=water_level_sensor,
+            water_temperature_measurement_date=water_temperature_measurement_date,
+            water_temperature=water_temperature_sensor,
+            hydrological_alert=hydrological_alert,
+            ice_phenomena=ice_phenomena_sensor,
+            ice_phenomena_measurement_date=ice_phenomena_measurement_date,
+            submerged_vegetation_cover=submerged_vegetation_cover_sensor,
+            floating_vegetation_cover=floating_vegetation_cover_sensor,
+            emergent_vegetation_cover=emergent_vegetation_cover_sensor,
+            vegetation_phenomena_measurement_date=vegetation_phenomena_measurement_date,
+        )
+
+        # The cached object is valid until the first current measurement expires
+        valid_until = min(
+            measurement_date + validity_period
+            for measurement_date, validity_period in (
+                (water_level_measurement_date, DATA_VALIDITY_PERIOD),
+                (water_temperature_measurement_date, DATA_VALIDITY_PERIOD),
+                (water_flow_measurement_date, DATA_VALIDITY_PERIOD),
+                (ice_phenomena_measurement_date, ICE_PHENOMENA_DATA_VALIDITY_PERIOD),
+                (
+                    vegetation_phenomena_measurement_date,
+                    VEGETATION_PHENOMENA_DATA_VALIDITY_PERIOD,
+                ),
+            )
+            if measurement_date is not None
+        )
+        self._parsed_hydrological_data[station_id] = (fingerprint, valid_until, result)
+
+        return result
+
+    def _update_hydrological_alerts(self: Self, alerts: list[dict[str, Any]]) -> None:
+        """Drop the alerts evaluated per river when fetched alerts changed.
+
+        Only a fingerprint of the payload is kept, not the payload itself.
+        """
+        fingerprint = hash(orjson.dumps(alerts))
+
+        if fingerprint != self._hydrological_alerts_fingerprint:
+            self._hydrological_alerts_fingerprint = fingerprint
+            self._hydrological_alerts.clear()
+            if self._metrics is not None:
+                self._metrics.index_rebuilds.inc("hydrological_alerts")
+
+    def _get_hydrological_alert(
+        self: Self, data: dict[str, Any], alerts: list[dict[str, Any]]
+    ) -> Alert:
+        """Get hydrological alert for a station row."""
+        province = data[ApiNames.PROVINCE]
+        if province is None:
+            river_info = self._rivers_info.get(data[ApiNames.STATION_ID], {})
+            province = river_info.get("province")
+
+        # Alerts are evaluated once per river and province, until a fetch brings
+        # changed alerts or the clock reaches a boundary of a matching alert
+        now = datetime.now(tz=UTC)
+        key = (data[ApiNames.RIVER], province)
+        cached = self._hydrological_alerts.get(key)
+
+        if cached is None or (cached[1] is not None and now >= cached[1]):
+            cached = self._hydrological_alerts[key] = self._evaluate_hydrological_alert(
+                alerts, *key, now
+            )
+
+        _LOGGER.debug("Hydrological alert: %s", cached[0])
+
+        return cached[0]
+
+    def _extract_hydrological_alert(
+        self,
+        hydrological_alerts: list[dict[str, Any]],
+        river: str,
+        province: str | None,
+    ) -> Alert:
+        """Extract hydrological alert for a given river."""
+        return self._evaluate_hydrological_alert(
+            hydrological_alerts, river, province, datetime.now(tz=UTC)
+        )[0]
+
+    def _evaluate_hydrological_alert(
+        self,
+        hydrological_alerts: list[dict[str, Any]],
+        river: str,
+        province: str | None,
+        now: datetime,
+    ) -> tuple[Alert, datetime | None]:
+        """Return the hydrological alert for a river and when it may change.
+
+        The alert may change when a matching alert checked before the active one
+        starts or when the active one ends, None if it never changes.
+        """
+        if province is None:
+            return Alert(value=NO_ALERT), None
+
+        expires: datetime | None = None
+        last_word = river.rsplit(" ", maxsplit=1)[-1]
+        river_key = (last_word[:-1] if len(last_word) > 4 else last_word).lower()  # noqa: PLR2004
+        river_pattern = re.compile(r"\b" + re.escape(river_key) + r"\w*")
+        province_key = province.lower()
+
+        for alert in reversed(hydrological_alerts):
+            areas = alert[ApiNames.AREAS]
+            province_match = False
+            river_match = False
+
+            for area in areas:
+                if (
+                    not province_match
+                    and area[ApiNames.PROVINCE].lower() == province_key
+                ):
+                    province_match = True
+                if not river_match and river_pattern.search(
+                    area[ApiNames.DESCRIPTION].lower()
+                ):
+                    river_match = True
+                # Early exit if both conditions are met
+                if province_match and river_match:
+                    break
+
+            if not (province_match and river_match):
+                continue
+
+            from_date = get_datetime(alert[ApiNames.DATE_FROM], DATE_FORMAT)
+            to_date = get_datetime(alert[ApiNames.DATE_TO], DATE_FORMAT)
+
+            if from_date is None or to_date is None:
+                continue
+
+            if from_date <= now <= to_date:
+                event = alert[ApiNames.EVENT].lower()
+                return Alert(
+                    value=HYDROLOGICAL_ALERTS_MAP.get(event, event),
+                    valid_from=from_date,
+                    valid_to=to_date,
+                    probability=alert[ApiNames.PROBABILITY],
+                    level=ALERT_LEVEL_MAP[alert[ApiNames.ALERT_LEVEL_HYDROLOGICAL]],
+                ), min(to_date, expires or to_date)
+
+            if from_date > now:
+                expires = min(from_date, expires or from_date)
+
+        return Alert(value=NO_ALERT), expires
@@ -2,27 +2,54 @@
 
 from datetime import timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from aiohttp import ClientTimeout
-from yarl import URL
+if TYPE_CHECKING:
+    from aiohttp import ClientTimeout
+    from yarl import URL
+
+    API_BASE_ENDPOINT: URL
+    API_HYDROLOGICAL_ENDPOINT: URL
+    API_HYDROLOGICAL_WARNINGS_ENDPOINT: URL
+    API_WEATHER_ENDPOINT: URL
+    API_WEATHER_WARNINGS_ENDPOINT: URL
+    API_WEATHER_PROXY_ENDPOINT: URL
+    API_HYDROLOGICAL_DETAILS_ENDPOINT: URL
+    TIMEOUT: ClientTimeout
 
 BASE_DIR = Path(__file__).resolve().parent
 RIVERS_INFO_FILE = BASE_DIR / "data" / "rivers.json"
 WEATHER_STATIONS_INFO_FILE = BASE_DIR / "data" / "weather_stations_info.json"
 PROXY_WEATHER_STATIONS_FILE = BASE_DIR / "data" / "proxy_weather_stations.json"
 
-API_BASE_ENDPOINT = URL("https://danepubliczne.imgw.pl/api/data")
-API_HYDROLOGICAL_ENDPOINT = API_BASE_ENDPOINT / "hydro"
-API_HYDROLOGICAL_WARNINGS_ENDPOINT = API_BASE_ENDPOINT / "warningshydro"
-API_WEATHER_ENDPOINT = API_BASE_ENDPOINT / "synop"
-API_WEATHER_WARNINGS_ENDPOINT = API_BASE_ENDPOINT / "warningsmeteo"
-API_WEATHER_PROXY_ENDPOINT = URL("https://imgw-api-proxy.evtlab.pl/forecast")
-API_HYDROLOGICAL_DETAILS_ENDPOINT = URL(
-    "https://hydro-back.imgw.pl/station/hydro/status"
-)
+# Endpoint URLs and the request timeout are built on first access, see
+# __getattr__ below, so importing constants does not import aiohttp and yarl
+_API_BASE_URL = "https://danepubliczne.imgw.pl/api/data"
+_API_URLS = {
+    "API_BASE_ENDPOINT": _API_BASE_URL,
+    "API_HYDROLOGICAL_ENDPOINT": f"{_API_BASE_URL}/hydro",
+    "API_HYDROLOGICAL_WARNINGS_ENDPOINT": f"{_API_BASE_URL}/warningshydro",
+    "API_WEATHER_ENDPOINT": f"{_API_BASE_URL}/synop",
+    "API_WEATHER_WARNINGS_ENDPOINT": f"{_API_BASE_URL}/warningsmeteo",
+    "API_WEATHER_PROXY_ENDPOINT": "https://imgw-api-proxy.evtlab.pl/forecast",
+    "API_HYDROLOGICAL_DETAILS_ENDPOINT": (
+        "https://hydro-back.imgw.pl/station/hydro/status"
+    ),
+}
 
 HEADERS = {"Content-Type": "application/json"}
-TIMEOUT = ClientTimeout(total=10)
+TIMEOUT_TOTAL = 10
+
+# Requests per second and burst size per host
+RATE_LIMITS = {
+    "danepubliczne.imgw.pl": (2.0, 20),
+    "hydro-back.imgw.pl": (5.0, 50),
+    "imgw-api-proxy.evtlab.pl": (2.0, 20),
+}
+
+SESSION_LIMIT_PER_HOST = 8
+SESSION_DNS_CACHE_TTL = 300  # seconds
+SESSION_KEEPALIVE_TIMEOUT = 60.0  # seconds
 
 DATA_VALIDITY_PERIOD = timedelta(hours=6)
 ICE_PHENOMENA_DATA_VALIDITY_PERIOD = timedelta(days=2)
@@ -61,6 +88,55 @@ ALERT_LEVEL_MAP = {
     "3": "red",
 }
 
+# Histogram bucket bounds in seconds
+REQUEST_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PARSE_DURATION_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005)
+DATA_AGE_BUCKETS = (600.0, 1800.0, 3600.0, 7200.0, 21600.0, 86400.0)
+
+FRESHNESS_SAMPLES = 64
+
+# /hydro payload downloaded with the station list is reused by data calls
+HYDROLOGICAL_PAYLOAD_REUSE_PERIOD = timedelta(minutes=5)
+
+FORECAST_GRID_RESOLUTION = 0.025
+FORECAST_CACHE_TTL = timedelta(minutes=15)
+
+SEARCH_MIN_FUZZY_LENGTH = 3
+SEARCH_MATCH_CACHE_SIZE = 1024
+
+# Publication intervals of sources with regular updates; others are polled on
+# SCHEDULER_RETRY_INTERVAL with backoff
+PUBLICATION_INTERVALS = {
+    "hydrological": timedelta(minutes=10),
+    "weather": timedelta(hours=1),
+    "weather_proxy": timedelta(minutes=10),
+}
+# In stale-while-revalidate mode results younger than half the publication
+# interval are returned without a background refresh
+REVALIDATE_AFTER = {
+    source: interval / 2 for source, interval in PUBLICATION_INTERVALS.items()
+}
+DEFAULT_PUBLICATION_LAGS = {
+    "hydrological": timedelta(minutes=20),
+    "weather": timedelta(minutes=30),
+    "weather_proxy": timedelta(minutes=5),
+}
+PUBLICATION_LAG_SAMPLES = 16
+SCHEDULER_JITTER = timedelta(seconds=30)
+SCHEDULER_RETRY_INTERVAL = timedelta(minutes=2)
+SCHEDULER_MAX_BACKOFF = timedelta(minutes=30)
+
+CADENCE_INTERVALS = {
+    "critical": timedelta(minutes=10),
+    "elevated": timedelta(minutes=20),
+    "quiet": timedelta(hours=1),
+}
+CADENCE_RAPID_RISE = 5.0  # cm per hour
+CADENCE_REQUEST_BUDGET = 12.0  # snapshot requests per hour
+
+EARTH_RADIUS = 6371.0088
+SPATIAL_INDEX_CELL_SIZE = 0.5
+
 VEGETATION_DIGIT_TO_PERCENT: dict[int, int] = {0: 0, 1: 33, 2: 67, 3: 100}
 
 ICON_TO_CONDITION: dict[tuple[str, str], str] = {
@@ -81,3 +157,22 @@ ICON_TO_CONDITION: dict[tuple[str, str], str] = {
     ("sleet", "d"): "snowy-rainy",
     ("sleet", "n"): "snowy-rainy",
 }
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Build endpoint URLs and the request timeout on first access."""
+    if name in _API_URLS:
+        from yarl import URL  # noqa: PLC0415
+
+        value: Any = URL(_API_URLS[name])
+    elif name == "TIMEOUT":
+        from aiohttp import ClientTimeout  # noqa: PLC0415
+
+        value = ClientTimeout(total=TIMEOUT_TOTAL)
+    else:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+
+    globals()[name] = value
+
+    return value
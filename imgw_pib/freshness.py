@@ -0,0 +1,115 @@
+"""Lag between measurement and fetch time of IMGW-PIB data."""
+
+from array import array
+from datetime import UTC, datetime, timedelta
+from math import ceil
+from typing import Self
+
+from .const import FRESHNESS_SAMPLES
+
+
+class _LagSeries:
+    """Ring of the latest lags, in seconds, of a station sensor."""
+
+    __slots__ = ("lags", "last_measurement", "position")
+
+    def __init__(self: Self) -> None:
+        """Initialize."""
+        self.lags = array("f")
+        self.position = 0
+        self.last_measurement: datetime | None = None
+
+    def add(self: Self, lag: float, size: int) -> None:
+        """Add a lag, replacing the oldest one when the ring is full."""
+        if len(self.lags) < size:
+            self.lags.append(lag)
+        else:
+            self.lags[self.position] = lag
+        self.position = (self.position + 1) % size
+
+
+class FreshnessTracker:
+    """Lag between measurement and fetch time per station and sensor.
+
+    The lag is recorded once per measurement, when it is first seen, so it shows
+    how long IMGW takes to publish data. The latest lags are kept in a fixed-size
+    ring of 32-bit floats, percentiles are computed from it on demand.
+    """
+
+    def __init__(self: Self, samples: int = FRESHNESS_SAMPLES) -> None:
+        """Initialize."""
+        self._samples = samples
+        self._series: dict[tuple[str, str], _LagSeries] = {}
+
+    def record(
+        self: Self,
+        station_id: str,
+        sensor: str,
+        measured_at: datetime,
+        fetched_at: datetime,
+    ) -> bool:
+        """Record the lag of a measurement, return False if it was already seen."""
+        if (series := self._series.get((station_id, sensor))) is None:
+            series = self._series[station_id, sensor] = _LagSeries()
+
+        if (
+            series.last_measurement is not None
+            and measured_at <= series.last_measurement
+        ):
+            return False
+
+        series.last_measurement = measured_at
+        series.add((fetched_at - measured_at).total_seconds(), self._samples)
+
+        return True
+
+    def sensors(self: Self) -> list[tuple[str, str]]:
+        """Return the tracked station IDs and sensors."""
+        return list(self._series)
+
+    def last_measurement(self: Self, station_id: str, sensor: str) -> datetime | None:
+        """Return the time of the latest measurement of a station sensor."""
+        series = self._series.get((station_id, sensor))
+
+        return series.last_measurement if series else None
+
+    def current_lag(
+        self: Self, station_id: str, sensor: str, now: datetime | None = None
+    ) -> timedelta | None:
+        """Return the time since the latest measurement of a station sensor."""
+        if (last_measurement := self.last_measurement(station_id, sensor)) is None:
+            return None
+
+        return (now or datetime.now(tz=UTC)) - last_measurement
+
+    def percentiles(
+        self: Self,
+        station_id: str,
+        sensor: str,
+        quantiles: tuple[float, ...] = (0.5, 0.9, 0.99),
+    ) -> dict[float, timedelta]:
+        """Return the nearest-rank percentiles of the recorded lags."""
+        series = self._series.get((station_id, sensor))
+
+        if series is None or not series.lags:
+            return {}
+
+        lags = sorted(series.lags)
+
+        return {
+            quantile: timedelta(seconds=lags[max(ceil(quantile * len(lags)) - 1, 0)])
+            for quantile in quantiles
+        }
+
+    def stalled(
+        self: Self, threshold: timedelta, now: datetime | None = None
+    ) -> list[tuple[str, str]]:
+        """Return the station sensors without a new measurement within threshold."""
+        now = now or datetime.now(tz=UTC)
+
+        return [
+            key
+            for key, series in self._series.items()
+            if series.last_measurement is not None
+            and now - series.last_measurement > threshold
+        ]
@@ -0,0 +1,213 @@
+"""Spatial index of IMGW-PIB stations."""
+
+import heapq
+import math
+from collections import defaultdict
+from collections.abc import Iterator
+from typing import Any, Self
+
+from .const import EARTH_RADIUS, SPATIAL_INDEX_CELL_SIZE
+from .model import ApiNames, NearbyStation
+from .utils import haversine_distance
+
+
+class StationIndex:
+    """Grid-based spatial index of station locations.
+
+    Stations are bucketed into cells of ``cell_size`` degrees. Nearest neighbour
+    queries walk rings of cells outwards from the query point and stop as soon as
+    no unvisited cell can hold a closer station.
+    """
+
+    def __init__(
+        self: Self,
+        stations: dict[str, dict[str, Any]],
+        cell_size: float = SPATIAL_INDEX_CELL_SIZE,
+    ) -> None:
+        """Initialize."""
+        self._cell_size = cell_size
+        self._stations: list[tuple[str, str, float, float]] = []
+        self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+
+        for station_id, info in stations.items():
+            lat = info.get(ApiNames.LATITUDE)
+            lon = info.get(ApiNames.LONGITUDE)
+
+            if lat is None or lon is None:
+                continue
+
+            lat, lon = float(lat), float(lon)
+            self._cells[self._cell(lat, lon)].append(len(self._stations))
+            self._stations.append((station_id, info.get("name", ""), lat, lon))
+
+        rows = [row for row, _ in self._cells] or [0]
+        cols = [col for _, col in self._cells] or [0]
+        self._min_row, self._max_row = min(rows), max(rows)
+        self._min_col, self._max_col = min(cols), max(cols)
+
+    def __len__(self: Self) -> int:
+        """Return the number of indexed stations."""
+        return len(self._stations)
+
+    def nearest(
+        self: Self, latitude: float, longitude: float, k: int = 1
+    ) -> list[NearbyStation]:
+        """Return ``k`` stations closest to the given point, nearest first."""
+        if k < 1 or not self._stations:
+            return []
+
+        row, col = self._cell(latitude, longitude)
+        max_ring = max(
+            abs(row - self._min_row),
+            abs(row - self._max_row),
+            abs(col - self._min_col),
+            abs(col - self._max_col),
+        )
+        # Max-heap of the best candidates so far, stored as (-distance, index)
+        best: list[tuple[float, int]] = []
+
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(row, col, ring):
+                for index in self._cells.get(cell, ()):
+                    _, _, lat, lon = self._stations[index]
+                    distance = haversine_distance(latitude, longitude, lat, lon)
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, index))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, index))
+
+            if len(best) == k and -best[0][0] <= self._clearance(
+                latitude, longitude, row, col, ring
+            ):
+                break
+
+        return [
+            self._result(index, -distance)
+            for distance, index in sorted(best, reverse=True)
+        ]
+
+    def within_radius(
+        self: Self, latitude: float, longitude: float, radius: float
+    ) -> list[NearbyStation]:
+        """Return stations within ``radius`` kilometers, nearest first."""
+        if radius < 0:
+            return []
+
+        lat_delta = math.degrees(radius / EARTH_RADIUS)
+        cos_lat = math.cos(math.radians(min(abs(latitude) + lat_delta, 90.0)))
+        lon_delta = (
+            math.degrees(radius / (EARTH_RADIUS * cos_lat)) if cos_lat > 0 else 180.0
+        )
+
+        result = []
+        for index in self._indices_in_box(
+            latitude - lat_delta,
+            longitude - lon_delta,
+            latitude + lat_delta,
+            longitude + lon_delta,
+        ):
+            _, _, lat, lon = self._stations[index]
+            distance = haversine_distance(latitude, longitude, lat, lon)
+            if distance <= radius:
+                result.append(self._result(index, distance))
+
+        result.sort(key=lambda station: (station.distance, station.station_id))
+
+        return result
+
+    def within_bbox(
+        self: Self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+    ) -> list[NearbyStation]:
+        """Return stations inside the bounding box, ordered by station ID."""
+        result = []
+        for index in self._indices_in_box(
+            min_latitude, min_longitude, max_latitude, max_longitude
+        ):
+            _, _, lat, lon = self._stations[index]
+            if (
+                min_latitude <= lat <= max_latitude
+                and min_longitude <= lon <= max_longitude
+            ):
+                result.append(self._result(index))
+
+        result.sort(key=lambda station: station.station_id)
+
+        return result
+
+    def _cell(self: Self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Return the grid cell for a point."""
+        return (
+            math.floor(latitude / self._cell_size),
+            math.floor(longitude / self._cell_size),
+        )
+
+    def _result(self: Self, index: int, distance: float | None = None) -> NearbyStation:
+        """Build a result object for the station at the given index."""
+        station_id, name, lat, lon = self._stations[index]
+
+        return NearbyStation(
+            station_id=station_id,
+            station=name,
+            latitude=lat,
+            longitude=lon,
+            distance=distance,
+        )
+
+    def _indices_in_box(
+        self: Self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+    ) -> Iterator[int]:
+        """Yield indices of stations in cells overlapping the bounding box."""
+        min_row, min_col = self._cell(min_latitude, min_longitude)
+        max_row, max_col = self._cell(max_latitude, max_longitude)
+
+        for row in range(max(min_row, self._min_row), min(max_row, self._max_row) + 1):
+            for col in range(
+                max(min_col, self._min_col), min(max_col, self._max_col) + 1
+            ):
+                yield from self._cells.get((row, col), ())
+
+    @staticmethod
+    def _ring_cells(row: int, col: int, ring: int) -> Iterator[tuple[int, int]]:
+        """Yield cells on the square ring at the given distance from a cell."""
+        if ring == 0:
+            yield row, col
+            return
+
+        for c in range(col - ring, col + ring + 1):
+            yield row - ring, c
+            yield row + ring, c
+        for r in range(row - ring + 1, row + ring):
+            yield r, col - ring
+            yield r, col + ring
+
+    def _clearance(
+        self: Self, latitude: float, longitude: float, row: int, col: int, ring: int
+    ) -> float:
+        """Return the minimum distance from the point to any unvisited cell."""
+        lat_margin = min(
+            latitude - (row - ring) * self._cell_size,
+            (row + ring + 1) * self._cell_size - latitude,
+        )
+        lon_margin = min(
+            longitude - (col - ring) * self._cell_size,
+            (col + ring + 1) * self._cell_size - longitude,
+        )
+
+        lat_distance = EARTH_RADIUS * math.radians(lat_margin)
+        lon_distance = EARTH_RADIUS * math.asin(
+            min(
+                1.0,
+                math.cos(math.radians(latitude))
+                * math.sin(math.radians(min(lon_margin, 90.0))),
+            )
+        )
+
+        return min(lat_distance, lon_distance)
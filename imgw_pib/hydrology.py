@@ -0,0 +1,77 @@
+"""Index of IMGW-PIB hydrological stations by river and province."""
+
+from collections import defaultdict
+from typing import Any, Self
+
+from .model import ApiNames
+from .utils import expand_river_name, fold_diacritics
+
+_MISSING = (None, "", "-")
+
+
+def _key(name: str) -> str:
+    """Return the lookup key for a river or province name."""
+    return " ".join(fold_diacritics(expand_river_name(name)).split())
+
+
+class HydrologicalIndex:
+    """Index from river and province to hydrological station IDs.
+
+    The index is built once from a ``/hydro`` snapshot, so queries like "all
+    gauges on the Wisła" are a dictionary lookup returning a prebuilt tuple of
+    station IDs. Missing rivers and provinces are filled in from the bundled
+    rivers metadata. Lookups ignore case, diacritics and the "Jez."/"Zb."
+    abbreviations.
+    """
+
+    def __init__(
+        self: Self,
+        stations_data: list[dict[str, Any]],
+        rivers_info: dict[str, dict[str, str]],
+    ) -> None:
+        """Initialize."""
+        by_river: dict[str, list[str]] = defaultdict(list)
+        by_province: dict[str, list[str]] = defaultdict(list)
+        self._rivers: dict[str, str] = {}
+        self._provinces: dict[str, str] = {}
+
+        for station in stations_data:
+            station_id = station[ApiNames.STATION_ID]
+            info = rivers_info.get(station_id, {})
+
+            river = station.get(ApiNames.RIVER)
+            if river in _MISSING:
+                river = info.get("name")
+            if river not in _MISSING:
+                key = _key(river)
+                by_river[key].append(station_id)
+                self._rivers.setdefault(key, expand_river_name(river))
+
+            province = station.get(ApiNames.PROVINCE)
+            if province in _MISSING:
+                province = info.get("province")
+            if province not in _MISSING:
+                key = _key(province)
+                by_province[key].append(station_id)
+                self._provinces.setdefault(key, province)
+
+        self._by_river = {key: tuple(ids) for key, ids in by_river.items()}
+        self._by_province = {key: tuple(ids) for key, ids in by_province.items()}
+
+    @property
+    def rivers(self: Self) -> list[str]:
+        """Return sorted river names."""
+        return sorted(self._rivers.values())
+
+    @property
+    def provinces(self: Self) -> list[str]:
+        """Return sorted province names."""
+        return sorted(self._provinces.values())
+
+    def stations_on_river(self: Self, river: str) -> tuple[str, ...]:
+        """Return IDs of stations on the given river."""
+        return self._by_river.get(_key(river), ())
+
+    def stations_in_province(self: Self, province: str) -> tuple[str, ...]:
+        """Return IDs of stations in the given province."""
+        return self._by_province.get(_key(province), ())
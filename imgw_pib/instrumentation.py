@@ -0,0 +1,116 @@
+"""Per-request instrumentation of IMGW-PIB API calls."""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Self
+
+from aiohttp import ClientSession, TraceConfig
+
+from .model import CacheStatus, DataSource, RequestInfo
+
+RequestHook = Callable[[RequestInfo], None]
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """Timestamps and results of a request in progress."""
+
+    created: float
+    start: float | None = None
+    dns_start: float | None = None
+    dns_end: float | None = None
+    connect_start: float | None = None
+    connect_end: float | None = None
+    response_start: float | None = None
+    body_end: float | None = None
+    decode: float | None = None
+    status: int | None = None
+    size: int | None = None
+    cache_status: CacheStatus = CacheStatus.NETWORK
+
+    @property
+    def dns(self: Self) -> float | None:
+        """Return the DNS lookup time."""
+        if self.dns_start is None or self.dns_end is None:
+            return None
+
+        return self.dns_end - self.dns_start
+
+    @property
+    def connect(self: Self) -> float | None:
+        """Return the time to open a connection, without the DNS lookup."""
+        if self.connect_start is None or self.connect_end is None:
+            return None
+
+        return self.connect_end - self.connect_start - (self.dns or 0.0)
+
+    @property
+    def ttfb(self: Self) -> float | None:
+        """Return the time from sending the request to the response headers."""
+        if self.response_start is None or self.start is None:
+            return None
+
+        return self.response_start - (self.connect_end or self.start)
+
+    @property
+    def transfer(self: Self) -> float | None:
+        """Return the time to read the response body."""
+        if self.body_end is None or self.response_start is None:
+            return None
+
+        return self.body_end - self.response_start
+
+    def request_info(
+        self: Self, source: DataSource | None, url: str, error: str | None
+    ) -> RequestInfo:
+        """Return the request info of the finished request."""
+        end = time.perf_counter()
+        start = self.start or end
+
+        return RequestInfo(
+            source=source,
+            url=url,
+            status=self.status,
+            cache_status=self.cache_status,
+            size=self.size,
+            queue=start - self.created,
+            dns=self.dns,
+            connect=self.connect,
+            ttfb=self.ttfb,
+            transfer=self.transfer,
+            decode=self.decode,
+            total=end - start,
+            error=error,
+        )
+
+
+def create_trace_config() -> TraceConfig:
+    """Create a trace config reporting DNS and connect times to request hooks.
+
+    Pass it in ``trace_configs`` when creating the session.
+    """
+    trace_config = TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_mark("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(_mark("dns_end"))
+    trace_config.on_connection_create_start.append(_mark("connect_start"))
+    trace_config.on_connection_create_end.append(_mark("connect_end"))
+
+    return trace_config
+
+
+def _mark(
+    name: str,
+) -> Callable[[ClientSession, SimpleNamespace, Any], Any]:
+    """Return a trace callback recording the time under the given name."""
+
+    async def callback(
+        _session: ClientSession,
+        context: SimpleNamespace,
+        _params: Any,  # noqa: ANN401
+    ) -> None:
+        if isinstance(trace := context.trace_request_ctx, RequestTrace):
+            setattr(trace, name, time.perf_counter())
+
+    return callback
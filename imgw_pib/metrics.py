@@ -0,0 +1,221 @@
+"""Metrics of IMGW-PIB API clients in the Prometheus text format."""
+
+from bisect import bisect_left
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Self
+
+from .const import DATA_AGE_BUCKETS, PARSE_DURATION_BUCKETS, REQUEST_DURATION_BUCKETS
+from .model import HydrologicalData, ImgwPibData, RequestInfo, WeatherData
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Format sample labels."""
+    if not labels:
+        return ""
+
+    formatted = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+    return f"{{{formatted}}}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    """Counter metric with labels."""
+
+    kind = "counter"
+
+    def __init__(
+        self: Self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        """Initialize."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self: Self, *labels: str, amount: float = 1.0) -> None:
+        """Increase the counter for the label values."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self: Self, *labels: str) -> float:
+        """Return the counter value for the label values."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self: Self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yield the name, labels and value of every sample."""
+        for labels, value in sorted(self._values.items()):
+            yield self.name, dict(zip(self.labelnames, labels, strict=True)), value
+
+
+class Histogram:
+    """Histogram metric with labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self: Self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        """Initialize."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Bucket counts, the last one for values above all bounds, and the sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self: Self, value: float, *labels: str) -> None:
+        """Record a value for the label values."""
+        if (entry := self._values.get(labels)) is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def count(self: Self, *labels: str) -> int:
+        """Return the number of recorded values for the label values."""
+        entry = self._values.get(labels)
+
+        return sum(entry[0]) if entry else 0
+
+    def samples(self: Self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yield the name, labels and value of every sample."""
+        for labels, (counts, total) in sorted(self._values.items()):
+            label_map = dict(zip(self.labelnames, labels, strict=True))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    label_map | {"le": _format_value(bound)},
+                    cumulative,
+                )
+            yield f"{self.name}_sum", label_map, total[0]
+            yield f"{self.name}_count", label_map, cumulative
+
+
+class MetricsRegistry:
+    """Metrics of IMGW-PIB API clients.
+
+    Pass the registry to ``ImgwPib`` to record requests, parsing and data age,
+    ``render`` returns all metrics in the Prometheus text format.
+    """
+
+    def __init__(self: Self) -> None:
+        """Initialize."""
+        self._metrics: list[Counter | Histogram] = []
+
+        self.requests = self.counter(
+            "imgw_pib_requests_total", "API requests.", ("source", "status")
+        )
+        self.request_errors = self.counter(
+            "imgw_pib_request_errors_total", "Failed API requests.", ("source",)
+        )
+        self.request_duration = self.histogram(
+            "imgw_pib_request_duration_seconds",
+            "API request duration.",
+            REQUEST_DURATION_BUCKETS,
+            ("source",),
+        )
+        self.weather_updates = self.counter(
+            "imgw_pib_weather_updates_total",
+            "Weather data updates by origin, the forecast proxy or synop.",
+            ("origin",),
+        )
+        self.index_rebuilds = self.counter(
+            "imgw_pib_index_rebuilds_total", "Station index rebuilds.", ("index",)
+        )
+        self.parse_duration = self.histogram(
+            "imgw_pib_parse_duration_seconds",
+            "Data parsing duration.",
+            PARSE_DURATION_BUCKETS,
+            ("kind",),
+        )
+        self.data_age = self.histogram(
+            "imgw_pib_data_age_seconds",
+            "Time from the measurement to the update.",
+            DATA_AGE_BUCKETS,
+            ("kind",),
+        )
+
+    def counter(
+        self: Self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        """Create and register a counter."""
+        counter = Counter(name, documentation, labelnames)
+        self._metrics.append(counter)
+
+        return counter
+
+    def histogram(
+        self: Self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ) -> Histogram:
+        """Create and register a histogram."""
+        histogram = Histogram(name, documentation, buckets, labelnames)
+        self._metrics.append(histogram)
+
+        return histogram
+
+    def observe_request(self: Self, info: RequestInfo) -> None:
+        """Record a completed API request."""
+        source = info.source or "unknown"
+        status = str(info.status) if info.status is not None else "none"
+
+        self.requests.inc(source, status)
+        self.request_duration.observe(info.total, source)
+
+        if info.error is not None or status != "200":
+            self.request_errors.inc(source)
+
+    def observe_data(
+        self: Self, data: ImgwPibData, now: datetime | None = None
+    ) -> None:
+        """Record an update of station data."""
+        now = now or datetime.now(tz=UTC)
+
+        if isinstance(data, WeatherData):
+            kind = "weather"
+            measurement_date = data.measurement_date
+            self.weather_updates.inc("proxy" if data.proxy_used else "synop")
+        elif isinstance(data, HydrologicalData):
+            kind = "hydrological"
+            measurement_date = data.water_level_measurement_date
+        else:
+            return
+
+        if measurement_date is not None:
+            self.data_age.observe((now - measurement_date).total_seconds(), kind)
+
+    def render(self: Self) -> str:
+        """Return all metrics in the Prometheus text format."""
+        lines = []
+
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(
+                f"{name}{_format_labels(labels)} {_format_value(value)}"
+                for name, labels, value in metric.samples()
+            )
+
+        return "\n".join(lines) + "\n"
@@ -1,7 +1,7 @@
 """Type definitions for IMGW-PIB."""
 
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
 from enum import StrEnum
 from typing import Any, Self
 
@@ -10,6 +10,19 @@ from typing import Any, Self
 class ImgwPibData:
     """IMGW-PIB data class."""
 
+    fetched_at: datetime | None = field(
+        default=None, kw_only=True, repr=False, compare=False
+    )
+    stale: bool = field(default=False, kw_only=True, repr=False, compare=False)
+
+    @property
+    def age(self: Self) -> timedelta | None:
+        """Return the time since the data was fetched."""
+        if self.fetched_at is None:
+            return None
+
+        return datetime.now(tz=UTC) - self.fetched_at
+
 
 @dataclass(kw_only=True, slots=True)
 class SensorData:
@@ -105,6 +118,96 @@ class HydrologicalData(ImgwPibData):
                 )
 
 
+@dataclass(kw_only=True, slots=True)
+class ForecastData(ImgwPibData):
+    """Forecast Data class for IMGW-PIB."""
+
+    latitude: float
+    longitude: float
+
+    forecast_hourly: list[dict[str, Any]]
+    forecast_twice_daily: list[dict[str, Any]]
+
+
+class CadenceTier(StrEnum):
+    """Refresh cadence tiers of hydrological stations."""
+
+    CRITICAL = "critical"
+    ELEVATED = "elevated"
+    QUIET = "quiet"
+
+
+class DataSource(StrEnum):
+    """Data sources published by IMGW-PIB."""
+
+    HYDROLOGICAL = "hydrological"
+    HYDROLOGICAL_ALERTS = "hydrological_alerts"
+    HYDROLOGICAL_DETAILS = "hydrological_details"
+    WEATHER = "weather"
+    WEATHER_ALERTS = "weather_alerts"
+    WEATHER_PROXY = "weather_proxy"
+
+
+class CacheStatus(StrEnum):
+    """Origin of a response payload."""
+
+    NETWORK = "network"
+    SNAPSHOT = "snapshot"
+
+
+@dataclass(kw_only=True, slots=True)
+class RequestInfo:
+    """Data class for a completed API request.
+
+    Timings are in seconds. ``queue`` is the wait for the rate limiter, ``total``
+    excludes it. ``dns`` and ``connect`` are only known with the trace config of
+    ``imgw_pib.instrumentation`` on the session and when a new connection was
+    opened.
+    """
+
+    source: DataSource | None
+    url: str
+    status: int | None = None
+    cache_status: CacheStatus = CacheStatus.NETWORK
+    size: int | None = None
+    queue: float | None = None
+    dns: float | None = None
+    connect: float | None = None
+    ttfb: float | None = None
+    transfer: float | None = None
+    decode: float | None = None
+    total: float
+    error: str | None = None
+
+
+class StationKind(StrEnum):
+    """Station kinds."""
+
+    HYDROLOGICAL = "hydrological"
+    WEATHER = "weather"
+
+
+@dataclass(kw_only=True, slots=True)
+class StationMatch:
+    """Data class for a station found by a name search."""
+
+    station_id: str
+    station: str
+    kind: StationKind
+    score: float
+
+
+@dataclass(kw_only=True, slots=True)
+class NearbyStation:
+    """Data class for a station found by a spatial query."""
+
+    station_id: str
+    station: str
+    latitude: float
+    longitude: float
+    distance: float | None = None
+
+
 class ApiNames(StrEnum):
     """Names type for API."""
 
@@ -0,0 +1,111 @@
+"""Per-host rate limiting of requests to IMGW-PIB hosts."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, ClassVar, Self
+from weakref import WeakKeyDictionary
+
+from .const import RATE_LIMITS
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+class TokenBucket:
+    """Token bucket admitting waiting requests in FIFO order."""
+
+    def __init__(
+        self: Self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize."""
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._waiting = 0
+
+    @property
+    def queue_depth(self: Self) -> int:
+        """Return the number of requests waiting for a token."""
+        return self._waiting
+
+    async def acquire(self: Self) -> None:
+        """Wait for a token."""
+        # Tokens are reserved on arrival, so requests are admitted in FIFO order
+        if (delay := self._reserve()) <= 0:
+            return
+
+        self._waiting += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # A cancelled request gives back its reserved token
+            self._tokens += 1
+            raise
+        finally:
+            self._waiting -= 1
+
+    def _reserve(self: Self) -> float:
+        """Reserve a token, return the time until it is available."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+
+        return max(-self._tokens / self.rate, 0.0)
+
+
+class RateLimiter:
+    """Per-host token buckets shared by all API clients of a session."""
+
+    _limiters: ClassVar[WeakKeyDictionary["ClientSession", "RateLimiter"]] = (
+        WeakKeyDictionary()
+    )
+
+    def __init__(
+        self: Self, limits: dict[str, tuple[float, int]] | None = None
+    ) -> None:
+        """Initialize."""
+        self._limits = dict(RATE_LIMITS if limits is None else limits)
+        self._buckets: dict[str, TokenBucket] = {}
+
+    @classmethod
+    def for_session(
+        cls: type["RateLimiter"], session: "ClientSession"
+    ) -> "RateLimiter":
+        """Return the rate limiter of a session."""
+        if (limiter := cls._limiters.get(session)) is None:
+            limiter = cls._limiters[session] = cls()
+
+        return limiter
+
+    def configure(self: Self, host: str, rate: float, burst: int) -> None:
+        """Set the rate, in requests per second, and the burst size of a host."""
+        self._limits[host] = (rate, burst)
+
+        if (bucket := self._buckets.get(host)) is not None:
+            bucket.rate = rate
+            bucket.burst = burst
+
+    async def acquire(self: Self, host: str | None) -> None:
+        """Wait until a request to the host is allowed."""
+        if host is None or host not in self._limits:
+            return
+
+        if (bucket := self._buckets.get(host)) is None:
+            bucket = self._buckets[host] = TokenBucket(*self._limits[host])
+
+        await bucket.acquire()
+
+    def queue_depth(self: Self, host: str | None = None) -> int:
+        """Return the number of requests waiting, for a host or for all hosts."""
+        if host is not None:
+            bucket = self._buckets.get(host)
+            return bucket.queue_depth if bucket else 0
+
+        return sum(bucket.queue_depth for bucket in self._buckets.values())
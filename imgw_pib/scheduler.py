@@ -0,0 +1,330 @@
+"""Publication-aware polling scheduler for IMGW-PIB data."""
+
+import asyncio
+import random
+import statistics
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Self
+
+from .const import (
+    CADENCE_INTERVALS,
+    CADENCE_RAPID_RISE,
+    CADENCE_REQUEST_BUDGET,
+    DEFAULT_PUBLICATION_LAGS,
+    PUBLICATION_INTERVALS,
+    PUBLICATION_LAG_SAMPLES,
+    SCHEDULER_JITTER,
+    SCHEDULER_MAX_BACKOFF,
+    SCHEDULER_RETRY_INTERVAL,
+)
+from .model import (
+    CadenceTier,
+    DataSource,
+    HydrologicalData,
+    ImgwPibData,
+    WeatherData,
+)
+
+_HOUR = 3600.0
+
+
+@dataclass(slots=True)
+class _SourceState:
+    """Polling state of a single data source."""
+
+    marker: datetime | None = None
+    last_poll: datetime | None = None
+    misses: int = 0
+    lags: deque[float] = field(
+        default_factory=lambda: deque(maxlen=PUBLICATION_LAG_SAMPLES)
+    )
+
+
+@dataclass(slots=True)
+class _StationState:
+    """Refresh state of a single hydrological station."""
+
+    tier: CadenceTier
+    last_refresh: datetime
+    water_level: float | None
+    measurement_date: datetime | None
+    rise_rate: float | None = None
+
+
+class PollingScheduler:
+    """Schedule polls shortly after IMGW-PIB is likely to publish new data.
+
+    For sources with a regular publication interval (synop hourly, ``/hydro`` and
+    the forecast proxy every 10 minutes) the next update is expected at the last
+    measurement date plus the interval plus the publication lag learned from
+    previous updates. Sources without a schedule, like alerts, are polled on a
+    fixed interval. Whenever a poll returns nothing new the retry delay doubles up
+    to ``max_backoff``. A random jitter spreads polls of many clients.
+    """
+
+    def __init__(
+        self: Self,
+        jitter: timedelta = SCHEDULER_JITTER,
+        retry_interval: timedelta = SCHEDULER_RETRY_INTERVAL,
+        max_backoff: timedelta = SCHEDULER_MAX_BACKOFF,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize."""
+        self._jitter = jitter.total_seconds()
+        self._retry_interval = retry_interval
+        self._max_backoff = max_backoff
+        self._rng = rng or random.Random()  # noqa: S311
+        self._states: dict[DataSource, _SourceState] = {}
+
+    def record(
+        self: Self,
+        source: DataSource,
+        marker: datetime | None,
+        fetched_at: datetime | None = None,
+    ) -> bool:
+        """Record a poll result and return True when it brought new data.
+
+        ``marker`` is the measurement date for scheduled sources, or any value
+        that changes with new data, like the alert start date, for others.
+        """
+        fetched_at = fetched_at or datetime.now(tz=UTC)
+        state = self._states.setdefault(source, _SourceState())
+        changed = False
+
+        if marker is not None and marker != state.marker:
+            if state.last_poll is not None and source in PUBLICATION_INTERVALS:
+                # New data was published between the previous poll and this one
+                since = max(state.last_poll, marker)
+                published = since + (fetched_at - since) / 2
+                state.lags.append((published - marker).total_seconds())
+            state.marker = marker
+            state.misses = 0
+            changed = True
+        else:
+            state.misses += 1
+
+        state.last_poll = fetched_at
+
+        return changed
+
+    def observe(
+        self: Self, data: ImgwPibData, fetched_at: datetime | None = None
+    ) -> bool:
+        """Record data returned by ImgwPib and return True when anything changed."""
+        if isinstance(data, HydrologicalData):
+            changed = self.record(
+                DataSource.HYDROLOGICAL, data.water_level_measurement_date, fetched_at
+            )
+            alert_source = DataSource.HYDROLOGICAL_ALERTS
+            alert = data.hydrological_alert
+        elif isinstance(data, WeatherData):
+            source = DataSource.WEATHER_PROXY if data.proxy_used else DataSource.WEATHER
+            changed = self.record(source, data.measurement_date, fetched_at)
+            alert_source = DataSource.WEATHER_ALERTS
+            alert = data.weather_alert
+        else:
+            return False
+
+        alert_changed = self.record(alert_source, alert.valid_from, fetched_at)
+
+        return changed or alert_changed
+
+    def publication_lag(self: Self, source: DataSource) -> timedelta:
+        """Return the expected delay between measurement and publication."""
+        state = self._states.get(source)
+
+        if state is None or not state.lags:
+            return DEFAULT_PUBLICATION_LAGS.get(source, timedelta())
+
+        return timedelta(seconds=statistics.median(state.lags))
+
+    def next_poll(
+        self: Self, source: DataSource, now: datetime | None = None
+    ) -> datetime:
+        """Return the time of the next poll of the source."""
+        now = now or datetime.now(tz=UTC)
+        state = self._states.get(source)
+
+        if state is None or state.last_poll is None:
+            return now
+
+        jitter = timedelta(seconds=self._rng.uniform(0, self._jitter))
+
+        if (interval := PUBLICATION_INTERVALS.get(source)) and state.marker:
+            expected = state.marker + interval + self.publication_lag(source)
+            if expected > state.last_poll:
+                return max(expected, now) + jitter
+
+        backoff = min(
+            self._retry_interval * 2 ** max(state.misses - 1, 0), self._max_backoff
+        )
+
+        return max(state.last_poll + backoff, now) + jitter
+
+    def delay(self: Self, source: DataSource, now: datetime | None = None) -> float:
+        """Return the number of seconds until the next poll of the source."""
+        now = now or datetime.now(tz=UTC)
+
+        return (self.next_poll(source, now) - now).total_seconds()
+
+    async def wait(self: Self, source: DataSource) -> None:
+        """Sleep until the next poll of the source."""
+        await asyncio.sleep(self.delay(source))
+
+
+class CadencePolicy:
+    """Per-station refresh cadence driven by flood and alert state.
+
+    Stations at the flood warning or alarm level, under an orange or red alert or
+    rising at twice ``rapid_rise`` cm/h are refreshed as often as IMGW publishes.
+    Stations rising at ``rapid_rise`` cm/h are refreshed more often than quiet
+    ones. One ``/hydro`` snapshot refreshes all
+    stations at once, so ``budget`` limits snapshot requests per hour, however
+    many stations are due.
+    """
+
+    def __init__(
+        self: Self,
+        budget: float = CADENCE_REQUEST_BUDGET,
+        intervals: dict[str, timedelta] | None = None,
+        rapid_rise: float = CADENCE_RAPID_RISE,
+    ) -> None:
+        """Initialize."""
+        self._budget = budget
+        self._intervals = {
+            CadenceTier(tier): interval
+            for tier, interval in (intervals or CADENCE_INTERVALS).items()
+        }
+        self._rapid_rise = rapid_rise
+        self._stations: dict[str, _StationState] = {}
+        self._last_fetch: datetime | None = None
+
+    def observe(
+        self: Self, data: HydrologicalData, fetched_at: datetime | None = None
+    ) -> CadenceTier:
+        """Record data of a station and return its cadence tier."""
+        fetched_at = fetched_at or datetime.now(tz=UTC)
+        water_level = data.water_level.value
+        measurement_date = data.water_level_measurement_date
+        previous = self._stations.get(data.station_id)
+
+        rise_rate = previous.rise_rate if previous else None
+        if (
+            previous is not None
+            and water_level is not None
+            and previous.water_level is not None
+            and measurement_date is not None
+            and previous.measurement_date is not None
+            and measurement_date > previous.measurement_date
+        ):
+            hours = (measurement_date - previous.measurement_date).total_seconds()
+            rise_rate = (water_level - previous.water_level) / (hours / _HOUR)
+
+        tier = self._tier(data, rise_rate)
+
+        self._stations[data.station_id] = _StationState(
+            tier=tier,
+            last_refresh=fetched_at,
+            water_level=water_level,
+            measurement_date=measurement_date,
+            rise_rate=rise_rate,
+        )
+
+        return tier
+
+    def record_attempt(
+        self: Self, station_id: str, fetched_at: datetime | None = None
+    ) -> None:
+        """Record a refresh of a station without current data.
+
+        The station is backed off to the quiet tier, so it does not keep the
+        snapshot requests at the budget limit.
+        """
+        state = self._stations.get(station_id)
+        self._stations[station_id] = _StationState(
+            tier=CadenceTier.QUIET,
+            last_refresh=fetched_at or datetime.now(tz=UTC),
+            water_level=state.water_level if state else None,
+            measurement_date=state.measurement_date if state else None,
+        )
+
+    def tier(self: Self, station_id: str) -> CadenceTier | None:
+        """Return the cadence tier of a station."""
+        state = self._stations.get(station_id)
+
+        return state.tier if state else None
+
+    def interval(self: Self, station_id: str) -> timedelta:
+        """Return the refresh interval of a station."""
+        state = self._stations.get(station_id)
+
+        return self._intervals[state.tier if state else CadenceTier.CRITICAL]
+
+    def record_fetch(self: Self, fetched_at: datetime | None = None) -> None:
+        """Record a snapshot request counted against the budget."""
+        self._last_fetch = fetched_at or datetime.now(tz=UTC)
+
+    def next_refresh(self: Self, station_id: str) -> datetime | None:
+        """Return when the station is due, None if it was never refreshed."""
+        state = self._stations.get(station_id)
+
+        if state is None:
+            return None
+
+        return state.last_refresh + self.interval(station_id)
+
+    def due(
+        self: Self, station_ids: Iterable[str], now: datetime | None = None
+    ) -> list[str]:
+        """Return the stations due for a refresh."""
+        now = now or datetime.now(tz=UTC)
+
+        return [
+            station_id
+            for station_id in station_ids
+            if (next_refresh := self.next_refresh(station_id)) is None
+            or next_refresh <= now
+        ]
+
+    def delay(
+        self: Self, station_ids: Iterable[str], now: datetime | None = None
+    ) -> float:
+        """Return the number of seconds until any of the stations is due.
+
+        Snapshot requests are spaced evenly to stay within the budget.
+        """
+        now = now or datetime.now(tz=UTC)
+        next_refreshes = [self.next_refresh(station_id) for station_id in station_ids]
+        due_at = (
+            now
+            if not next_refreshes or None in next_refreshes
+            else min(filter(None, next_refreshes))
+        )
+
+        if self._last_fetch is not None:
+            due_at = max(due_at, self._last_fetch + timedelta(hours=1 / self._budget))
+
+        return max((due_at - now).total_seconds(), 0.0)
+
+    def _tier(
+        self: Self, data: HydrologicalData, rise_rate: float | None
+    ) -> CadenceTier:
+        """Return the cadence tier for station data."""
+        level = data.hydrological_alert.level
+        rise_rate = rise_rate or 0.0
+
+        if (
+            data.flood_warning
+            or data.flood_alarm
+            or level in ("orange", "red")
+            or rise_rate >= 2 * self._rapid_rise
+        ):
+            return CadenceTier.CRITICAL
+
+        if rise_rate >= self._rapid_rise:
+            return CadenceTier.ELEVATED
+
+        return CadenceTier.QUIET
@@ -0,0 +1,202 @@
+"""Station name search index for IMGW-PIB."""
+
+import bisect
+import heapq
+import re
+from collections import defaultdict
+from typing import Self
+
+from .const import SEARCH_MATCH_CACHE_SIZE, SEARCH_MIN_FUZZY_LENGTH
+from .model import StationKind, StationMatch
+from .utils import fold_diacritics
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_SCORE_EXACT = 3.0
+_SCORE_PREFIX = 2.0
+_SCORE_FUZZY = 1.0
+_SHORT_TOKEN_LENGTH = 5
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into diacritic-folded, lowercase tokens."""
+    return _TOKEN_PATTERN.findall(fold_diacritics(text))
+
+
+def _edit_distance(first: str, second: str, max_distance: int) -> int:
+    """Return Levenshtein distance, or ``max_distance + 1`` when it is exceeded."""
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (first_char != second_char),
+                )
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+
+    return previous[-1]
+
+
+def _trigrams(token: str) -> set[str]:
+    """Return trigrams of a token padded with word boundaries."""
+    padded = f" {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class StationSearchIndex:
+    """Prebuilt index for ranked prefix and fuzzy search of station names.
+
+    Names are folded to ASCII lowercase and split into tokens, so hydrological
+    stations are found both by river and by station name. Prefix lookups use
+    binary search over the sorted token list; fuzzy lookups use a trigram index
+    to pick candidate tokens within a small edit distance.
+    """
+
+    def __init__(
+        self: Self,
+        weather_stations: dict[str, str],
+        hydrological_stations: dict[str, str],
+    ) -> None:
+        """Initialize."""
+        self._entries: list[tuple[str, str, StationKind]] = []
+        token_entries: dict[str, set[int]] = defaultdict(set)
+
+        for kind, stations in (
+            (StationKind.WEATHER, weather_stations),
+            (StationKind.HYDROLOGICAL, hydrological_stations),
+        ):
+            for station_id, name in stations.items():
+                for token in tokenize(name):
+                    token_entries[token].add(len(self._entries))
+                self._entries.append((station_id, name, kind))
+
+        self._tokens = sorted(token_entries)
+        self._token_entries = [frozenset(token_entries[t]) for t in self._tokens]
+        self._trigram_tokens: dict[str, list[int]] = defaultdict(list)
+        for token_index, token in enumerate(self._tokens):
+            for trigram in _trigrams(token):
+                self._trigram_tokens[trigram].append(token_index)
+        self._match_cache: dict[tuple[str, bool], dict[int, float]] = {}
+
+    def __len__(self: Self) -> int:
+        """Return the number of indexed stations."""
+        return len(self._entries)
+
+    def search(
+        self: Self, query: str, limit: int = 10, fuzzy: bool = True
+    ) -> list[StationMatch]:
+        """Return stations matching the query, best matches first.
+
+        Every query token has to match a token of the station name as a prefix.
+        When ``fuzzy`` is set and there are fewer than ``limit`` such stations,
+        tokens within a small edit distance are accepted as well.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens or limit < 1:
+            return []
+
+        scores = self._score(query_tokens, False)
+        if fuzzy and len(scores) < limit:
+            scores = self._score(query_tokens, True)
+
+        best = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (
+                -item[1],
+                len(self._entries[item[0]][1]),
+                self._entries[item[0]][1],
+            ),
+        )
+
+        return [
+            StationMatch(
+                station_id=self._entries[entry][0],
+                station=self._entries[entry][1],
+                kind=self._entries[entry][2],
+                score=score,
+            )
+            for entry, score in best
+        ]
+
+    def _score(self: Self, query_tokens: list[str], fuzzy: bool) -> dict[int, float]:
+        """Return the total score of entries matching all query tokens."""
+        scores = self._match_token(query_tokens[0], fuzzy)
+
+        for query_token in query_tokens[1:]:
+            if not scores:
+                break
+            token_scores = self._match_token(query_token, fuzzy)
+            scores = {
+                entry: score + token_scores[entry]
+                for entry, score in scores.items()
+                if entry in token_scores
+            }
+
+        return scores
+
+    def _match_token(self: Self, query_token: str, fuzzy: bool) -> dict[int, float]:
+        """Return the best score per entry for a single query token.
+
+        Results are memoized, as autocomplete repeats the leading query tokens on
+        every keystroke.
+        """
+        key = (query_token, fuzzy)
+        if (scores := self._match_cache.get(key)) is not None:
+            return scores
+
+        if len(self._match_cache) >= SEARCH_MATCH_CACHE_SIZE:
+            self._match_cache.clear()
+
+        scores = self._match_cache[key] = self._find_token(query_token, fuzzy)
+
+        return scores
+
+    def _find_token(self: Self, query_token: str, fuzzy: bool) -> dict[int, float]:
+        """Look up entries matching a single query token."""
+        scores: dict[int, float] = {}
+
+        start = bisect.bisect_left(self._tokens, query_token)
+        for token_index in range(start, len(self._tokens)):
+            token = self._tokens[token_index]
+            if not token.startswith(query_token):
+                break
+            score = _SCORE_EXACT if token == query_token else _SCORE_PREFIX
+            for entry in self._token_entries[token_index]:
+                scores[entry] = max(scores.get(entry, 0.0), score)
+
+        if not fuzzy or len(query_token) < SEARCH_MIN_FUZZY_LENGTH:
+            return scores
+
+        max_distance = 1 if len(query_token) <= _SHORT_TOKEN_LENGTH else 2
+        candidates = {
+            token_index
+            for trigram in _trigrams(query_token)
+            for token_index in self._trigram_tokens.get(trigram, ())
+        }
+        for token_index in candidates:
+            token = self._tokens[token_index]
+            distance = _edit_distance(
+                query_token, token[: len(query_token)], max_distance
+            )
+            if distance and len(token) <= len(query_token) + max_distance:
+                distance = min(
+                    distance, _edit_distance(query_token, token, max_distance)
+                )
+            if distance > max_distance:
+                continue
+            score = _SCORE_FUZZY - distance / (max_distance + 1)
+            for entry in self._token_entries[token_index]:
+                if scores.get(entry, 0.0) < score:
+                    scores[entry] = score
+
+        return scores
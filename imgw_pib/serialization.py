@@ -0,0 +1,225 @@
+"""Conversion of IMGW-PIB data to plain types, JSON and compact snapshots."""
+
+import gzip
+from dataclasses import fields
+from datetime import datetime
+from enum import Enum
+from typing import Any, TypeVar
+
+import orjson
+
+from .model import (
+    Alert,
+    ForecastData,
+    HydrologicalData,
+    ImgwPibData,
+    SensorData,
+    WeatherData,
+)
+
+_DataT = TypeVar("_DataT", bound=ImgwPibData)
+
+SNAPSHOT_VERSION = 1
+
+
+class _FieldKind(Enum):
+    """How a field of a data class is converted."""
+
+    ALERT = "alert"
+    DATETIME = "datetime"
+    FORECAST = "forecast"
+    PLAIN = "plain"
+    SENSOR = "sensor"
+
+
+def _field_kind(field_type: object) -> _FieldKind:
+    """Return the conversion of a field type."""
+    if field_type is SensorData:
+        return _FieldKind.SENSOR
+    if field_type is Alert:
+        return _FieldKind.ALERT
+    if field_type == datetime | None:
+        return _FieldKind.DATETIME
+    if field_type in (list[dict[str, Any]], list[dict[str, Any]] | None):
+        return _FieldKind.FORECAST
+
+    return _FieldKind.PLAIN
+
+
+# Fields of the serializable data classes with their conversion, in field order
+_FIELDS: dict[type[ImgwPibData], tuple[tuple[str, _FieldKind], ...]] = {
+    cls: tuple((field.name, _field_kind(field.type)) for field in fields(cls))
+    for cls in (WeatherData, HydrologicalData, ForecastData)
+}
+_CLASSES = {cls.__name__: cls for cls in _FIELDS}
+
+
+def to_dict(data: ImgwPibData) -> dict[str, Any]:
+    """Return the data as a dictionary.
+
+    The result equals that of ``dataclasses.asdict``. Unlike ``asdict``, values
+    are not deep copied, forecast entries are shallow copies.
+    """
+    result: dict[str, Any] = {}
+
+    for name, kind in _FIELDS[type(data)]:
+        value = getattr(data, name)
+        if kind is _FieldKind.SENSOR:
+            value = {"name": value.name, "value": value.value, "unit": value.unit}
+        elif kind is _FieldKind.ALERT:
+            value = {
+                "value": value.value,
+                "valid_from": value.valid_from,
+                "valid_to": value.valid_to,
+                "probability": value.probability,
+                "level": value.level,
+            }
+        elif kind is _FieldKind.FORECAST and value is not None:
+            value = [dict(entry) for entry in value]
+        result[name] = value
+
+    return result
+
+
+def to_json_bytes(data: ImgwPibData) -> bytes:
+    """Return the data as JSON, the same as ``to_dict`` with ISO 8601 dates."""
+    return orjson.dumps(data, default=_json_default)
+
+
+def from_dict(cls: type[_DataT], payload: dict[str, Any]) -> _DataT:  # noqa: UP047
+    """Return the data of a dictionary created by ``to_dict`` or decoded JSON.
+
+    Dates may be datetime objects or ISO 8601 strings. Fields missing in the
+    payload get their defaults, the forecast lists are used as they are.
+    """
+    arguments: dict[str, Any] = {}
+
+    for name, kind in _FIELDS[cls]:
+        if name not in payload:
+            continue
+        value = payload[name]
+        if kind is _FieldKind.SENSOR:
+            value = SensorData(
+                name=value["name"], value=value["value"], unit=value["unit"]
+            )
+        elif kind is _FieldKind.ALERT:
+            value = Alert(
+                value=value["value"],
+                valid_from=_parse_datetime(value["valid_from"]),
+                valid_to=_parse_datetime(value["valid_to"]),
+                probability=value["probability"],
+                level=value["level"],
+            )
+        elif kind is _FieldKind.DATETIME:
+            value = _parse_datetime(value)
+        arguments[name] = value
+
+    return cls(**arguments)
+
+
+def encode_snapshot(results: list[ImgwPibData]) -> bytes:
+    """Return a compact gzip compressed snapshot of many results.
+
+    Field names and sensor names with units are stored once in the header, every
+    result is a row of values in field order. A sensor reading is the index of
+    its name and unit and the value, an alert is a list of its fields.
+    """
+    classes: dict[type[ImgwPibData], int] = {}
+    sensors: dict[tuple[str, str | None], int] = {}
+    rows = []
+
+    for data in results:
+        cls = type(data)
+        row: list[Any] = [classes.setdefault(cls, len(classes))]
+        for name, kind in _FIELDS[cls]:
+            value = getattr(data, name)
+            if kind is _FieldKind.SENSOR:
+                sensor = (value.name, value.unit)
+                value = (sensors.setdefault(sensor, len(sensors)), value.value)
+            elif kind is _FieldKind.ALERT:
+                value = (
+                    value.value,
+                    value.valid_from,
+                    value.valid_to,
+                    value.probability,
+                    value.level,
+                )
+            row.append(value)
+        rows.append(row)
+
+    return gzip.compress(
+        orjson.dumps(
+            {
+                "version": SNAPSHOT_VERSION,
+                "classes": [
+                    (cls.__name__, [name for name, _ in _FIELDS[cls]])
+                    for cls in classes
+                ],
+                "sensors": list(sensors),
+                "rows": rows,
+            },
+            default=_json_default,
+        ),
+        compresslevel=1,
+    )
+
+
+def decode_snapshot(content: bytes) -> list[ImgwPibData]:
+    """Return the results of a snapshot created by ``encode_snapshot``."""
+    snapshot = orjson.loads(gzip.decompress(content))
+
+    if (version := snapshot["version"]) != SNAPSHOT_VERSION:
+        msg = f"Unsupported snapshot version {version}"
+        raise ValueError(msg)
+
+    classes = []
+    for class_name, names in snapshot["classes"]:
+        cls = _CLASSES[class_name]
+        kinds = dict(_FIELDS[cls])
+        classes.append((cls, [(name, kinds[name]) for name in names]))
+    sensors = snapshot["sensors"]
+
+    results = []
+    for class_index, *values in snapshot["rows"]:
+        cls, class_fields = classes[class_index]
+        arguments: dict[str, Any] = {}
+        for (name, kind), value in zip(class_fields, values, strict=True):
+            if kind is _FieldKind.SENSOR:
+                sensor_name, unit = sensors[value[0]]
+                arguments[name] = SensorData(
+                    name=sensor_name, value=value[1], unit=unit
+                )
+            elif kind is _FieldKind.ALERT:
+                alert_value, valid_from, valid_to, probability, level = value
+                arguments[name] = Alert(
+                    value=alert_value,
+                    valid_from=_parse_datetime(valid_from),
+                    valid_to=_parse_datetime(valid_to),
+                    probability=probability,
+                    level=level,
+                )
+            elif kind is _FieldKind.DATETIME:
+                arguments[name] = _parse_datetime(value)
+            else:
+                arguments[name] = value
+        results.append(cls(**arguments))
+
+    return results
+
+
+def _parse_datetime(value: datetime | str | None) -> datetime | None:
+    """Return a datetime of a datetime object or an ISO 8601 string."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+
+    return value
+
+
+def _json_default(value: object) -> Any:  # noqa: ANN401
+    """Return a JSON serializable form of values orjson does not handle."""
+    # Subclasses of datetime, orjson only serializes the exact type
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    msg = f"Type is not JSON serializable: {type(value).__name__}"
+    raise TypeError(msg)
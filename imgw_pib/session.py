@@ -0,0 +1,42 @@
+"""Client session tuned for IMGW-PIB hosts."""
+
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector
+
+from .const import (
+    RATE_LIMITS,
+    SESSION_DNS_CACHE_TTL,
+    SESSION_KEEPALIVE_TIMEOUT,
+    SESSION_LIMIT_PER_HOST,
+    TIMEOUT,
+)
+
+
+def create_session(
+    limit_per_host: int = SESSION_LIMIT_PER_HOST,
+    **kwargs: Any,  # noqa: ANN401
+) -> ClientSession:
+    """Create a client session for the IMGW-PIB API.
+
+    Connections to each host are limited and kept alive between requests and DNS
+    lookups are cached. Other options are passed to ``ClientSession``. The session
+    creates its own connector and leaves response statuses to the client, so
+    ``connector`` and ``raise_for_status`` are rejected with ``TypeError``.
+    Must be called from a running event loop, the caller is responsible for
+    closing the session.
+    """
+    for option in ("connector", "raise_for_status"):
+        if option in kwargs:
+            msg = f"Unsupported session option: {option}"
+            raise TypeError(msg)
+
+    connector = TCPConnector(
+        limit=limit_per_host * len(RATE_LIMITS),
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=SESSION_DNS_CACHE_TTL,
+        keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+    )
+    kwargs.setdefault("timeout", TIMEOUT)
+
+    return ClientSession(connector=connector, **kwargs)
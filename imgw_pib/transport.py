@@ -0,0 +1,209 @@
+"""Recording and replaying of IMGW-PIB API responses."""
+
+import asyncio
+import gzip
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import cycle
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol, Self
+
+import aiofiles
+import orjson
+from aiohttp import ClientConnectionError
+
+from .const import HEADERS, TIMEOUT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from aiohttp import ClientResponse, ClientSession
+    from yarl import URL
+
+    from .instrumentation import RequestTrace
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(kw_only=True, slots=True)
+class RecordedResponse:
+    """API response with its headers, body and timing."""
+
+    url: str
+    status: int
+    content_type: str
+    headers: list[tuple[str, str]]
+    body: bytes
+    ttfb: float
+    transfer: float
+
+    async def read(self: Self) -> bytes:
+        """Return the body."""
+        return self.body
+
+    async def json(self: Self) -> Any:  # noqa: ANN401
+        """Return the decoded body."""
+        return orjson.loads(self.body)
+
+
+class Transport(Protocol):
+    """Source of API responses replacing direct session requests."""
+
+    # Offline transports do not reach upstream and are not rate limited
+    offline: bool
+
+    async def request(
+        self: Self,
+        session: "ClientSession",
+        url: "URL",
+        trace: "RequestTrace | None",
+    ) -> "ClientResponse | RecordedResponse":
+        """Return the response to a GET request."""
+
+
+class RecordingTransport:
+    """Transport recording the responses of upstream requests."""
+
+    offline = False
+
+    def __init__(self: Self) -> None:
+        """Initialize."""
+        self.responses: list[RecordedResponse] = []
+
+    async def request(
+        self: Self,
+        session: "ClientSession",
+        url: "URL",
+        trace: "RequestTrace | None",
+    ) -> "ClientResponse":
+        """Make the request and record its response."""
+        start = time.perf_counter()
+        response = await session.request(
+            "get", url, headers=HEADERS, timeout=TIMEOUT, trace_request_ctx=trace
+        )
+        response_start = time.perf_counter()
+        # The body is kept by the response, reading it again returns it at once
+        body = await response.read()
+
+        self.responses.append(
+            RecordedResponse(
+                url=str(url),
+                status=response.status,
+                content_type=response.content_type,
+                headers=list(response.headers.items()),
+                body=body,
+                ttfb=response_start - start,
+                transfer=time.perf_counter() - response_start,
+            )
+        )
+
+        return response
+
+    async def save(self: Self, path: Path | str) -> None:
+        """Write the recorded responses to a compressed archive."""
+        async with aiofiles.open(path, "wb") as file:
+            await file.write(_encode_archive(self.responses))
+
+
+class ReplayTransport:
+    """Transport serving recorded responses without network access.
+
+    Responses of a URL are served in the recorded order, starting over after the
+    last one. With ``pace`` set, every response is delayed by its recorded
+    duration multiplied by ``pace``, ``1.0`` reproduces the recorded timing.
+    """
+
+    offline = True
+
+    def __init__(
+        self: Self, responses: list[RecordedResponse], pace: float = 0.0
+    ) -> None:
+        """Initialize."""
+        grouped: dict[str, list[RecordedResponse]] = defaultdict(list)
+        for response in responses:
+            grouped[response.url].append(response)
+
+        self._responses: dict[str, Iterator[RecordedResponse]] = {
+            url: cycle(url_responses) for url, url_responses in grouped.items()
+        }
+        self._pace = pace
+
+    @classmethod
+    async def load(cls: type[Self], path: Path | str, pace: float = 0.0) -> Self:
+        """Create a transport replaying the responses of an archive."""
+        async with aiofiles.open(path, "rb") as file:
+            content = await file.read()
+
+        return cls(_decode_archive(content), pace)
+
+    async def request(
+        self: Self,
+        session: "ClientSession",  # noqa: ARG002
+        url: "URL",
+        trace: "RequestTrace | None",  # noqa: ARG002
+    ) -> RecordedResponse:
+        """Return the next recorded response of the URL."""
+        if (responses := self._responses.get(str(url))) is None:
+            msg = f"No recorded response for {url}"
+            raise ClientConnectionError(msg)
+
+        response = next(responses)
+        _LOGGER.debug("Replaying recorded response for %s", url)
+
+        if self._pace:
+            await asyncio.sleep((response.ttfb + response.transfer) * self._pace)
+
+        return response
+
+
+def _encode_archive(responses: list[RecordedResponse]) -> bytes:
+    """Return the gzip compressed archive of responses.
+
+    Every response is stored as a JSON header line followed by the raw body, the
+    header holds the body size.
+    """
+    return gzip.compress(
+        b"".join(
+            orjson.dumps(
+                {
+                    "url": response.url,
+                    "status": response.status,
+                    "content_type": response.content_type,
+                    "headers": response.headers,
+                    "size": len(response.body),
+                    "ttfb": response.ttfb,
+                    "transfer": response.transfer,
+                }
+            )
+            + b"\n"
+            + response.body
+            for response in responses
+        )
+    )
+
+
+def _decode_archive(content: bytes) -> list[RecordedResponse]:
+    """Return the responses of a gzip compressed archive."""
+    content = gzip.decompress(content)
+    responses = []
+    position = 0
+
+    while position < len(content):
+        end = content.index(b"\n", position)
+        header = orjson.loads(content[position:end])
+        position = end + 1 + header["size"]
+        responses.append(
+            RecordedResponse(
+                url=header["url"],
+                status=header["status"],
+                content_type=header["content_type"],
+                headers=[(name, value) for name, value in header["headers"]],
+                body=content[end + 1 : position],
+                ttfb=header["ttfb"],
+                transfer=header["transfer"],
+            )
+        )
+
+    return responses
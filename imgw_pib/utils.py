@@ -1,13 +1,17 @@
 """Utils for imgw-pib."""
 
 import logging
+import math
 import re
+import unicodedata
 from datetime import datetime, timedelta
+from typing import Any
 from zoneinfo import ZoneInfo
 
 from .const import (
     DATA_VALIDITY_PERIOD,
     DATE_FORMAT,
+    EARTH_RADIUS,
     ICON_TO_CONDITION,
     VEGETATION_DIGIT_TO_PERCENT,
 )
@@ -24,16 +28,32 @@ _PRECIP_SNOW_MIN = 70
 _PRECIP_HEAVY_MIN = 80
 _CLOUD_PARTLY_THRESHOLD = 5
 
+# Letters that do not decompose into a base letter and a combining mark
+_FOLD_TABLE = str.maketrans({"ł": "l", "Ł": "L"})
+
+
+def expand_river_name(river: str) -> str:
+    """Expand abbreviations used in river names."""
+    river = re.sub(r"\b[Jj]ez\.\s*", "Jezioro ", river)
+
+    return re.sub(r"\b[Zz]b\.?\s", "Zbiornik ", river)
+
 
 def gen_station_name(station: str, river: str) -> str:
     """Generate station name."""
     if river == "-":
         return station.strip()
 
-    river = re.sub(r"\b[Jj]ez\.\s*", "Jezioro ", river)
-    river = re.sub(r"\b[Zz]b\.?\s", "Zbiornik ", river)
+    return f"{expand_river_name(river)} ({station.strip()})"
+
+
+def fold_diacritics(text: str) -> str:
+    """Return lowercase text with diacritics removed, e.g. "Łódź" -> "lodz"."""
+    decomposed = unicodedata.normalize("NFKD", text.translate(_FOLD_TABLE))
 
-    return f"{river} ({station.strip()})"
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).lower()
 
 
 def get_datetime(date_time: str | None, date_format: str) -> datetime | None:
@@ -152,3 +172,33 @@ def decode_vegetation_phenomena(
     emergent = VEGETATION_DIGIT_TO_PERCENT[digits[2]]
 
     return submerged, floating, emergent
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in kilometers."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(lon2 - lon1)
+
+    a = (
+        math.sin(delta_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def snap_to_grid(
+    latitude: float, longitude: float, resolution: float
+) -> tuple[float, float]:
+    """Snap coordinates to the nearest node of a grid with the given resolution."""
+    return (
+        round(round(latitude / resolution) * resolution, 6),
+        round(round(longitude / resolution) * resolution, 6),
+    )
+
+
+def row_fingerprint(row: dict[str, Any]) -> int:
+    """Return a fingerprint of a flat API payload row."""
+    return hash(tuple(row.items()))
@@ -0,0 +1,60 @@
+"""Tests for imgw_pib.cache module."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from imgw_pib.cache import SnapshotCache
+
+URL = "https://danepubliczne.imgw.pl/api/data/hydro"
+FETCHED_AT = datetime(2024, 4, 22, 11, 10, 32, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_store_and_load(tmp_path: Path) -> None:
+    """Test a stored payload is loaded with its fetch time."""
+    cache = SnapshotCache(tmp_path / "snapshots")
+
+    assert await cache.load(URL) is None
+
+    cache.store(URL, [{"id_stacji": "154190050"}], FETCHED_AT)
+    await cache.flush()
+
+    assert await cache.load(URL) == (FETCHED_AT, [{"id_stacji": "154190050"}])
+    assert await SnapshotCache(tmp_path / "snapshots").load(URL) == (
+        FETCHED_AT,
+        [{"id_stacji": "154190050"}],
+    )
+
+    cache.store(URL, [], FETCHED_AT)
+    await cache.flush()
+
+    assert await cache.load(URL) == (FETCHED_AT, [])
+    assert len(list((tmp_path / "snapshots").iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_corrupted_snapshot(tmp_path: Path) -> None:
+    """Test a corrupted snapshot is ignored."""
+    cache = SnapshotCache(tmp_path)
+    cache.store(URL, [], FETCHED_AT)
+    await cache.flush()
+
+    (snapshot,) = tmp_path.iterdir()  # noqa: ASYNC240
+    snapshot.write_bytes(b"{")
+
+    assert await cache.load(URL) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_write(tmp_path: Path) -> None:
+    """Test a failed write does not raise."""
+    path = tmp_path / "file"
+    path.touch()
+    cache = SnapshotCache(path)
+
+    cache.store(URL, [], FETCHED_AT)
+    await cache.flush()
+
+    assert await cache.load(URL) is None
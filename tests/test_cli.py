@@ -0,0 +1,129 @@
+"""Tests for imgw_pib.cli module."""
+
+import csv
+import io
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import orjson
+import pytest
+from aiointercept import aiointercept
+
+from imgw_pib import ApiError
+from imgw_pib.cli import export, main
+from imgw_pib.const import (
+    API_HYDROLOGICAL_ENDPOINT,
+    API_HYDROLOGICAL_WARNINGS_ENDPOINT,
+    API_WEATHER_ENDPOINT,
+    API_WEATHER_WARNINGS_ENDPOINT,
+)
+from imgw_pib.model import StationKind
+
+pytestmark = pytest.mark.usefixtures("frozen_time")
+
+
+@pytest.mark.asyncio
+async def test_export_hydrological_ndjson(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test stations with a current water level are written as JSON lines."""
+    session = aiohttp.ClientSession()
+    stream = io.BytesIO()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        count = await export(session, StationKind.HYDROLOGICAL, "ndjson", stream)
+
+    await session.close()
+
+    records = [orjson.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert 0 < count < len(hydrological_stations)
+    assert len(records) == count
+    assert [record["station_id"] for record in records] == [
+        station["id_stacji"]
+        for station in hydrological_stations
+        if station["id_stacji"] in {record["station_id"] for record in records}
+    ]
+
+    record = next(record for record in records if record["station_id"] == "154190050")
+
+    assert record["water_level"] == {
+        "name": "Water Level",
+        "value": 558.0,
+        "unit": "cm",
+    }
+    assert record["hydrological_alert"]["value"] == "rapid_water_level_rise"
+    assert record["fetched_at"] == "2024-04-22T11:10:32+00:00"
+
+
+@pytest.mark.asyncio
+async def test_export_weather_csv(
+    weather_stations: list[dict[str, Any]],
+) -> None:
+    """Test every synop station is written as a CSV row after the header."""
+    session = aiohttp.ClientSession()
+    stream = io.BytesIO()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_WEATHER_ENDPOINT, payload=weather_stations)
+        session_mock.get(
+            API_WEATHER_WARNINGS_ENDPOINT, status=HTTPStatus.NOT_FOUND.value
+        )
+
+        count = await export(session, StationKind.WEATHER, "csv", stream)
+
+    await session.close()
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue().decode())))
+
+    assert count == len(rows) == len(weather_stations)
+
+    row = next(row for row in rows if row["station_id"] == "12600")
+
+    assert row["station"] == "Bielsko Biała"
+    assert row["temperature"] == "0.8"
+    assert row["temperature_unit"] == "°C"
+    assert row["latitude"] == "49.821877"
+    assert row["measurement_date"] == "2024-04-22T07:00:00+02:00"
+    assert row["weather_alert"] == "no_alert"
+    assert row["forecast_hourly"] == ""
+
+
+def test_main_output_file(tmp_path: Path) -> None:
+    """Test the output file is passed to the export."""
+    output = tmp_path / "hydro.csv"
+
+    async def fake_export(
+        session: aiohttp.ClientSession,  # noqa: ARG001
+        source: StationKind,
+        output_format: str,
+        stream: io.BytesIO,
+    ) -> int:
+        stream.write(f"{source},{output_format}\n".encode())
+        return 1
+
+    with patch("imgw_pib.cli.export", new=fake_export):
+        main(["hydrological", "--format", "csv", "--output", str(output)])
+
+    assert output.read_text() == "hydrological,csv\n"
+
+
+def test_main_error(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test API errors end the command with a message."""
+    with (
+        patch("imgw_pib.cli.export", new=AsyncMock(side_effect=ApiError("Boom"))),
+        pytest.raises(SystemExit) as exc_info,
+    ):
+        main(["weather"])
+
+    assert exc_info.value.code == 1
+    assert "imgw-pib: error: ApiError('Boom')" in capsys.readouterr().err
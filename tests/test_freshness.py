@@ -0,0 +1,57 @@
+"""Tests for imgw_pib.freshness module."""
+
+from datetime import UTC, datetime, timedelta
+
+from imgw_pib.freshness import FreshnessTracker
+
+T0 = datetime(2024, 4, 22, 10, 0, tzinfo=UTC)
+
+
+def test_record_new_measurements_only() -> None:
+    """Test the lag is recorded once per measurement."""
+    tracker = FreshnessTracker()
+
+    assert tracker.record("1", "water_level", T0, T0 + timedelta(minutes=20))
+    assert not tracker.record("1", "water_level", T0, T0 + timedelta(minutes=30))
+    assert not tracker.record(
+        "1", "water_level", T0 - timedelta(minutes=10), T0 + timedelta(minutes=30)
+    )
+
+    assert tracker.sensors() == [("1", "water_level")]
+    assert tracker.last_measurement("1", "water_level") == T0
+    assert tracker.percentiles("1", "water_level") == {
+        0.5: timedelta(minutes=20),
+        0.9: timedelta(minutes=20),
+        0.99: timedelta(minutes=20),
+    }
+
+
+def test_percentiles_rolling_window() -> None:
+    """Test percentiles are computed from the latest lags."""
+    tracker = FreshnessTracker(samples=4)
+
+    for minutes in range(1, 11):
+        measured_at = T0 + timedelta(hours=minutes)
+        tracker.record(
+            "1", "weather", measured_at, measured_at + timedelta(minutes=minutes)
+        )
+
+    assert tracker.percentiles("1", "weather", (0.0, 0.5, 1.0)) == {
+        0.0: timedelta(minutes=7),
+        0.5: timedelta(minutes=8),
+        1.0: timedelta(minutes=10),
+    }
+    assert tracker.percentiles("2", "weather") == {}
+
+
+def test_current_lag_and_stalled() -> None:
+    """Test the time since the latest measurement and stalled sensors."""
+    tracker = FreshnessTracker()
+    tracker.record("1", "water_level", T0, T0)
+    tracker.record("2", "water_level", T0 + timedelta(hours=2), T0)
+
+    now = T0 + timedelta(hours=3)
+
+    assert tracker.current_lag("1", "water_level", now) == timedelta(hours=3)
+    assert tracker.current_lag("3", "water_level", now) is None
+    assert tracker.stalled(timedelta(hours=2), now) == [("1", "water_level")]
@@ -0,0 +1,136 @@
+"""Tests for imgw_pib.geo module."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+import pytest
+
+from imgw_pib import ImgwPib
+from imgw_pib.const import PROXY_WEATHER_STATIONS_FILE, WEATHER_STATIONS_INFO_FILE
+from imgw_pib.exceptions import ApiError
+from imgw_pib.geo import StationIndex
+from imgw_pib.utils import haversine_distance
+
+
+@pytest.fixture
+def stations_info() -> dict[str, dict[str, Any]]:
+    """Return bundled weather and proxy stations metadata."""
+    result: dict[str, dict[str, Any]] = {}
+    for path in (WEATHER_STATIONS_INFO_FILE, PROXY_WEATHER_STATIONS_FILE):
+        with Path(path).open(encoding="utf-8") as file:
+            result |= json.load(file)
+    return result
+
+
+def brute_force(
+    stations: dict[str, dict[str, Any]], lat: float, lon: float
+) -> list[tuple[float, str]]:
+    """Return all stations sorted by distance."""
+    return sorted(
+        (haversine_distance(lat, lon, info["lat"], info["lon"]), station_id)
+        for station_id, info in stations.items()
+    )
+
+
+def test_haversine_distance() -> None:
+    """Test distance between Warsaw and Kraków."""
+    assert haversine_distance(52.2297, 21.0122, 50.0647, 19.945) == pytest.approx(
+        252.0, abs=1.0
+    )
+
+
+@pytest.mark.parametrize(
+    ("lat", "lon"),
+    [(52.23, 21.01), (49.3, 20.0), (54.6, 18.8), (50.0, 14.0), (60.0, 30.0)],
+)
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_nearest(
+    stations_info: dict[str, dict[str, Any]], lat: float, lon: float, k: int
+) -> None:
+    """Test nearest stations match a brute-force scan."""
+    index = StationIndex(stations_info)
+
+    result = index.nearest(lat, lon, k)
+
+    expected = brute_force(stations_info, lat, lon)[:k]
+    assert [station.station_id for station in result] == [
+        station_id for _, station_id in expected
+    ]
+    assert [station.distance for station in result] == pytest.approx(
+        [distance for distance, _ in expected]
+    )
+
+
+def test_nearest_empty_index() -> None:
+    """Test nearest on an empty index."""
+    index = StationIndex({"no-location": {"name": "Nowhere"}})
+
+    assert len(index) == 0
+    assert index.nearest(52.0, 21.0) == []
+
+
+def test_within_radius(stations_info: dict[str, dict[str, Any]]) -> None:
+    """Test stations within radius match a brute-force scan."""
+    index = StationIndex(stations_info)
+
+    result = index.within_radius(50.06, 19.94, 60.0)
+
+    expected = [
+        station_id
+        for distance, station_id in brute_force(stations_info, 50.06, 19.94)
+        if distance <= 60.0
+    ]
+    assert [station.station_id for station in result] == expected
+    assert len(result) > 1
+
+
+def test_within_bbox(stations_info: dict[str, dict[str, Any]]) -> None:
+    """Test stations within bounding box."""
+    index = StationIndex(stations_info)
+
+    result = index.within_bbox(49.0, 19.0, 50.0, 20.5)
+
+    expected = sorted(
+        station_id
+        for station_id, info in stations_info.items()
+        if 49.0 <= info["lat"] <= 50.0 and 19.0 <= info["lon"] <= 20.5
+    )
+    assert [station.station_id for station in result] == expected
+    assert all(station.distance is None for station in result)
+
+
+@pytest.mark.asyncio
+async def test_nearest_weather_station() -> None:
+    """Test nearest weather station lookup."""
+    session = aiohttp.ClientSession()
+
+    imgwpib = await ImgwPib.create(session)
+    result = await imgwpib.nearest_weather_station(49.821877, 19.047007, k=2)
+
+    await session.close()
+
+    assert result[0].station_id == "12600"
+    assert result[0].station == "Bielsko-Biała"
+    assert result[0].distance == pytest.approx(0.0)
+    assert len(result) == 2
+
+
+@pytest.mark.asyncio
+async def test_stations_within() -> None:
+    """Test stations within radius and bounding box."""
+    session = aiohttp.ClientSession()
+
+    imgwpib = await ImgwPib.create(session)
+    by_radius = await imgwpib.stations_within(center=(49.821877, 19.047007), radius=5)
+    by_bbox = await imgwpib.stations_within((49.8, 19.0, 49.9, 19.1))
+
+    with pytest.raises(ApiError) as exc_info:
+        await imgwpib.stations_within(radius=10)
+
+    await session.close()
+
+    assert [station.station_id for station in by_radius] == ["12600"]
+    assert "12600" in [station.station_id for station in by_bbox]
+    assert str(exc_info.value) == "Either bbox or center and radius must be set"
@@ -0,0 +1,97 @@
+"""Tests for imgw_pib.hydrology module."""
+
+from typing import Any
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+
+from imgw_pib import ImgwPib
+from imgw_pib.const import API_HYDROLOGICAL_ENDPOINT
+from imgw_pib.hydrology import HydrologicalIndex
+from imgw_pib.model import ApiNames
+
+RIVERS_INFO = {
+    "154180140": {"name": "Bałtyk", "province": "pomorskie"},
+    "150190070": {"name": "Brynica", "province": "śląskie"},
+}
+
+
+@pytest.fixture
+def index(hydrological_stations: list[dict[str, Any]]) -> HydrologicalIndex:
+    """Return an index built from the hydrological stations fixture."""
+    return HydrologicalIndex(hydrological_stations, RIVERS_INFO)
+
+
+def test_stations_on_river(
+    index: HydrologicalIndex, hydrological_stations: list[dict[str, Any]]
+) -> None:
+    """Test all gauges on a river are returned in snapshot order."""
+    expected = tuple(
+        station[ApiNames.STATION_ID]
+        for station in hydrological_stations
+        if station[ApiNames.RIVER] == "Wisła"
+    )
+
+    assert index.stations_on_river("Wisła") == expected
+    assert index.stations_on_river("wisla") == expected
+    assert len(expected) == 41
+
+
+def test_stations_in_province(
+    index: HydrologicalIndex, hydrological_stations: list[dict[str, Any]]
+) -> None:
+    """Test all gauges in a province are returned."""
+    result = index.stations_in_province("ŚLĄSKIE")
+
+    assert len(result) == 62
+    assert all(
+        station[ApiNames.PROVINCE] == "śląskie"
+        for station in hydrological_stations
+        if station[ApiNames.STATION_ID] in result
+    )
+
+
+def test_missing_river_from_rivers_info(index: HydrologicalIndex) -> None:
+    """Test a missing river is taken from the rivers metadata."""
+    assert "154180140" in index.stations_on_river("Bałtyk")
+    assert "150190070" in index.stations_on_river("Brynica")
+
+
+def test_river_abbreviations(index: HydrologicalIndex) -> None:
+    """Test lookups by expanded lake names."""
+    assert index.stations_on_river("Jezioro Drużno") == index.stations_on_river(
+        "Jez. Drużno"
+    )
+    assert index.stations_on_river("Jezioro Drużno")
+    assert "Jezioro Drużno" in index.rivers
+
+
+def test_unknown_keys(index: HydrologicalIndex) -> None:
+    """Test unknown river and province."""
+    assert index.stations_on_river("Amazonka") == ()
+    assert index.stations_in_province("Bawaria") == ()
+    assert "-" not in index.provinces
+
+
+@pytest.mark.asyncio
+async def test_hydrological_stations_by_river_and_province(
+    hydrological_stations: list[dict[str, Any]],
+) -> None:
+    """Test river and province lookups of the instance."""
+    session = aiohttp.ClientSession()
+
+    imgwpib = await ImgwPib.create(session)
+
+    assert imgwpib.hydrological_stations_on_river("Odra") == ()
+    assert imgwpib.hydrological_stations_in_province("opolskie") == ()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+
+        await imgwpib.update_hydrological_stations()
+
+    await session.close()
+
+    assert len(imgwpib.hydrological_stations_on_river("Odra")) == 26
+    assert len(imgwpib.hydrological_stations_in_province("opolskie")) == 26
@@ -0,0 +1,50 @@
+"""Tests for lazy imports of imgw_pib."""
+
+import subprocess
+import sys
+from types import ModuleType
+
+import pytest
+
+import imgw_pib
+from imgw_pib import const
+
+LAZY_MODULES = ("aiofiles", "aiohttp", "orjson", "yarl", "zoneinfo")
+
+
+@pytest.mark.parametrize("module", ["imgw_pib", "imgw_pib.const"])
+def test_no_heavy_imports(module: str) -> None:
+    """Test importing the package does not import heavy dependencies."""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_client() -> None:
+    """Test the client is available from the package."""
+    from imgw_pib.client import ImgwPib  # noqa: PLC0415
+
+    assert imgw_pib.ImgwPib is ImgwPib
+
+
+def test_lazy_constants() -> None:
+    """Test endpoint URLs and the timeout are built on first access."""
+    assert str(const.API_HYDROLOGICAL_ENDPOINT) == (
+        "https://danepubliczne.imgw.pl/api/data/hydro"
+    )
+    assert const.API_HYDROLOGICAL_ENDPOINT is const.API_HYDROLOGICAL_ENDPOINT
+    assert const.TIMEOUT.total == 10
+
+
+@pytest.mark.parametrize("module", [imgw_pib, const])
+def test_unknown_attribute(module: ModuleType) -> None:
+    """Test accessing an unknown attribute raises AttributeError."""
+    with pytest.raises(AttributeError):
+        _ = module.unknown
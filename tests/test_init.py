@@ -1,15 +1,22 @@
 """Tests for imgw-pib package."""
 
+import asyncio
 import copy
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+from datetime import UTC, datetime, timedelta
 from http import HTTPStatus
+from pathlib import Path
 from typing import Any
+from unittest.mock import call, patch
 
 import aiohttp
 import pytest
 from aiointercept import aiointercept
+from freezegun import freeze_time
 from syrupy import SnapshotAssertion
 
-from imgw_pib import ImgwPib
+from imgw_pib import ImgwPib, SnapshotCache
 from imgw_pib.const import (
     API_HYDROLOGICAL_DETAILS_ENDPOINT,
     API_HYDROLOGICAL_ENDPOINT,
@@ -19,7 +26,17 @@ from imgw_pib.const import (
     API_WEATHER_WARNINGS_ENDPOINT,
 )
 from imgw_pib.exceptions import ApiError
-from imgw_pib.model import ApiNames
+from imgw_pib.freshness import FreshnessTracker
+from imgw_pib.instrumentation import create_trace_config
+from imgw_pib.metrics import MetricsRegistry
+from imgw_pib.model import (
+    ApiNames,
+    CacheStatus,
+    CadenceTier,
+    DataSource,
+    RequestInfo,
+)
+from imgw_pib.scheduler import CadencePolicy, PollingScheduler
 from imgw_pib.utils import decode_vegetation_phenomena
 
 pytestmark = pytest.mark.usefixtures("frozen_time")
@@ -611,7 +628,11 @@ async def test_hydrological_data_invalid_content(
         )
 
         imgwpib = await ImgwPib.create(session, hydrological_station_id="154190050")
-        with pytest.raises(ApiError) as exc_info:
+        # The payload of the station list is no longer reused
+        with (
+            freeze_time("2024-04-22 11:20:32+00:00"),
+            pytest.raises(ApiError) as exc_info,
+        ):
             await imgwpib.get_hydrological_data()
 
     await session.close()
@@ -639,7 +660,11 @@ async def test_no_hydrological_data(
         )
 
         imgwpib = await ImgwPib.create(session, hydrological_station_id="154190050")
-        with pytest.raises(ApiError) as exc_info:
+        # The payload of the station list is no longer reused
+        with (
+            freeze_time("2024-04-22 11:20:32+00:00"),
+            pytest.raises(ApiError) as exc_info,
+        ):
             await imgwpib.get_hydrological_data()
 
     await session.close()
@@ -874,3 +899,913 @@ async def test_vegetation_phenomena_not_current(
     assert result.floating_vegetation_cover.value is None
     assert result.emergent_vegetation_cover.value is None
     assert result.vegetation_phenomena_measurement_date is None
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_shared_by_grid_cell(
+    weather_station_proxy: dict[str, Any],
+) -> None:
+    """Test nearby locations share one upstream request and forecast object."""
+    session = aiohttp.ClientSession()
+
+    proxy_url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=52.225, lon=21.0)
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(proxy_url, payload=weather_station_proxy)
+
+        imgwpib = await ImgwPib.create(session)
+        first, second = await asyncio.gather(
+            imgwpib.get_forecast(52.2297, 21.0122),
+            imgwpib.get_forecast(52.2301, 20.9950),
+        )
+        third = await imgwpib.get_forecast(52.22, 21.004)
+
+    await session.close()
+
+    assert first is second is third
+    assert first.latitude == 52.225
+    assert first.longitude == 21.0
+    assert first.forecast_hourly == weather_station_proxy["hourly"]
+    assert first.forecast_twice_daily == weather_station_proxy["daily"]
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_shared_by_session(
+    weather_station_proxy: dict[str, Any],
+) -> None:
+    """Test forecasts are shared by the clients of a session only."""
+    sessions = [aiohttp.ClientSession(), aiohttp.ClientSession()]
+
+    proxy_url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=52.225, lon=21.0)
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(proxy_url, payload=weather_station_proxy, repeat=2)
+
+        clients = [
+            await ImgwPib.create(session) for session in (sessions[0], *sessions)
+        ]
+        forecasts = [await client.get_forecast(52.2297, 21.0122) for client in clients]
+
+    for session in sessions:
+        await session.close()
+
+    assert forecasts[0] is forecasts[1]
+    assert forecasts[2] is not forecasts[0]
+    assert forecasts[2] == forecasts[0]
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_grid_resolution(
+    weather_station_proxy: dict[str, Any],
+) -> None:
+    """Test the forecast grid resolution is configurable."""
+    session = aiohttp.ClientSession()
+
+    proxy_url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=52.2, lon=21.0)
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(proxy_url, payload=weather_station_proxy)
+
+        imgwpib = await ImgwPib.create(session, forecast_grid_resolution=0.1)
+        forecast = await imgwpib.get_forecast(52.2297, 21.0122)
+
+    await session.close()
+
+    assert forecast.latitude == 52.2
+    assert forecast.longitude == 21.0
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_invalid_payload() -> None:
+    """Test forecast with a payload missing forecast data."""
+    session = aiohttp.ClientSession()
+
+    proxy_url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=50.0, lon=20.0)
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(proxy_url, payload={"current": {}})
+
+        imgwpib = await ImgwPib.create(session)
+        with pytest.raises(ApiError) as exc_info:
+            await imgwpib.get_forecast(50.0, 20.0)
+
+    await session.close()
+
+    assert str(exc_info.value) == "No forecast data for location: 50.0, 20.0"
+
+
+@pytest.mark.asyncio
+async def test_subscribe(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test subscribe yields only stations whose data or alerts changed."""
+    session = aiohttp.ClientSession()
+
+    changed_stations = copy.deepcopy(hydrological_stations)
+    changed_stations[4][ApiNames.WATER_LEVEL] = "600"
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        for payload in (hydrological_stations, hydrological_stations, changed_stations):
+            session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=payload)
+            session_mock.get(
+                API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+            )
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=changed_stations)
+        session_mock.get(API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=[])
+
+        imgwpib = await ImgwPib.create(session, hydrological_details=False)
+        updates = []
+        with patch.object(
+            imgwpib,
+            "_parse_hydrological_data",
+            wraps=imgwpib._parse_hydrological_data,  # noqa: SLF001
+        ) as parse_mock:
+            subscription = imgwpib.subscribe(
+                ["154190050", "154180220", "abcd1234"], interval=timedelta()
+            )
+            async for update in subscription:
+                updates.append(update)
+                if len(updates) == 4:
+                    break
+            await subscription.aclose()
+
+    await session.close()
+
+    assert [update.station_id for update in updates] == [
+        "154180220",
+        "154190050",
+        "154180220",
+        "154190050",
+    ]
+    assert updates[2].water_level.value == 600.0
+    assert updates[1].hydrological_alert.value == "rapid_water_level_rise"
+    assert updates[3].hydrological_alert.value == "no_alert"
+    # Unchanged rows of the second cycle are not parsed
+    assert parse_mock.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_subscribe_survives_failed_refresh(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test a failed refresh backs off and the subscription continues."""
+    session = aiohttp.ClientSession()
+    scheduler = PollingScheduler(jitter=timedelta())
+    metrics = MetricsRegistry()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(
+            API_HYDROLOGICAL_ENDPOINT, status=HTTPStatus.INTERNAL_SERVER_ERROR.value
+        )
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(
+            session, hydrological_details=False, metrics=metrics
+        )
+        subscription = imgwpib.subscribe(["154190050"], scheduler=scheduler)
+        with patch("imgw_pib.scheduler.asyncio.sleep") as sleep_mock:
+            update = await anext(subscription)
+        await subscription.aclose()
+
+    await session.close()
+
+    assert update.station_id == "154190050"
+    assert update.fetched_at is not None
+    assert update.stale is False
+    sleep_mock.assert_called_once_with(120.0)
+    assert "imgw_pib_parse_duration_seconds_count" in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_with_cadence(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test subscribe sleeps until the cadence policy finds a station due."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(session, hydrological_details=False)
+        cadence = CadencePolicy()
+        subscription = imgwpib.subscribe(["154190050"], cadence=cadence)
+        update = await anext(subscription)
+        with (
+            patch(
+                "imgw_pib.client.asyncio.sleep", side_effect=asyncio.CancelledError
+            ) as sleep_mock,
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await anext(subscription)
+
+    await session.close()
+
+    assert cadence.tier(update.station_id) is CadenceTier.QUIET
+    sleep_mock.assert_called_once_with(60 * 60)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_cadence_observes_refreshed_stations(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test only stations refreshed in a cycle are observed by the cadence policy."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(
+            API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations, repeat=True
+        )
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts, repeat=True
+        )
+
+        imgwpib = await ImgwPib.create(session, hydrological_details=False)
+        cadence = CadencePolicy()
+        subscription = imgwpib.subscribe(["154190050", "151140030"], cadence=cadence)
+        await anext(subscription)
+        await anext(subscription)
+        with (
+            patch.object(cadence, "observe", wraps=cadence.observe) as observe_mock,
+            patch(
+                "imgw_pib.client.asyncio.sleep",
+                side_effect=[None, asyncio.CancelledError],
+            ) as sleep_mock,
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await anext(subscription)
+
+    await session.close()
+
+    # The second snapshot finds no station due
+    assert observe_mock.call_count == 2
+    assert sleep_mock.call_args_list == [call(60 * 60), call(60 * 60)]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_cadence_station_without_data(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test a station without a current reading does not keep the loop busy."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(session, hydrological_details=False)
+        cadence = CadencePolicy()
+        subscription = imgwpib.subscribe(["154190050", "152150270"], cadence=cadence)
+        await anext(subscription)
+        with (
+            patch(
+                "imgw_pib.client.asyncio.sleep", side_effect=asyncio.CancelledError
+            ) as sleep_mock,
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await anext(subscription)
+
+    await session.close()
+
+    assert cadence.tier("152150270") is CadenceTier.QUIET
+    sleep_mock.assert_called_once_with(60 * 60)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_cadence_alert_change_while_not_due(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test an alert change while a station is not due is yielded once it is."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(
+            API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations, repeat=True
+        )
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+        session_mock.get(API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=[], repeat=2)
+
+        imgwpib = await ImgwPib.create(session, hydrological_details=False)
+        subscription = imgwpib.subscribe(["154190050"], cadence=CadencePolicy())
+
+        with freeze_time("2024-04-22 11:10:32+00:00") as frozen:
+            first = await anext(subscription)
+
+            # The alert is cleared before the quiet station is due again
+            ticks = iter((timedelta(minutes=5), timedelta(hours=1)))
+            with patch(
+                "imgw_pib.client.asyncio.sleep",
+                side_effect=lambda _: frozen.tick(next(ticks)),
+            ) as sleep_mock:
+                second = await anext(subscription)
+            await subscription.aclose()
+
+    await session.close()
+
+    assert first.hydrological_alert.value == "rapid_water_level_rise"
+    assert second.hydrological_alert.value == "no_alert"
+    assert sleep_mock.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_hydrological_row_not_parsed_again(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test an unchanged row reuses the cached data until it becomes stale."""
+    session = aiohttp.ClientSession()
+
+    changed_stations = copy.deepcopy(hydrological_stations)
+    changed_stations[5][ApiNames.WATER_TEMPERATURE] = "16.1"
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        # The first two calls reuse the payload of the station list
+        for payload in (
+            hydrological_stations,
+            hydrological_stations,
+            changed_stations,
+            changed_stations,
+        ):
+            session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=payload)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts, repeat=4
+        )
+        session_mock.get(API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=[])
+
+        imgwpib = await ImgwPib.create(
+            session, hydrological_station_id="154190050", hydrological_details=False
+        )
+        first = await imgwpib.get_hydrological_data()
+        second = await imgwpib.get_hydrological_data()
+
+        # Ice phenomena measured at 2024-04-22 11:00 is current for two days
+        with freeze_time("2024-04-24 12:00:00+00:00"):
+            third = await imgwpib.get_hydrological_data()
+            fourth = await imgwpib.get_hydrological_data()
+            fifth = await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+    # Every call gets its own copy with the fetch details of the cached data
+    assert second is not first
+    assert second.water_level is first.water_level
+    assert third.water_level is not first.water_level
+    assert first.ice_phenomena.value == 30.0
+    assert third.ice_phenomena.value is None
+    assert fourth is not third
+    assert fourth.water_temperature.value == 16.1
+    assert fifth.water_temperature is fourth.water_temperature
+    assert fifth.hydrological_alert.value == "no_alert"
+    assert fourth.hydrological_alert.value == "rapid_water_level_rise"
+
+
+@pytest.mark.asyncio
+async def test_hydrological_alert_evaluated_once(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test alerts are matched again only when they or their time window change."""
+    session = aiohttp.ClientSession()
+    metrics = MetricsRegistry()
+    imgwpib = ImgwPib(session, metrics=metrics)
+    row = next(
+        station
+        for station in hydrological_stations
+        if station[ApiNames.STATION_ID] == "154190050"
+    )
+
+    with patch.object(
+        imgwpib,
+        "_evaluate_hydrological_alert",
+        wraps=imgwpib._evaluate_hydrological_alert,  # noqa: SLF001
+    ) as evaluate_mock:
+        imgwpib._update_hydrological_alerts(hydrological_alerts)  # noqa: SLF001
+        first = imgwpib._get_hydrological_alert(row, hydrological_alerts)  # noqa: SLF001
+        # Equal alerts of another fetch keep the evaluated alerts
+        alerts = copy.deepcopy(hydrological_alerts)
+        imgwpib._update_hydrological_alerts(alerts)  # noqa: SLF001
+        second = imgwpib._get_hydrological_alert(row, alerts)  # noqa: SLF001
+        assert evaluate_mock.call_count == 1
+
+        # The alert is valid until 2024-08-04 01:00 Warsaw time
+        with freeze_time("2024-08-04 00:00:00+00:00"):
+            third = imgwpib._get_hydrological_alert(row, hydrological_alerts)  # noqa: SLF001
+        assert evaluate_mock.call_count == 2
+
+        imgwpib._update_hydrological_alerts([])  # noqa: SLF001
+        fourth = imgwpib._get_hydrological_alert(row, [])  # noqa: SLF001
+        assert evaluate_mock.call_count == 3
+
+    await session.close()
+
+    assert first.value == second.value == "rapid_water_level_rise"
+    assert third.value == fourth.value == "no_alert"
+    # The alerts are indexed again only when the fetched alerts change
+    assert metrics.index_rebuilds.value("hydrological_alerts") == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test the last result is returned at once and refreshed in the background."""
+    session = aiohttp.ClientSession()
+
+    changed_stations = copy.deepcopy(hydrological_stations)
+    changed_stations[4][ApiNames.WATER_LEVEL] = "600"
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        # The first call reuses the payload of the station list
+        for payload in (hydrological_stations, changed_stations):
+            session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=payload)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts, repeat=2
+        )
+
+        imgwpib = await ImgwPib.create(
+            session,
+            hydrological_station_id="154180220",
+            hydrological_details=False,
+            max_stale_age=timedelta(minutes=10),
+        )
+        first = await imgwpib.get_hydrological_data()
+
+        # A result younger than half the publication interval is not refreshed
+        with freeze_time("2024-04-22 11:14:32+00:00"):
+            assert await imgwpib.get_hydrological_data() is first
+            assert not imgwpib._refresh_tasks  # noqa: SLF001
+
+        with freeze_time("2024-04-22 11:16:32+00:00"):
+            second = await imgwpib.get_hydrological_data()
+            await asyncio.wait(set(imgwpib._refresh_tasks.values()))  # noqa: SLF001
+            third = await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+    assert second is first
+    assert first.age == timedelta()
+    assert first.water_level.value == 558.0
+    assert third.water_level.value == 600.0
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_max_age(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test a result older than the max age waits for the refresh."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+        session_mock.get(
+            API_HYDROLOGICAL_ENDPOINT, status=HTTPStatus.INTERNAL_SERVER_ERROR.value
+        )
+
+        imgwpib = await ImgwPib.create(
+            session,
+            hydrological_station_id="154180220",
+            hydrological_details=False,
+            max_stale_age=timedelta(minutes=10),
+        )
+        await imgwpib.get_hydrological_data()
+
+        with (
+            freeze_time("2024-04-22 11:30:32+00:00"),
+            pytest.raises(ApiError, match="Invalid response: 500"),
+        ):
+            await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("failure", "read_error"),
+    [
+        ({"exception": True}, None),
+        ({"status": HTTPStatus.INTERNAL_SERVER_ERROR.value}, None),
+        ({"payload": []}, aiohttp.ClientPayloadError("Payload is not completed")),
+        ({"payload": []}, TimeoutError()),
+    ],
+    ids=["unreachable", "server_error", "payload_error", "read_timeout"],
+)
+async def test_snapshot_cache_when_upstream_unreachable(
+    tmp_path: Path,
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+    failure: dict[str, Any],
+    read_error: Exception | None,
+) -> None:
+    """Test the last good responses are served when upstream fails."""
+    session = aiohttp.ClientSession()
+    snapshot_cache = SnapshotCache(tmp_path)
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(
+            session,
+            hydrological_station_id="154190050",
+            hydrological_details=False,
+            snapshot_cache=snapshot_cache,
+        )
+        fresh_data = await imgwpib.get_hydrological_data()
+        await snapshot_cache.flush()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, **failure, repeat=2)
+        session_mock.get(API_HYDROLOGICAL_WARNINGS_ENDPOINT, **failure)
+
+        with (
+            freeze_time("2024-04-22 12:10:32+00:00"),
+            patch.object(
+                ImgwPib,
+                "_read_payload",
+                side_effect=read_error,
+                autospec=True,
+            )
+            if read_error is not None
+            else nullcontext(),
+        ):
+            imgwpib = await ImgwPib.create(
+                session,
+                hydrological_station_id="154190050",
+                hydrological_details=False,
+                snapshot_cache=SnapshotCache(tmp_path),
+            )
+            stale_data = await imgwpib.get_hydrological_data()
+
+            assert stale_data.age == timedelta(hours=1)
+
+    await session.close()
+
+    assert not fresh_data.stale
+    assert stale_data.stale
+    assert stale_data == fresh_data
+
+
+@pytest.mark.asyncio
+async def test_lazy_validation_weather_station_proxy(
+    weather_station_proxy: dict[str, Any],
+    weather_alerts: list[dict[str, Any]],
+) -> None:
+    """Test proxy data takes the station name from the bundled metadata."""
+    session = aiohttp.ClientSession()
+
+    proxy_url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=49.821877, lon=19.047007)
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_WEATHER_WARNINGS_ENDPOINT, payload=weather_alerts)
+        session_mock.get(proxy_url, payload=weather_station_proxy)
+
+        imgwpib = await ImgwPib.create(
+            session, weather_station_id="12600", lazy_validation=True
+        )
+        weather_data = await imgwpib.get_weather_data()
+
+    await session.close()
+
+    assert weather_data.proxy_used
+    assert weather_data.station == "Bielsko-Biała"
+    assert weather_data.station_id == "12600"
+    assert imgwpib.weather_stations == {}
+
+
+@pytest.mark.asyncio
+async def test_lazy_validation_weather_station(
+    weather_station: dict[str, Any],
+    weather_alerts: list[dict[str, Any]],
+) -> None:
+    """Test the weather station list is not downloaded with lazy validation."""
+    session = aiohttp.ClientSession()
+
+    proxy_url = API_WEATHER_PROXY_ENDPOINT.with_query(lat=49.821877, lon=19.047007)
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_WEATHER_WARNINGS_ENDPOINT, payload=weather_alerts)
+        session_mock.get(proxy_url, status=HTTPStatus.NOT_FOUND.value)
+        session_mock.get(f"{API_WEATHER_ENDPOINT}/id/12600", payload=weather_station)
+
+        imgwpib = await ImgwPib.create(
+            session, weather_station_id="12600", lazy_validation=True
+        )
+        weather_data = await imgwpib.get_weather_data()
+
+    await session.close()
+
+    assert weather_data.station_id == "12600"
+    assert imgwpib.weather_stations == {}
+
+
+@pytest.mark.asyncio
+async def test_lazy_validation_wrong_weather_station_id(
+    weather_stations: list[dict[str, Any]],
+) -> None:
+    """Test wrong weather station ID with lazy validation."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(
+            f"{API_WEATHER_ENDPOINT}/id/abcd1234", status=HTTPStatus.NOT_FOUND.value
+        )
+        session_mock.get(API_WEATHER_ENDPOINT, payload=weather_stations)
+
+        imgwpib = await ImgwPib.create(
+            session, weather_station_id="abcd1234", lazy_validation=True
+        )
+
+        with pytest.raises(ApiError) as exc_info:
+            await imgwpib.get_weather_data()
+
+    await session.close()
+
+    assert str(exc_info.value) == "Invalid weather station ID: abcd1234"
+
+
+@pytest.mark.asyncio
+async def test_lazy_validation_hydrological_station(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_details: dict[str, Any],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test the first data fetch validates the hydrological station ID."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_DETAILS_ENDPOINT.with_query(id="154190050"),
+            payload=hydrological_details,
+        )
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(
+            session, hydrological_station_id="154190050", lazy_validation=True
+        )
+        hydrological_data = await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+    assert hydrological_data.station_id == "154190050"
+    assert hydrological_data.flood_warning_level.value == 590.0
+
+
+@pytest.mark.asyncio
+async def test_lazy_validation_wrong_hydrological_station_id(
+    hydrological_stations: list[dict[str, Any]],
+) -> None:
+    """Test wrong hydrological station ID with lazy validation."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+
+        imgwpib = await ImgwPib.create(
+            session, hydrological_station_id="abcd1234", lazy_validation=True
+        )
+
+        with pytest.raises(ApiError) as exc_info:
+            await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+    assert str(exc_info.value) == "Invalid hydrological station ID: abcd1234"
+
+
+@pytest.mark.asyncio
+async def test_hydrological_payload_reused(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test the first data call reuses the payload of the station list."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(
+            session, hydrological_station_id="154190050", hydrological_details=False
+        )
+        with freeze_time("2024-04-22 11:14:32+00:00"):
+            hydrological_data = await imgwpib.get_hydrological_data()
+
+            # The data is as old as the reused payload
+            assert hydrological_data.age == timedelta(minutes=4)
+
+        requests = [str(url) for _, url in session_mock.requests]
+
+    await session.close()
+
+    assert hydrological_data.station_id == "154190050"
+    assert hydrological_data.fetched_at == datetime(2024, 4, 22, 11, 10, 32, tzinfo=UTC)
+    assert not hydrological_data.stale
+    assert requests.count(str(API_HYDROLOGICAL_ENDPOINT)) == 1
+
+
+@pytest.mark.asyncio
+async def test_station_lists_shared(
+    hydrological_stations: list[dict[str, Any]],
+    weather_stations: list[dict[str, Any]],
+) -> None:
+    """Test clients of a session share station lists built from the same payload."""
+    session = aiohttp.ClientSession()
+    metrics = MetricsRegistry()
+    changed_stations = copy.deepcopy(hydrological_stations)
+    changed_stations[0]["stacja"] = "Nowa"
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=changed_stations)
+        session_mock.get(API_WEATHER_ENDPOINT, payload=weather_stations, repeat=2)
+
+        clients = [
+            await ImgwPib.create(
+                session,
+                hydrological_station_id=station_id,
+                hydrological_details=False,
+                metrics=metrics,
+            )
+            for station_id in ("154190050", "151140030")
+        ]
+        weather_clients = [
+            await ImgwPib.create(session, weather_station_id="12295") for _ in range(2)
+        ]
+        changed = await ImgwPib.create(
+            session, hydrological_station_id="154190050", hydrological_details=False
+        )
+
+    await session.close()
+
+    assert (
+        clients[0]._hydrological_station_list  # noqa: SLF001
+        is clients[1]._hydrological_station_list  # noqa: SLF001
+    )
+    assert (
+        weather_clients[0]._weather_station_list  # noqa: SLF001
+        is weather_clients[1]._weather_station_list  # noqa: SLF001
+    )
+    assert metrics.index_rebuilds.value("hydrological") == 1
+    assert (
+        changed._hydrological_station_list  # noqa: SLF001
+        is not clients[0]._hydrological_station_list  # noqa: SLF001
+    )
+    assert len(changed.hydrological_stations) == len(clients[0].hydrological_stations)
+    # Clients get a read-only view of the shared station list
+    assert not isinstance(clients[0].hydrological_stations, MutableMapping)
+    assert not isinstance(weather_clients[0].weather_stations, MutableMapping)
+    assert clients[1].hydrological_stations["151140030"] == "Skroda (Przewoźniki)"
+    # Only the rows of the client's station are kept for reuse
+    assert clients[1]._hydrological_payload is not None  # noqa: SLF001
+    assert [
+        row["id_stacji"]
+        for row in clients[1]._hydrological_payload[1]  # noqa: SLF001
+    ] == ["151140030"]
+
+
+@pytest.mark.asyncio
+async def test_request_hooks(
+    hydrological_stations: list[dict[str, Any]],
+) -> None:
+    """Test request hooks get the details of every API request."""
+    session = aiohttp.ClientSession(trace_configs=[create_trace_config()])
+    infos: list[RequestInfo] = []
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_ENDPOINT, status=HTTPStatus.INTERNAL_SERVER_ERROR.value
+        )
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+
+        imgwpib = ImgwPib(
+            session, hydrological_station_id="154190050", hydrological_details=False
+        )
+        remove_hook = imgwpib.add_request_hook(infos.append)
+        await imgwpib.initialize()
+
+        with freeze_time("2024-04-22 11:20:32+00:00"):
+            with pytest.raises(ApiError):
+                await imgwpib.get_hydrological_data()
+
+            remove_hook()
+            await imgwpib.update_hydrological_stations()
+
+    await session.close()
+
+    assert [info.source for info in infos] == [
+        DataSource.HYDROLOGICAL,
+        DataSource.HYDROLOGICAL,
+    ]
+    assert infos[0].status == 200
+    assert infos[0].cache_status is CacheStatus.NETWORK
+    assert infos[0].size
+    assert infos[0].queue is not None
+    assert infos[0].connect is not None
+    assert infos[0].ttfb is not None
+    assert infos[0].transfer is not None
+    assert infos[0].decode is not None
+    assert infos[0].error is None
+    assert infos[1].status == 500
+    assert infos[1].error == "ApiError('Invalid response: 500')"
+
+
+@pytest.mark.asyncio
+async def test_metrics(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test requests, parsing, index rebuilds and data age are recorded."""
+    session = aiohttp.ClientSession()
+    metrics = MetricsRegistry()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(
+            session,
+            hydrological_station_id="154190050",
+            hydrological_details=False,
+            metrics=metrics,
+        )
+        await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+    assert metrics.requests.value("hydrological", "200") == 1
+    assert metrics.requests.value("hydrological_alerts", "200") == 1
+    assert metrics.index_rebuilds.value("hydrological") == 1
+    assert metrics.parse_duration.count("hydrological") == 1
+    assert metrics.data_age.count("hydrological") == 1
+    assert "imgw_pib_data_age_seconds_sum" in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_freshness(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test the lag of measurements too old to be returned is recorded."""
+    session = aiohttp.ClientSession()
+    freshness = FreshnessTracker()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(
+            session,
+            hydrological_station_id="154190050",
+            hydrological_details=False,
+            freshness=freshness,
+        )
+        hydrological_data = await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+    assert hydrological_data.water_flow_measurement_date is None
+    assert sorted(freshness.sensors()) == [
+        ("154190050", "ice_phenomena"),
+        ("154190050", "vegetation_phenomena"),
+        ("154190050", "water_level"),
+        ("154190050", "water_temperature"),
+    ]
+    assert freshness.percentiles("154190050", "ice_phenomena") == {
+        0.5: timedelta(hours=2, minutes=10, seconds=32),
+        0.9: timedelta(hours=2, minutes=10, seconds=32),
+        0.99: timedelta(hours=2, minutes=10, seconds=32),
+    }
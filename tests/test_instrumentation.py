@@ -0,0 +1,48 @@
+"""Tests for imgw_pib.instrumentation module."""
+
+import pytest
+
+from imgw_pib.instrumentation import RequestTrace
+from imgw_pib.model import CacheStatus, DataSource
+
+
+def test_request_trace_new_connection() -> None:
+    """Test timings of a request opening a new connection."""
+    trace = RequestTrace(
+        created=1.0,
+        start=1.5,
+        connect_start=1.5,
+        dns_start=1.5,
+        dns_end=1.6,
+        connect_end=1.75,
+        response_start=2.0,
+        body_end=2.5,
+        decode=0.1,
+        status=200,
+        size=1024,
+    )
+
+    assert trace.dns == pytest.approx(0.1)
+    assert trace.connect == pytest.approx(0.15)
+    assert trace.ttfb == pytest.approx(0.25)
+    assert trace.transfer == pytest.approx(0.5)
+
+    info = trace.request_info(DataSource.HYDROLOGICAL, "https://example.com", None)
+
+    assert info.source is DataSource.HYDROLOGICAL
+    assert info.status == 200
+    assert info.size == 1024
+    assert info.queue == pytest.approx(0.5)
+    assert info.cache_status is CacheStatus.NETWORK
+    assert info.decode == 0.1
+    assert info.total > 0
+
+
+def test_request_trace_reused_connection() -> None:
+    """Test timings of a request on a kept-alive connection."""
+    trace = RequestTrace(created=1.0, start=1.0, response_start=1.25)
+
+    assert trace.dns is None
+    assert trace.connect is None
+    assert trace.ttfb == 0.25
+    assert trace.transfer is None
@@ -0,0 +1,64 @@
+"""Tests for imgw_pib.metrics module."""
+
+from imgw_pib.metrics import Histogram, MetricsRegistry
+from imgw_pib.model import DataSource, RequestInfo
+
+
+def test_render_counter() -> None:
+    """Test a counter in the Prometheus text format."""
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter.", ("name",))
+
+    counter.inc('a"b\\c')
+    counter.inc("x", amount=2)
+
+    assert counter.value("x") == 2.0
+    assert (
+        "# HELP test_total Test counter.\n"
+        "# TYPE test_total counter\n"
+        'test_total{name="a\\"b\\\\c"} 1.0\n'
+        'test_total{name="x"} 2.0\n'
+    ) in registry.render()
+
+
+def test_render_histogram() -> None:
+    """Test a histogram in the Prometheus text format."""
+    histogram = Histogram("test_seconds", "Test histogram.", (1.0, 0.5))
+
+    for value in (0.25, 0.5, 0.75, 2.0):
+        histogram.observe(value)
+
+    assert histogram.count() == 4
+    assert list(histogram.samples()) == [
+        ("test_seconds_bucket", {"le": "0.5"}, 2),
+        ("test_seconds_bucket", {"le": "1.0"}, 3),
+        ("test_seconds_bucket", {"le": "+Inf"}, 4),
+        ("test_seconds_sum", {}, 3.5),
+        ("test_seconds_count", {}, 4),
+    ]
+
+
+def test_observe_request() -> None:
+    """Test requests and failed requests are counted."""
+    registry = MetricsRegistry()
+
+    registry.observe_request(
+        RequestInfo(source=DataSource.WEATHER, url="", status=200, total=0.2)
+    )
+    registry.observe_request(
+        RequestInfo(source=DataSource.WEATHER, url="", status=404, total=0.1)
+    )
+    registry.observe_request(
+        RequestInfo(source=None, url="", error="TimeoutError()", total=10.0)
+    )
+
+    assert registry.requests.value("weather", "200") == 1
+    assert registry.requests.value("weather", "404") == 1
+    assert registry.requests.value("unknown", "none") == 1
+    assert registry.request_errors.value("weather") == 1
+    assert registry.request_errors.value("unknown") == 1
+    assert registry.request_duration.count("weather") == 2
+    assert (
+        'imgw_pib_request_duration_seconds_bucket{source="weather",le="0.25"} 2'
+        in registry.render()
+    )
@@ -0,0 +1,116 @@
+"""Tests for imgw_pib.ratelimit module."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from imgw_pib.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_token_bucket_burst_and_refill() -> None:
+    """Test the burst is admitted at once and tokens refill at the rate."""
+    clock = FakeClock()
+    bucket = TokenBucket(2.0, 3, clock)
+
+    for _ in range(3):
+        assert bucket._reserve() == 0  # noqa: SLF001
+
+    assert bucket._reserve() == 0.5  # noqa: SLF001
+
+    clock.now = 10.0
+    # Refill is capped at the burst size
+    for _ in range(3):
+        assert bucket._reserve() == 0  # noqa: SLF001
+    assert bucket._reserve() == 0.5  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_fifo() -> None:
+    """Test waiting requests are admitted in arrival order."""
+    bucket = TokenBucket(100.0, 1)
+    admitted = []
+
+    async def request(number: int) -> None:
+        await bucket.acquire()
+        admitted.append(number)
+
+    tasks = [asyncio.create_task(request(number)) for number in range(4)]
+    await asyncio.sleep(0)
+
+    assert bucket.queue_depth == 3
+
+    await asyncio.gather(*tasks)
+
+    assert admitted == [0, 1, 2, 3]
+    assert bucket.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_cancelled_request() -> None:
+    """Test a cancelled request gives back its reserved token."""
+    clock = FakeClock()
+    bucket = TokenBucket(2.0, 1, clock)
+
+    await bucket.acquire()
+    task = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert bucket.queue_depth == 0
+    assert bucket._reserve() == 0.5  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_shared_per_session() -> None:
+    """Test clients of one session share the rate limiter."""
+    session = aiohttp.ClientSession()
+    other_session = aiohttp.ClientSession()
+
+    limiter = RateLimiter.for_session(session)
+
+    assert RateLimiter.for_session(session) is limiter
+    assert RateLimiter.for_session(other_session) is not limiter
+
+    await session.close()
+    await other_session.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_per_host() -> None:
+    """Test limits are applied per host and can be configured."""
+    limiter = RateLimiter({"a.example": (100.0, 1)})
+    limiter.configure("b.example", 100.0, 1)
+
+    await limiter.acquire("a.example")
+    await limiter.acquire("b.example")
+    # Hosts without a limit are not queued
+    await limiter.acquire("c.example")
+    await limiter.acquire(None)
+
+    task = asyncio.create_task(limiter.acquire("a.example"))
+    await asyncio.sleep(0)
+
+    assert limiter.queue_depth("a.example") == 1
+    assert limiter.queue_depth("b.example") == 0
+    assert limiter.queue_depth("c.example") == 0
+    assert limiter.queue_depth() == 1
+
+    await task
+
+    assert limiter.queue_depth() == 0
@@ -0,0 +1,243 @@
+"""Tests for imgw_pib.scheduler module."""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from imgw_pib.model import (
+    Alert,
+    CadenceTier,
+    DataSource,
+    ForecastData,
+    HydrologicalData,
+    SensorData,
+)
+from imgw_pib.scheduler import CadencePolicy, PollingScheduler
+
+T0 = datetime(2024, 4, 22, 10, 0, tzinfo=UTC)
+
+
+def hydrological_data(
+    measurement_date: datetime,
+    alert_from: datetime | None = None,
+    *,
+    water_level: float = 100.0,
+    station_id: str = "150190340",
+    flood_warning_level: float | None = None,
+    alert_level: str | None = None,
+) -> HydrologicalData:
+    """Return hydrological data measured at the given time."""
+    sensor = SensorData(name="Sensor")
+    return HydrologicalData(
+        water_level=SensorData(name="Water Level", value=water_level, unit="cm"),
+        water_level_measurement_date=measurement_date,
+        water_temperature=sensor,
+        water_temperature_measurement_date=None,
+        water_flow=sensor,
+        water_flow_measurement_date=None,
+        ice_phenomena=sensor,
+        ice_phenomena_measurement_date=None,
+        submerged_vegetation_cover=sensor,
+        floating_vegetation_cover=sensor,
+        emergent_vegetation_cover=sensor,
+        vegetation_phenomena_measurement_date=None,
+        flood_alarm_level=sensor,
+        flood_warning_level=SensorData(
+            name="Flood Warning Level", value=flood_warning_level, unit="cm"
+        ),
+        river="Wisła",
+        station_id=station_id,
+        station="Kraków-Bielany",
+        hydrological_alert=Alert(
+            value="no_alert", valid_from=alert_from, level=alert_level
+        ),
+    )
+
+
+def test_first_poll_is_immediate() -> None:
+    """Test a source without history is polled at once."""
+    scheduler = PollingScheduler(jitter=timedelta())
+
+    assert scheduler.next_poll(DataSource.WEATHER, T0) == T0
+    assert scheduler.delay(DataSource.WEATHER, T0) == 0
+
+
+def test_next_poll_after_publication() -> None:
+    """Test the next poll is expected after the interval and default lag."""
+    scheduler = PollingScheduler(jitter=timedelta())
+
+    assert scheduler.record(DataSource.WEATHER, T0, T0 + timedelta(minutes=40))
+
+    assert scheduler.next_poll(DataSource.WEATHER, T0) == T0 + timedelta(minutes=90)
+
+
+def test_backoff_when_unchanged() -> None:
+    """Test the retry delay doubles while nothing changes."""
+    scheduler = PollingScheduler(
+        jitter=timedelta(),
+        retry_interval=timedelta(minutes=1),
+        max_backoff=timedelta(minutes=3),
+    )
+    source = DataSource.HYDROLOGICAL
+    poll = T0 + timedelta(minutes=30)
+    scheduler.record(source, T0, T0 + timedelta(minutes=5))
+
+    delays = []
+    for _ in range(4):
+        assert not scheduler.record(source, T0, poll)
+        next_poll = scheduler.next_poll(source, poll)
+        delays.append(next_poll - poll)
+        poll = next_poll
+
+    assert delays == [timedelta(minutes=minutes) for minutes in (1, 2, 3, 3)]
+
+
+def test_learned_publication_lag() -> None:
+    """Test the publication lag is learned from observed updates."""
+    scheduler = PollingScheduler(jitter=timedelta())
+    source = DataSource.HYDROLOGICAL
+
+    assert scheduler.publication_lag(source) == timedelta(minutes=20)
+
+    for step in range(3):
+        measurement = T0 + step * timedelta(minutes=10)
+        scheduler.record(source, measurement - timedelta(minutes=10), measurement)
+        scheduler.record(source, measurement, measurement + timedelta(minutes=4))
+
+    assert scheduler.publication_lag(source) == timedelta(minutes=2)
+    assert scheduler.next_poll(source, T0) == T0 + timedelta(minutes=32)
+
+
+def test_unscheduled_source() -> None:
+    """Test sources without publication interval are polled on retry interval."""
+    scheduler = PollingScheduler(jitter=timedelta())
+    source = DataSource.WEATHER_ALERTS
+
+    assert not scheduler.record(source, None, T0)
+    assert scheduler.next_poll(source, T0) == T0 + timedelta(minutes=2)
+
+
+def test_jitter() -> None:
+    """Test jitter delays polls by a bounded random amount."""
+    rng = random.Random(1)  # noqa: S311
+    scheduler = PollingScheduler(jitter=timedelta(seconds=30), rng=rng)
+    scheduler.record(DataSource.WEATHER, T0, T0)
+
+    delays = {scheduler.delay(DataSource.WEATHER, T0) for _ in range(10)}
+
+    assert len(delays) > 1
+    assert all(90 * 60 <= delay <= 90 * 60 + 30 for delay in delays)
+
+
+def test_observe() -> None:
+    """Test observing data returned by the client."""
+    scheduler = PollingScheduler(jitter=timedelta())
+
+    assert scheduler.observe(hydrological_data(T0), T0)
+    assert not scheduler.observe(hydrological_data(T0), T0 + timedelta(minutes=5))
+    assert scheduler.observe(
+        hydrological_data(T0, alert_from=T0), T0 + timedelta(minutes=6)
+    )
+    assert not scheduler.observe(
+        ForecastData(
+            latitude=52.0, longitude=21.0, forecast_hourly=[], forecast_twice_daily=[]
+        ),
+        T0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_wait() -> None:
+    """Test waiting for a source without history returns at once."""
+    scheduler = PollingScheduler()
+
+    await scheduler.wait(DataSource.HYDROLOGICAL)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({}, CadenceTier.QUIET),
+        ({"alert_level": "yellow"}, CadenceTier.QUIET),
+        ({"flood_warning_level": 90.0}, CadenceTier.CRITICAL),
+        ({"alert_level": "orange"}, CadenceTier.CRITICAL),
+        ({"alert_level": "red"}, CadenceTier.CRITICAL),
+    ],
+)
+def test_cadence_tier(kwargs: dict, expected: CadenceTier) -> None:
+    """Test the cadence tier follows flood and alert state."""
+    policy = CadencePolicy()
+
+    assert policy.observe(hydrological_data(T0, **kwargs), T0) is expected
+    assert policy.tier("150190340") is expected
+
+
+def test_cadence_rate_of_rise() -> None:
+    """Test a rapidly rising station is refreshed more often."""
+    policy = CadencePolicy(rapid_rise=5.0)
+
+    assert policy.observe(hydrological_data(T0), T0) is CadenceTier.QUIET
+    assert policy.interval("150190340") == timedelta(hours=1)
+
+    later = T0 + timedelta(hours=1)
+    data = hydrological_data(later, water_level=106.0)
+    assert policy.observe(data, later) is CadenceTier.ELEVATED
+    assert policy.interval("150190340") == timedelta(minutes=20)
+    assert policy.next_refresh("150190340") == later + timedelta(minutes=20)
+
+    # The same measurement keeps the last rate of rise
+    assert policy.observe(data, later) is CadenceTier.ELEVATED
+
+    latest = later + timedelta(minutes=30)
+    data = hydrological_data(latest, water_level=112.0)
+    assert policy.observe(data, latest) is CadenceTier.CRITICAL
+    assert policy.interval("150190340") == timedelta(minutes=10)
+
+
+def test_cadence_request_budget() -> None:
+    """Test snapshot requests are spaced within the budget."""
+    policy = CadencePolicy(budget=4.0)
+
+    policy.observe(hydrological_data(T0, station_id="1", alert_level="red"), T0)
+    for station_id in ("2", "3", "4", "5"):
+        policy.observe(hydrological_data(T0, station_id=station_id), T0)
+
+    # One snapshot refreshes all stations, their number does not stretch intervals
+    assert policy.interval("1") == timedelta(minutes=10)
+    assert policy.interval("2") == timedelta(hours=1)
+    assert policy.delay(["1", "6"], T0) == 0
+
+    policy.record_fetch(T0)
+
+    assert policy.delay(["1"], T0) == 15 * 60
+    assert policy.delay(["1", "6"], T0) == 15 * 60
+    assert policy.delay(["2"], T0) == 60 * 60
+
+
+def test_cadence_record_attempt() -> None:
+    """Test a station without current data is backed off to the quiet tier."""
+    policy = CadencePolicy()
+
+    policy.observe(hydrological_data(T0, station_id="1", alert_level="red"), T0)
+    policy.record_attempt("1", T0)
+    policy.record_attempt("2", T0)
+
+    assert policy.tier("1") is CadenceTier.QUIET
+    assert policy.tier("2") is CadenceTier.QUIET
+    assert policy.due(["1", "2"], T0 + timedelta(minutes=30)) == []
+    assert policy.delay(["1", "2"], T0) == 60 * 60
+
+
+def test_cadence_due() -> None:
+    """Test stations due for a refresh."""
+    policy = CadencePolicy()
+
+    policy.observe(hydrological_data(T0, station_id="1", alert_level="red"), T0)
+    policy.observe(hydrological_data(T0, station_id="2"), T0)
+
+    now = T0 + timedelta(minutes=15)
+    assert policy.due(["1", "2", "3"], now) == ["1", "3"]
+    assert policy.delay(["1", "2"], T0) == 600
+    assert policy.delay(["2"], now) == 45 * 60
+    assert policy.delay(["2", "3"], now) == 0
@@ -0,0 +1,126 @@
+"""Tests for imgw_pib.search module."""
+
+from typing import Any
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+
+from imgw_pib import ImgwPib
+from imgw_pib.const import API_HYDROLOGICAL_ENDPOINT, API_WEATHER_ENDPOINT
+from imgw_pib.model import StationKind
+from imgw_pib.search import StationSearchIndex, tokenize
+from imgw_pib.utils import fold_diacritics
+
+WEATHER_STATIONS = {
+    "12375": "Warszawa",
+    "12465": "Łódź",
+    "12566": "Kraków",
+    "12295": "Białystok",
+    "12600": "Bielsko Biała",
+}
+HYDROLOGICAL_STATIONS = {
+    "149180010": "Odra (Krzyżanowice)",
+    "149180080": "Wisła (Drogomyśl)",
+    "150190340": "Wisła (Kraków - Bielany)",
+    "149200120": "Biały Dunajec (Szaflary)",
+}
+
+
+@pytest.fixture
+def index() -> StationSearchIndex:
+    """Return a search index of sample stations."""
+    return StationSearchIndex(WEATHER_STATIONS, HYDROLOGICAL_STATIONS)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [("Łódź", "lodz"), ("Zakopane", "zakopane"), ("ŚWINOUJŚCIE", "swinoujscie")],
+)
+def test_fold_diacritics(text: str, expected: str) -> None:
+    """Test folding Polish diacritics."""
+    assert fold_diacritics(text) == expected
+
+
+def test_tokenize() -> None:
+    """Test tokenizing a hydrological station name."""
+    assert tokenize("Wisła (Kraków - Bielany)") == ["wisla", "krakow", "bielany"]
+
+
+def test_search_prefix(index: StationSearchIndex) -> None:
+    """Test prefix search ranks exact token matches first."""
+    result = index.search("wis", fuzzy=False)
+
+    assert [match.station_id for match in result] == ["149180080", "150190340"]
+    assert all(match.kind is StationKind.HYDROLOGICAL for match in result)
+
+
+def test_search_diacritics(index: StationSearchIndex) -> None:
+    """Test search ignores diacritics in both query and names."""
+    assert index.search("lodz")[0].station == "Łódź"
+    assert index.search("ŁÓDŹ")[0].station == "Łódź"
+
+
+def test_search_river_and_station(index: StationSearchIndex) -> None:
+    """Test every query token has to match the river or the station."""
+    result = index.search("wisla krak")
+
+    assert [match.station_id for match in result] == ["150190340"]
+
+
+def test_search_ranking(index: StationSearchIndex) -> None:
+    """Test exact token matches rank above prefix matches."""
+    result = index.search("krakow", fuzzy=False)
+
+    assert [match.station for match in result] == [
+        "Kraków",
+        "Wisła (Kraków - Bielany)",
+    ]
+    assert result[0].score == result[1].score
+
+
+def test_search_fuzzy(index: StationSearchIndex) -> None:
+    """Test fuzzy search tolerates typos."""
+    assert index.search("krakw", fuzzy=False) == []
+
+    result = index.search("krakw")
+
+    assert result[0].station == "Kraków"
+    assert result[0].score < 1
+
+
+def test_search_limit(index: StationSearchIndex) -> None:
+    """Test search limit."""
+    assert len(index.search("b", limit=2)) == 2
+    assert index.search("b", limit=0) == []
+    assert index.search("  ") == []
+    assert len(index) == 9
+
+
+@pytest.mark.asyncio
+async def test_search_stations(
+    weather_stations: list[dict[str, Any]],
+    hydrological_stations: list[dict[str, Any]],
+) -> None:
+    """Test searching stations lists of the instance."""
+    session = aiohttp.ClientSession()
+
+    imgwpib = await ImgwPib.create(session)
+
+    assert imgwpib.search_stations("Krzyżanowice") == []
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_WEATHER_ENDPOINT, payload=weather_stations)
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+
+        await imgwpib.update_weather_stations()
+        await imgwpib.update_hydrological_stations()
+
+    await session.close()
+
+    hydrological = imgwpib.search_stations("odra krzyz")
+    weather = imgwpib.search_stations("bialystok")
+
+    assert hydrological[0].station == "Odra (Krzyżanowice)"
+    assert weather[0].station_id == "12295"
+    assert weather[0].kind is StationKind.WEATHER
@@ -0,0 +1,184 @@
+"""Tests for imgw_pib.serialization module."""
+
+import dataclasses
+import gzip
+from datetime import UTC, datetime
+from http import HTTPStatus
+from typing import Any
+
+import aiohttp
+import orjson
+import pytest
+from aiointercept import aiointercept
+
+from imgw_pib import ImgwPib
+from imgw_pib.const import (
+    API_HYDROLOGICAL_DETAILS_ENDPOINT,
+    API_HYDROLOGICAL_ENDPOINT,
+    API_HYDROLOGICAL_WARNINGS_ENDPOINT,
+    API_WEATHER_ENDPOINT,
+    API_WEATHER_PROXY_ENDPOINT,
+    API_WEATHER_WARNINGS_ENDPOINT,
+)
+from imgw_pib.model import ForecastData, HydrologicalData, WeatherData
+from imgw_pib.serialization import (
+    decode_snapshot,
+    encode_snapshot,
+    from_dict,
+    to_dict,
+    to_json_bytes,
+)
+
+pytestmark = pytest.mark.usefixtures("frozen_time")
+
+
+async def fetch_hydrological_data(
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_details: dict[str, Any],
+    hydrological_alerts: list[dict[str, Any]],
+) -> HydrologicalData:
+    """Return hydrological data with an alert."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_DETAILS_ENDPOINT.with_query(id="154190050"),
+            payload=hydrological_details,
+        )
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(session, hydrological_station_id="154190050")
+        data = await imgwpib.get_hydrological_data()
+
+    await session.close()
+
+    return data
+
+
+async def fetch_weather_data(
+    weather_stations: list[dict[str, Any]],
+    weather_station_proxy: dict[str, Any],
+) -> WeatherData:
+    """Return weather data with forecasts."""
+    session = aiohttp.ClientSession()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_WEATHER_ENDPOINT, payload=weather_stations)
+        session_mock.get(
+            API_WEATHER_WARNINGS_ENDPOINT, status=HTTPStatus.NOT_FOUND.value
+        )
+        session_mock.get(
+            API_WEATHER_PROXY_ENDPOINT.with_query(lat=49.821877, lon=19.047007),
+            payload=weather_station_proxy,
+        )
+
+        imgwpib = await ImgwPib.create(session, weather_station_id="12600")
+        data = await imgwpib.get_weather_data()
+
+    await session.close()
+
+    return data
+
+
+async def fetch_data(request: pytest.FixtureRequest, kind: str) -> Any:  # noqa: ANN401
+    """Return hydrological or weather data of the fixtures."""
+    if kind == "hydrological":
+        return await fetch_hydrological_data(
+            request.getfixturevalue("hydrological_stations"),
+            request.getfixturevalue("hydrological_details"),
+            request.getfixturevalue("hydrological_alerts"),
+        )
+
+    return await fetch_weather_data(
+        request.getfixturevalue("weather_stations"),
+        request.getfixturevalue("weather_station_proxy"),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["hydrological", "weather"])
+async def test_to_dict_and_back(request: pytest.FixtureRequest, kind: str) -> None:
+    """Test the dictionary matches asdict and creates equal data."""
+    data = await fetch_data(request, kind)
+
+    result = to_dict(data)
+
+    assert result == dataclasses.asdict(data)
+    assert result["fetched_at"] == datetime(2024, 4, 22, 11, 10, 32, tzinfo=UTC)
+
+    restored = from_dict(type(data), result)
+
+    assert restored == data
+    assert restored.fetched_at == data.fetched_at
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["hydrological", "weather"])
+async def test_json_bytes_and_back(request: pytest.FixtureRequest, kind: str) -> None:
+    """Test JSON has ISO 8601 dates and creates equal data."""
+    data = await fetch_data(request, kind)
+
+    result = orjson.loads(to_json_bytes(data))
+
+    assert result["fetched_at"] == "2024-04-22T11:10:32+00:00"
+    assert result == orjson.loads(
+        orjson.dumps(to_dict(data), default=datetime.isoformat)
+    )
+
+    restored = from_dict(type(data), result)
+
+    assert restored == data
+    assert restored.fetched_at == data.fetched_at
+
+
+def test_from_dict_defaults() -> None:
+    """Test fields missing in the payload get their defaults."""
+    data = from_dict(
+        ForecastData,
+        {
+            "latitude": 52.2,
+            "longitude": 21.0,
+            "forecast_hourly": [],
+            "forecast_twice_daily": [],
+        },
+    )
+
+    assert data == ForecastData(
+        latitude=52.2, longitude=21.0, forecast_hourly=[], forecast_twice_daily=[]
+    )
+    assert data.fetched_at is None
+    assert data.stale is False
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(request: pytest.FixtureRequest) -> None:
+    """Test a snapshot of many results decodes to equal data."""
+    hydrological_data = await fetch_data(request, "hydrological")
+    weather_data = await fetch_data(request, "weather")
+    results = [hydrological_data, weather_data, hydrological_data]
+
+    content = encode_snapshot(results)
+    restored = decode_snapshot(content)
+
+    assert restored == results
+    assert [data.fetched_at for data in restored] == [
+        data.fetched_at for data in results
+    ]
+    # Readings of a sensor share the name and unit stored once in the snapshot
+    first, last = restored[0], restored[2]
+    assert isinstance(first, HydrologicalData)
+    assert isinstance(last, HydrologicalData)
+    assert first.water_level.unit is last.water_level.unit
+    assert len(content) < len(b"".join(to_json_bytes(data) for data in results))
+
+
+def test_snapshot_unsupported_version() -> None:
+    """Test snapshots of another version are rejected."""
+    snapshot = orjson.loads(gzip.decompress(encode_snapshot([])))
+    snapshot["version"] = 0
+
+    with pytest.raises(ValueError, match="Unsupported snapshot version 0"):
+        decode_snapshot(gzip.compress(orjson.dumps(snapshot)))
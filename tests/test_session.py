@@ -0,0 +1,49 @@
+"""Tests for imgw_pib.session module."""
+
+from typing import Any
+
+import aiohttp
+import pytest
+
+import imgw_pib
+from imgw_pib.const import TIMEOUT
+from imgw_pib.session import create_session
+
+
+@pytest.mark.asyncio
+async def test_create_session() -> None:
+    """Test the session is tuned for IMGW-PIB hosts."""
+    session = create_session(limit_per_host=4)
+
+    connector = session.connector
+    assert isinstance(connector, aiohttp.TCPConnector)
+    assert connector.limit_per_host == 4
+    assert connector.limit == 12
+    assert connector.use_dns_cache
+    assert session.timeout is TIMEOUT
+
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_create_session_options() -> None:
+    """Test session options are passed through."""
+    timeout = aiohttp.ClientTimeout(total=1)
+    session = imgw_pib.create_session(timeout=timeout, headers={"User-Agent": "test"})
+
+    assert session.timeout is timeout
+    assert session.headers["User-Agent"] == "test"
+
+    await session.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "option",
+    [{"connector": None}, {"raise_for_status": True}],
+    ids=["connector", "raise_for_status"],
+)
+async def test_create_session_unsupported_option(option: dict[str, Any]) -> None:
+    """Test options conflicting with the tuned session are rejected."""
+    with pytest.raises(TypeError, match="Unsupported session option"):
+        create_session(**option)
@@ -0,0 +1,123 @@
+"""Tests for imgw_pib.transport module."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+from yarl import URL
+
+from imgw_pib import ImgwPib, RecordingTransport, ReplayTransport
+from imgw_pib.const import API_HYDROLOGICAL_ENDPOINT, API_HYDROLOGICAL_WARNINGS_ENDPOINT
+from imgw_pib.transport import RecordedResponse
+
+pytestmark = pytest.mark.usefixtures("frozen_time")
+
+URL_HYDRO = "https://danepubliczne.imgw.pl/api/data/hydro"
+
+
+def recorded_response(body: bytes, ttfb: float = 0.2) -> RecordedResponse:
+    """Return a recorded /hydro response."""
+    return RecordedResponse(
+        url=URL_HYDRO,
+        status=200,
+        content_type="application/json",
+        headers=[("Content-Type", "application/json")],
+        body=body,
+        ttfb=ttfb,
+        transfer=0.1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(
+    tmp_path: Path,
+    hydrological_stations: list[dict[str, Any]],
+    hydrological_alerts: list[dict[str, Any]],
+) -> None:
+    """Test recorded responses are replayed without network access."""
+    session = aiohttp.ClientSession()
+    recorder = RecordingTransport()
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        session_mock.get(API_HYDROLOGICAL_ENDPOINT, payload=hydrological_stations)
+        session_mock.get(
+            API_HYDROLOGICAL_WARNINGS_ENDPOINT, payload=hydrological_alerts
+        )
+
+        imgwpib = await ImgwPib.create(
+            session,
+            hydrological_station_id="154190050",
+            hydrological_details=False,
+            transport=recorder,
+        )
+        recorded_data = await imgwpib.get_hydrological_data()
+
+    await recorder.save(tmp_path / "archive")
+
+    assert [response.url for response in recorder.responses] == [
+        str(API_HYDROLOGICAL_ENDPOINT),
+        str(API_HYDROLOGICAL_WARNINGS_ENDPOINT),
+    ]
+
+    async with aiointercept(mock_external_urls=True) as session_mock:
+        imgwpib = await ImgwPib.create(
+            session,
+            hydrological_station_id="154190050",
+            hydrological_details=False,
+            transport=await ReplayTransport.load(tmp_path / "archive"),
+        )
+        replayed_data = await imgwpib.get_hydrological_data()
+
+        assert not session_mock.requests
+
+    await session.close()
+
+    assert replayed_data == recorded_data
+
+
+@pytest.mark.asyncio
+async def test_archive_round_trip(tmp_path: Path) -> None:
+    """Test an archive keeps the responses with their headers and timing."""
+    recorder = RecordingTransport()
+    recorder.responses = [recorded_response(b"[]"), recorded_response(b"\n[1]\n")]
+    await recorder.save(tmp_path / "archive")
+
+    transport = await ReplayTransport.load(tmp_path / "archive")
+
+    async with aiohttp.ClientSession() as session:
+        for body in (b"[]", b"\n[1]\n", b"[]"):
+            assert await transport.request(session, URL(URL_HYDRO), None) == (
+                recorded_response(body)
+            )
+
+
+@pytest.mark.asyncio
+async def test_replay_unknown_url() -> None:
+    """Test a URL without a recorded response is unreachable."""
+    transport = ReplayTransport([recorded_response(b"[]")])
+
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(aiohttp.ClientConnectionError, match="No recorded response"):
+            await transport.request(
+                session, URL("https://danepubliczne.imgw.pl/api/data/synop"), None
+            )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("pace", "delay"), [(0.0, None), (1.0, 0.3), (2.0, 0.6)])
+async def test_replay_pace(pace: float, delay: float | None) -> None:
+    """Test responses are delayed by their recorded duration times the pace."""
+    transport = ReplayTransport([recorded_response(b"[]")], pace=pace)
+
+    async with aiohttp.ClientSession() as session:
+        with patch("imgw_pib.transport.asyncio.sleep", new=AsyncMock()) as sleep:
+            response = await transport.request(session, URL(URL_HYDRO), None)
+
+    assert await response.json() == []
+    if delay is None:
+        sleep.assert_not_called()
+    else:
+        sleep.assert_awaited_once_with(pytest.approx(delay))